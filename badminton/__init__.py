@@ -0,0 +1,28 @@
+import importlib
+
+# ============================================================
+# 🏸 badminton — engine จัดคิว + หน้าเว็บ (badminton.app)
+# ============================================================
+# ชื่อที่ export โหลดแบบ lazy: `import badminton` ยังไม่โหลด engine/streamlit/numpy
+# จนกว่าจะใช้ชื่อนั้นจริง (สคริปต์ CLI และหน้าเว็บเริ่มเร็วขึ้น)
+
+_EXPORTS = {
+    "IndividualStreakScheduler": ".engine",
+    "MultiCourtScheduler": ".engine",
+    "TeamStreakScheduler": ".engine",
+    "create_engine": ".engine",
+    "fmt_team": ".engine",
+    "POLICIES": ".policies",
+    "get_policy": ".policies",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,284 @@
+from typing import Callable, Dict, List, Optional
+
+import streamlit as st
+
+from .engine import fmt_team
+from .policies import POLICIES, Policy, get_policy
+from .ui import (
+    begin_profile,
+    begin_session,
+    current_club,
+    end_profile,
+    end_session,
+    fragment,
+    lookahead_picker,
+    mark_seen,
+    pairing_picker,
+    render_history,
+    render_idle,
+    render_odds,
+    render_pair_heatmap,
+    render_roster,
+    render_saved_sessions,
+    render_snapshot_export,
+    render_snapshot_import,
+    show_conflict,
+    submit,
+    table_html,
+    watch_version,
+)
+
+# ============================================================
+# 🏸 Badminton App (หน้าเดียว เลือกกติกาหมุนคอร์ทได้ตอนรัน)
+# ============================================================
+# สคริปต์หน้าเดิมทั้ง 4 ไฟล์เรียก main("<policy>") — ส่วนที่ใช้ร่วมกัน (เริ่มคืน, ประวัติ, สถิติ,
+# เวลารอ, heatmap, เพิ่ม/เอาคนออก) อยู่ที่นี่ที่เดียว เฉพาะแผงแมตช์ที่ต่างกันตามชนิด engine
+# ทุกปุ่มส่งเหตุการณ์ผ่าน on_click → fragment rerun ครั้งเดียวต่อการกด
+
+MAX_COURTS = 16
+COURTS_PER_ROW = 4   # จอมือถือแคบ → แสดงคอร์ทเป็นแถวละไม่เกิน 4
+SIDES = {"ทีมซ้าย": "left", "ทีมขวา": "right"}
+
+
+# -----------------------------
+# Callbacks
+# -----------------------------
+def _send(event: Dict):
+    submit(st.session_state, event)
+
+
+def _send_courts(courts: List[int]):
+    """ผลทุกคอร์ทที่เลือกไว้เป็นเหตุการณ์เดียว: จัดคอร์ทใหม่รอบเดียว + version ขยับครั้งเดียว"""
+    ss = st.session_state
+    sides = {i: SIDES[ss.get(f"winner_court_{i}")] for i in courts if ss.get(f"winner_court_{i}") in SIDES}
+    if not sides:
+        ss.no_winner_picked = True
+        return
+    submit(ss, {"type": "results", "sides": sorted(sides.items())})
+    for i in courts:
+        ss.pop(f"winner_court_{i}", None)   # แมตช์ใหม่เริ่มที่ "ยังไม่เลือก"
+
+
+# -----------------------------
+# Start / Reset
+# -----------------------------
+def policy_picker() -> str:
+    names = list(POLICIES)
+    return st.sidebar.selectbox("🧩 กติกาหมุนคอร์ท", names, key="policy",
+                                format_func=lambda n: f"{n} ({POLICIES[n].script})")
+
+
+def render_start(ss, policy: Policy):
+    names_input = st.text_area("👥 ใส่รายชื่อผู้เล่น (ขึ้นบรรทัดใหม่)", "", height=180)
+    players = [n.strip() for n in names_input.split("\n") if n.strip()]
+    options = {"pairing": pairing_picker()}
+    if "lookahead" in policy.options:
+        options["lookahead"] = lookahead_picker()
+    if "num_courts" in policy.options:
+        options["num_courts"] = st.selectbox("🏟️ จำนวนคอร์ท", list(range(1, MAX_COURTS + 1)),
+                                             index=0, key="num_courts")
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        if st.button("🚀 เริ่มเกมใหม่"):
+            need = policy.required_players(options)
+            if len(players) < need:
+                st.error(f"ต้องมีอย่างน้อย {need} คน")
+            else:
+                eng = policy.create(players, **options)
+                if hasattr(eng, "start_new_round"):
+                    eng.start_new_round()
+                begin_session(ss, eng)
+                st.rerun()
+    with c2:
+        if st.button("♻️ Reset"):
+            for k in list(ss.keys()):
+                del ss[k]
+            end_session(ss)
+            st.rerun()
+    with c3:
+        if st.button("🔃 Refresh"):
+            st.rerun()
+
+
+# -----------------------------
+# Match panels (ต่างกันตามชนิด engine)
+# -----------------------------
+def _team_streak_panel(ss, eng):
+    if eng.resting_player:
+        st.info(f"👤 ผู้เล่นที่พักรอบนี้: **{eng.resting_player}**")
+
+    if eng.current_match:
+        left, right = eng.current_match
+        st.subheader("🎯 แมตช์ปัจจุบัน")
+        st.markdown(f"**ทีมซ้าย:** {fmt_team(left)} 🆚 **ทีมขวา:** {fmt_team(right)}")
+        render_odds(eng, left, right)
+        c1, c2 = st.columns(2)
+        with c1:
+            st.button("✅ ทีมซ้ายชนะ", on_click=_send, args=({"type": "result", "side": "left"},))
+        with c2:
+            st.button("✅ ทีมขวาชนะ", on_click=_send, args=({"type": "result", "side": "right"},))
+    elif eng.players:
+        st.warning("ยังไม่มีแมตช์ — กดเริ่มเกมใหม่")
+
+    st.subheader("👥 ผู้เล่นทั้งหมด")
+    chips = []
+    for p in eng.players:
+        is_rest = (p == eng.resting_player)
+        chips.append(
+            f"<span style='display:inline-block;padding:6px 10px;margin:4px;"
+            f"border-radius:999px;background:{'#ffe8e8' if is_rest else '#eef3ff'};"
+            f"border:1px solid { '#ffb3b3' if is_rest else '#c7d2fe'}; "
+            f"font-size:0.9rem;'>{'🛌 ' if is_rest else '🏸 '}{p}</span>"
+        )
+    st.markdown("<div>" + "".join(chips) + "</div>", unsafe_allow_html=True)
+
+    st.subheader("📋 คิวถัดไป")
+    if not eng.queue:
+        st.info("ยังไม่มีคิวถัดไป ✨")
+        return
+    planned = len(eng.upcoming()) if eng.lookahead else 0
+    if planned:
+        st.caption(f"🔒 {planned} ทีมแรกวางแผนไว้แล้ว — ลำดับนี้จะไม่ถูกเลื่อน")
+    for i, team in enumerate(eng.queue, 1):
+        st.markdown(
+            f"""
+            <div style='padding:8px; margin-bottom:6px; border-radius:10px;
+                        background-color:#f7f8fa; border:1px solid #e6e8ef;'>
+                <b>#{i}</b> {'🔒' if i <= planned else '🎽'} {fmt_team(team)}
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
+
+
+def _multi_court_panel(ss, eng):
+    courts = []
+    for i, match in enumerate(eng.current_matches):
+        if i % COURTS_PER_ROW == 0:
+            cols = st.columns(min(COURTS_PER_ROW, len(eng.current_matches) - i))
+        with cols[i % COURTS_PER_ROW]:
+            if match:
+                left, right = match
+                st.subheader(f"🏟️ คอร์ท {i+1}")
+                st.markdown(f"**ทีมซ้าย:** {fmt_team(left)} 🆚 **ทีมขวา:** {fmt_team(right)}")
+                render_odds(eng, left, right)
+                st.radio(f"เลือกผู้ชนะ (คอร์ท {i+1})", options=["ยังไม่เลือก", "ทีมซ้าย", "ทีมขวา"],
+                         index=0, key=f"winner_court_{i}")
+                courts.append(i)
+            else:
+                st.warning(f"คอร์ท {i+1} ยังไม่พร้อม")
+
+    if eng.wait_pool:
+        st.caption("คิวรอกลาง (คอร์ทไหนว่างก่อน ทีมหน้าคิวลงคอร์ทนั้น):")
+        st.markdown("  \n".join(f"{j}. {fmt_team(t)}" for j, t in enumerate(eng.wait_pool, 1)))
+    if eng.resting_players:
+        st.info(f"👤 พักรอบนี้: **{', '.join(eng.resting_players)}**")
+
+    if courts:
+        st.button("✅ ส่งผลการแข่งขันทั้งหมด", on_click=_send_courts, args=(courts,))
+        if ss.pop("no_winner_picked", False):
+            st.warning("ยังไม่ได้เลือกผู้ชนะสักคอร์ท")
+
+
+def _individual_panel(ss, eng):
+    if eng.current_match:
+        left, right = eng.current_match
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col1:
+            st.subheader("ทีมซ้าย")
+            st.write(", ".join(left))
+            st.button("✅ ทีมซ้ายชนะ", on_click=_send, args=({"type": "result", "side": "left"},))
+        with col2:
+            st.subheader("VS")
+        with col3:
+            st.subheader("ทีมขวา")
+            st.write(", ".join(right))
+            st.button("✅ ทีมขวาชนะ", on_click=_send, args=({"type": "result", "side": "right"},))
+    else:
+        st.info("รอบนี้จบแล้ว ✅ เริ่มรอบใหม่...")
+        st.button("เริ่มรอบใหม่", on_click=_send, args=({"type": "round"},))
+
+    if eng.resting:
+        st.info(f"🛑 พัก: {eng.resting}")
+    st.caption("🔥 Win streak: " + " · ".join(f"{p} {eng.win_streak.get(p, 0)}" for p in eng.players))
+    st.button("🔄 Reset เกม (รายชื่อเดิม)", on_click=_send, args=({"type": "reset"},))
+
+
+PANELS: Dict[str, Callable] = {
+    "team_streak": _team_streak_panel,
+    "multi_court": _multi_court_panel,
+    "individual_streak": _individual_panel,
+}
+
+
+def _match_line(rec: Dict) -> str:
+    return f"{fmt_team(rec['winner'])} ✅ ชนะ {fmt_team(rec['loser'])} ❌"
+
+
+HISTORY_FORMATS: Dict[str, Callable[[Dict], str]] = {
+    "team_streak": _match_line,
+    "multi_court": lambda rec: f"🏟️ คอร์ท {rec['court']+1}: {_match_line(rec)}",
+    "individual_streak": _match_line,
+}
+
+
+# -----------------------------
+# Live panels (fragment): กดปุ่มแล้ว rerun เฉพาะส่วนนี้ครั้งเดียว
+# -----------------------------
+@fragment
+def live_panels(policy_name: str):
+    ss = st.session_state
+    policy = get_policy(policy_name)
+    prof = begin_profile(f"{policy.name}:panels", fragment=True)
+    club = current_club(ss, policy.kind)
+    eng = club.engine if club else None
+    if eng is None:
+        end_profile(prof, show=False)
+        return
+
+    show_conflict(ss)
+    # engine ถูกแก้จาก session ของเครื่องอื่น (thread อื่น) ผ่าน SharedStore.commit ซึ่งถือ club.lock
+    # → วาดทั้งแผงภายใต้ล็อกเดียวกัน: ไม่เห็นผลครึ่งชุด / ไม่เจอ deque ถูกแก้ระหว่างวนลูป
+    with club.lock:
+        PANELS[policy.kind](ss, eng)
+        render_roster(ss, eng)
+
+        prof.mark("history")
+        if eng.history:
+            render_history(eng, HISTORY_FORMATS[policy.kind])
+
+        prof.mark("stats")
+        if eng.stats:
+            st.subheader("📊 สถิติผู้เล่น")
+            # สร้างตารางครั้งเดียวต่อ version (rerun เฉยๆ / เครื่องอื่นใช้ของที่ cache ไว้)
+            # เป็น HTML ล้วน ไม่ผ่าน pandas → หน้าแรกไม่ต้องรอโหลด pandas/pyarrow
+            st.markdown(club.cached("stats_html", lambda: table_html(eng.stats_table.rows(rank=True))),
+                        unsafe_allow_html=True)
+
+        if eng.history:
+            render_idle(eng)
+            render_pair_heatmap(eng.pairs)
+        render_snapshot_export(club)
+        mark_seen(ss, club)   # version ที่ตรงกับสิ่งที่เพิ่งวาด
+
+    end_profile(prof, show=False)
+
+
+def main(policy_name: Optional[str] = None):
+    """หน้าแอป — policy_name=None ให้เลือกกติกาจาก sidebar"""
+    ss = st.session_state
+    policy = get_policy(policy_name or policy_picker())
+    prof = begin_profile(policy.name)   # จับเวลาแต่ละช่วงของ rerun (เปิดด้วย ?profile=1)
+    # state ของคืนอยู่ใน shared store (ทุกเครื่องที่เปิด ?session= เดียวกันเห็นชุดเดียวกัน)
+    # ใน ss เก็บแค่ club_id กับ version ที่หน้าจอนี้เห็นล่าสุด
+    prof.mark("input")
+    st.title(policy.title)
+    render_start(ss, policy)
+    render_saved_sessions(ss, policy.kind)
+    render_snapshot_import(ss, policy.kind)
+
+    prof.mark("panels")
+    live_panels(policy.name)
+    end_profile(prof)
+    watch_version()
@@ -0,0 +1,169 @@
+import json
+import math
+import struct
+import sys
+from array import array
+from typing import Dict, List, Tuple
+
+from .cooccurrence import PairIndex
+from .roster import Roster
+
+# ============================================================
+# 💾 Binary Snapshot (ย้ายคืนจากมือถือไปโน้ตบุ๊กที่สนาม / สำรองก่อน Reset)
+# ============================================================
+# ไฟล์เดียวเก็บทั้งคืน: รายชื่อ, แมตช์ปัจจุบัน, คิว, สตรีค, ตัวสุ่ม, สถิติ, เรตติ้ง, คู่ซ้ำ, ประวัติ
+#
+#   header  : MAGIC, FORMAT_VERSION, จำนวน section           ("<6sHH")
+#   section : tag 4 ไบต์ + ความยาว + ข้อมูล                     ("<4sI")
+#
+# META เป็น JSON (ของเล็ก: คิว/สตรีค/options) ส่วนที่โตตามจำนวนแมตช์/ผู้เล่นเป็น array ดิบ
+# little-endian → โหลดกลับด้วย array.frombytes ทีเดียว (ไม่ต้อง parse ทีละค่า และไม่ต้องนับใหม่จาก history)
+# section ที่ไม่รู้จักถูกข้าม → ไฟล์จากเวอร์ชันใหม่ที่เพิ่มแค่ section ยังเปิดได้
+
+MAGIC = b"BMSNAP"
+FORMAT_VERSION = 1
+FILE_SUFFIX = ".bmsnap"
+
+_HEADER = struct.Struct("<6sHH")
+_SECTION = struct.Struct("<4sI")
+_SWAP = sys.byteorder == "big"
+
+
+def _pack(typecode: str, values) -> bytes:
+    arr = array(typecode, values)
+    if _SWAP:
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _unpack(typecode: str, data: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if _SWAP:
+        arr.byteswap()
+    return arr
+
+
+# -----------------------------
+# Export
+# -----------------------------
+def dumps(engine) -> bytes:
+    """สถานะทั้งคืนของ engine เป็นไฟล์ binary"""
+    state = engine.snapshot()
+    rng_version, rng_internal, rng_gauss = state.pop("rng")
+
+    # id ของชื่อในประวัติ: เริ่มจากแถวของเมทริกซ์คู่ซ้ำ (คนที่ออกไปแล้วยังอยู่) ต่อด้วยชื่อที่ไม่มีในนั้น
+    pairs = engine.pairs
+    names = Roster(pairs.players)
+    courts: List[int] = []
+    stamps: List[float] = []
+    sizes: List[int] = []
+    ids: List[int] = []
+    for rec in engine.history:
+        courts.append(rec["court"])
+        stamps.append(math.nan if rec.get("ts") is None else rec["ts"])
+        sizes.append(len(rec["winner"]))
+        sizes.append(len(rec["loser"]))
+        ids.extend(names.intern(p) for p in rec["winner"])
+        ids.extend(names.intern(p) for p in rec["loser"])
+
+    stats_names = list(engine.stats)
+    rating_names = list(engine.ratings)
+    meta = {
+        "kind": engine.KIND,
+        "options": engine.options(),
+        "state": state,
+        "rng": [rng_version, rng_gauss],
+        "names": names.names,
+        "pair_players": pairs.n,
+        "pair_cap": pairs.cap,
+        "stats_names": stats_names,
+        "rating_names": rating_names,
+    }
+    sections = [
+        (b"META", json.dumps(meta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")),
+        (b"RNG ", _pack("I", rng_internal)),
+        (b"PLAY", _pack("I", (engine.stats[p]["played"] for p in stats_names))),
+        (b"WINS", _pack("I", (engine.stats[p]["win"] for p in stats_names))),
+        (b"ELO ", _pack("d", (engine.ratings[p] for p in rating_names))),
+        (b"PART", _pack("I", pairs.partner)),
+        (b"OPPO", _pack("I", pairs.opponent)),
+        (b"HCRT", _pack("H", courts)),
+        (b"HTS ", _pack("d", stamps)),
+        (b"HSIZ", _pack("B", sizes)),
+        (b"HIDS", _pack("I", ids)),
+    ]
+    out = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections))]
+    for tag, payload in sections:
+        out.append(_SECTION.pack(tag, len(payload)))
+        out.append(payload)
+    return b"".join(out)
+
+
+# -----------------------------
+# Import
+# -----------------------------
+def read_sections(data: bytes) -> Tuple[int, Dict[bytes, memoryview]]:
+    """(version, {tag: ข้อมูล}) — ValueError ถ้าไม่ใช่ไฟล์ snapshot หรือเป็นเวอร์ชันที่ใหม่กว่าที่อ่านได้"""
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("not a badminton snapshot")
+    magic, version, count = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("not a badminton snapshot")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"snapshot format {version} is newer than supported ({FORMAT_VERSION})")
+    sections: Dict[bytes, memoryview] = {}
+    offset = _HEADER.size
+    for _ in range(count):
+        if offset + _SECTION.size > len(view):
+            raise ValueError("truncated snapshot")
+        tag, length = _SECTION.unpack_from(view, offset)
+        offset += _SECTION.size
+        if offset + length > len(view):
+            raise ValueError("truncated snapshot")
+        sections[tag] = view[offset:offset + length]
+        offset += length
+    return version, sections
+
+
+def loads(data: bytes):
+    """engine ที่อยู่ในสถานะเดียวกับตอน dumps (สุ่มต่อได้ตรงกันทุกครั้ง)"""
+    from .engine import create_engine
+
+    _, sections = read_sections(data)
+    try:
+        meta = json.loads(bytes(sections[b"META"]).decode("utf-8"))
+        rng_internal = _unpack("I", sections[b"RNG "])
+        played = _unpack("I", sections[b"PLAY"])
+        wins = _unpack("I", sections[b"WINS"])
+        elo = _unpack("d", sections[b"ELO "])
+        partner = _unpack("I", sections[b"PART"])
+        opponent = _unpack("I", sections[b"OPPO"])
+        courts = _unpack("H", sections[b"HCRT"])
+        stamps = _unpack("d", sections[b"HTS "])
+        sizes = _unpack("B", sections[b"HSIZ"])
+        ids = _unpack("I", sections[b"HIDS"])
+    except KeyError as e:
+        raise ValueError(f"snapshot is missing section {e.args[0]!r}") from None
+
+    names = meta["names"]
+    history = []
+    k = 0
+    for i, court in enumerate(courts):
+        w, l = sizes[2 * i], sizes[2 * i + 1]
+        winner = tuple(names[j] for j in ids[k:k + w])
+        loser = tuple(names[j] for j in ids[k + w:k + w + l])
+        k += w + l
+        ts = stamps[i]
+        history.append({"court": court, "winner": winner, "loser": loser, "ts": None if math.isnan(ts) else ts})
+
+    tables = {
+        "stats": {p: {"played": played[i], "win": wins[i]} for i, p in enumerate(meta["stats_names"])},
+        "ratings": dict(zip(meta["rating_names"], elo)),
+        "pairs": PairIndex.from_arrays(names[:meta["pair_players"]], meta["pair_cap"], partner, opponent),
+    }
+    state = dict(meta["state"], rng=[meta["rng"][0], rng_internal, meta["rng"][1]])
+    engine = create_engine(meta["kind"], state["players"], meta["options"])
+    engine.restore(state, history, tables=tables)
+    return engine
@@ -0,0 +1,156 @@
+"""วัดเวลา cold start ของหน้าเว็บ (process ใหม่ทุกรอบ) เทียบกับงบเวลาที่ตั้งไว้
+
+    python -m badminton.coldstart
+    python -m badminton.coldstart --policy multi --players 24 --matches 120 --runs 10
+    python -m badminton.coldstart --budget-paint-ms 1500 --json
+
+ช่วงที่วัด: import streamlit → import badminton.app → first paint (เปิดคืนที่บันทึกไว้ผ่าน ?session=
+แล้ววาดแมตช์ปัจจุบันด้วย streamlit AppTest) และตรวจว่า first paint ไม่โหลดโมดูลหนัก (pandas ฯลฯ)
+exit code 1 ถ้าเกินงบหรือมีโมดูลหนักหลุดเข้ามา — ใช้เป็น gate ก่อนเอาขึ้นเครื่องที่สนามได้
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# งบเวลาเริ่มต้น (มิลลิวินาที, ค่ากลางของทุกรอบ) — ไม่รวม import streamlit ซึ่งคุมไม่ได้
+BUDGET_IMPORT_MS = 150
+BUDGET_PAINT_MS = 1000
+# โมดูลที่ไม่ควรถูกโหลดก่อนผู้ใช้กดเปิดกราฟ/ตารางละเอียดเอง
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy", "altair")
+
+
+def _prepare(directory: str, policy: str, players: int, matches: int, seed: int) -> str:
+    """สร้างคืนตัวอย่างใน directory (log + snapshot) คืน session id"""
+    from .eventlog import SessionLog
+    from .policies import get_policy
+
+    eng = get_policy(policy).create([f"P{i:02d}" for i in range(players)], seed=seed, num_courts=2)
+    if hasattr(eng, "start_new_round"):
+        eng.start_new_round()
+    log = SessionLog.start(eng, directory=directory)
+    rng = random.Random(seed)
+    for _ in range(matches):
+        if eng.KIND == "multi_court":
+            live = [c for c, m in enumerate(eng.current_matches) if m]
+            if not live:
+                break
+            log.results(eng, {c: rng.choice(("left", "right")) for c in live})
+        else:
+            log.result(eng, rng.choice(("left", "right")))
+    return log.session_id
+
+
+def _child(script: str, session_id: str) -> Dict:
+    """รันใน process ใหม่: จับเวลาแต่ละช่วงแล้วพิมพ์เป็น JSON บรรทัดเดียว"""
+    t0 = time.perf_counter()
+    import streamlit  # noqa: F401
+    t1 = time.perf_counter()
+    from . import app  # noqa: F401
+    t2 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(script, default_timeout=60)
+    at.query_params["session"] = session_id
+    t3 = time.perf_counter()
+    at.run()
+    t4 = time.perf_counter()
+    return {
+        "import_streamlit_ms": (t1 - t0) * 1000,
+        "import_app_ms": (t2 - t1) * 1000,
+        "first_paint_ms": (t4 - t3) * 1000,
+        "error": str(at.exception[0].value) if at.exception else None,
+        "heavy": [m for m in HEAVY_MODULES if m in sys.modules],
+    }
+
+
+def run(policy: str = "rotation", *, players: int = 16, matches: int = 60, runs: int = 5,
+        seed: int = 0) -> Dict:
+    from .policies import get_policy
+
+    script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          get_policy(policy).script)
+    with tempfile.TemporaryDirectory() as data_dir:
+        session_id = _prepare(data_dir, policy, players, matches, seed)
+        env = dict(os.environ, BADMINTON_DATA_DIR=data_dir)
+        env.pop("BADMINTON_PROFILE", None)
+        samples: List[Dict] = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-m", "badminton.coldstart", "--child", script, session_id],
+                env=env, capture_output=True, text=True, check=True,
+                cwd=os.path.dirname(script),
+            )
+            samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    def median(key: str) -> float:
+        return statistics.median(s[key] for s in samples)
+
+    return {
+        "policy": policy,
+        "players": players,
+        "matches": matches,
+        "runs": runs,
+        "import_streamlit_ms": median("import_streamlit_ms"),
+        "import_app_ms": median("import_app_ms"),
+        "first_paint_ms": median("first_paint_ms"),
+        "heavy": sorted({m for s in samples for m in s["heavy"]}),
+        "errors": sorted({s["error"] for s in samples if s["error"]}),
+    }
+
+
+def over_budget(r: Dict, *, import_ms: float = BUDGET_IMPORT_MS, paint_ms: float = BUDGET_PAINT_MS) -> List[str]:
+    problems = []
+    if r["import_app_ms"] > import_ms:
+        problems.append(f"import badminton.app {r['import_app_ms']:.0f}ms > {import_ms:.0f}ms")
+    if r["first_paint_ms"] > paint_ms:
+        problems.append(f"first paint {r['first_paint_ms']:.0f}ms > {paint_ms:.0f}ms")
+    if r["heavy"]:
+        problems.append("first paint loaded " + ", ".join(r["heavy"]))
+    problems.extend(f"error: {e}" for e in r["errors"])
+    return problems
+
+
+def main(argv: Optional[List[str]] = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["--child"]:
+        print(json.dumps(_child(argv[1], argv[2])))
+        return
+
+    from .policies import POLICIES
+
+    parser = argparse.ArgumentParser(description="Measure cold-start time of the Streamlit pages.")
+    parser.add_argument("--policy", choices=list(POLICIES), default="rotation")
+    parser.add_argument("--players", type=int, default=16)
+    parser.add_argument("--matches", type=int, default=60, help="results already logged for the night")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes to take the median over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-import-ms", type=float, default=BUDGET_IMPORT_MS)
+    parser.add_argument("--budget-paint-ms", type=float, default=BUDGET_PAINT_MS)
+    parser.add_argument("--json", action="store_true", help="print the result as one JSON line")
+    args = parser.parse_args(argv)
+
+    r = run(args.policy, players=args.players, matches=args.matches, runs=args.runs, seed=args.seed)
+    problems = over_budget(r, import_ms=args.budget_import_ms, paint_ms=args.budget_paint_ms)
+    if args.json:
+        print(json.dumps(dict(r, problems=problems)))
+    else:
+        print(f"== {r['policy']} | {r['players']} players | {r['matches']} results | median of {r['runs']} runs")
+        print(f"   import streamlit : {r['import_streamlit_ms']:.0f} ms (not budgeted)")
+        print(f"   import app       : {r['import_app_ms']:.0f} ms (budget {args.budget_import_ms:.0f})")
+        print(f"   first paint      : {r['first_paint_ms']:.0f} ms (budget {args.budget_paint_ms:.0f})")
+        print(f"   heavy modules    : {', '.join(r['heavy']) or 'none'}")
+        for p in problems:
+            print(f"   ❌ {p}")
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
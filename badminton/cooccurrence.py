@@ -0,0 +1,113 @@
+from array import array
+from typing import Dict, List, Tuple
+
+from .roster import Roster
+
+# ============================================================
+# 🤝 Partner / Opponent Co-occurrence Index
+# ============================================================
+# เก็บจำนวนครั้งที่เป็นคู่กัน / เจอกันข้ามเน็ต เป็นเมทริกซ์ n×n แบบ flat array
+# อัปเดตทีละแมตช์ใน O(ขนาดทีม^2) และถามค่าได้ใน O(1)
+# เพิ่มคนระหว่างคืนได้: จองที่เผื่อ (capacity เพิ่มทีละเท่าตัว) → ขยายเมทริกซ์ไม่บ่อย
+
+KINDS = ("partner", "opponent")
+
+
+class PairIndex:
+    __slots__ = ("roster", "cap", "partner", "opponent")
+
+    def __init__(self, players: List[str]):
+        self.roster = Roster(players)   # ชื่อ → id = แถว/คอลัมน์ในเมทริกซ์
+        self.cap = max(self.n, 4)   # ความกว้างแถวใน flat array (>= n)
+        self.partner = array("I", bytes(4 * self.cap * self.cap))
+        self.opponent = array("I", bytes(4 * self.cap * self.cap))
+
+    @classmethod
+    def from_arrays(cls, players: List[str], cap: int, partner: array, opponent: array) -> "PairIndex":
+        """สร้างจากเมทริกซ์ที่มีอยู่แล้ว (binary snapshot) โดยไม่ต้องนับใหม่จาก history"""
+        if len(partner) != cap * cap or len(opponent) != cap * cap or len(players) > cap:
+            raise ValueError("pair matrices do not match capacity")
+        index = cls.__new__(cls)
+        index.roster = Roster(players)
+        index.cap = cap
+        index.partner = partner
+        index.opponent = opponent
+        return index
+
+    @property
+    def players(self) -> List[str]:
+        return self.roster.names
+
+    @property
+    def index(self) -> Dict[str, int]:
+        return self.roster.ids
+
+    @property
+    def n(self) -> int:
+        return len(self.roster)
+
+    def add(self, p: str):
+        """เพิ่มผู้เล่นใหม่ (มาสาย) — O(1) ถ้ายังมีที่ว่าง, ไม่งั้นขยายเป็น 2 เท่า O(n^2)"""
+        if p in self.roster:
+            return
+        if self.n == self.cap:
+            old, cap = self.cap, self.cap * 2
+            for name in ("partner", "opponent"):
+                src = getattr(self, name)
+                dst = array("I", bytes(4 * cap * cap))
+                for i in range(self.n):
+                    dst[i * cap:i * cap + self.n] = src[i * old:i * old + self.n]
+                setattr(self, name, dst)
+            self.cap = cap
+        self.roster.intern(p)
+
+    def _bump(self, matrix: array, a: str, b: str):
+        i, j = self.index[a], self.index[b]
+        matrix[i * self.cap + j] += 1
+        matrix[j * self.cap + i] += 1
+
+    def record(self, winner: List[str], loser: List[str]):
+        for p in winner + loser:
+            if p not in self.roster:
+                self.add(p)
+        for team in (winner, loser):
+            for k, a in enumerate(team):
+                for b in team[k+1:]:
+                    self._bump(self.partner, a, b)
+        for a in winner:
+            for b in loser:
+                self._bump(self.opponent, a, b)
+
+    def partners(self, a: str, b: str) -> int:
+        return self.partner[self.index[a] * self.cap + self.index[b]]
+
+    def opponents(self, a: str, b: str) -> int:
+        return self.opponent[self.index[a] * self.cap + self.index[b]]
+
+    # -----------------------------
+    # Export (heatmap / CSV)
+    # -----------------------------
+    def matrix(self, kind: str = "partner") -> List[List[int]]:
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}")
+        flat = self.partner if kind == "partner" else self.opponent
+        n, cap = self.n, self.cap
+        return [flat[i*cap:i*cap+n].tolist() for i in range(n)]
+
+    def top_pairs(self, kind: str = "partner", limit: int = 10) -> List[Tuple[str, str, int]]:
+        rows = self.matrix(kind)
+        pairs = [
+            (self.players[i], self.players[j], rows[i][j])
+            for i in range(self.n) for j in range(i + 1, self.n) if rows[i][j]
+        ]
+        pairs.sort(key=lambda t: -t[2])
+        return pairs[:limit]
+
+    def to_csv(self, kind: str = "partner") -> str:
+        def cell(text: str) -> str:
+            return '"' + text.replace('"', '""') + '"' if any(c in text for c in ',"\n') else text
+
+        lines = ["," + ",".join(cell(p) for p in self.players)]
+        for name, row in zip(self.players, self.matrix(kind)):
+            lines.append(cell(name) + "," + ",".join(str(v) for v in row))
+        return "\n".join(lines) + "\n"
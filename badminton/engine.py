@@ -0,0 +1,906 @@
+import functools
+import random
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .cooccurrence import PairIndex
+from .idle import IdleTracker
+from .pairing import balanced_pair_teams, fair_pair_teams
+from .planner import plan_queue
+from .played_index import PlayedIndex
+from .rating import DEFAULT_RATING, elo_delta
+from .roster import Team, make_team
+from .stats_view import StatsTable
+
+# ============================================================
+# 🏸 Headless Scheduling Engine (ไม่พึ่ง st.session_state)
+# ============================================================
+# หน้า Streamlit ทั้ง 4 ไฟล์เก็บ engine ไว้ใน ss.engine แล้วเรียกเมธอดตรงๆ
+# ทำให้รันขั้นตอนจัดคิวได้เป็นพันครั้งต่อวินาทีในเทส/ซิมูเลชันโดยไม่ต้อง rerun
+
+# ทีมเป็น tuple ที่เรียงชื่อแล้ว (roster.make_team) → เทียบสตรีค/คู่ซ้ำ และใช้เป็น key ได้โดยตรง
+Match = Tuple[Team, Team]
+
+# "random" = สุ่มแล้วหั่นเป็นคู่ (แบบเดิม), "fair" = ดู pairing.fair_pair_teams
+# "balanced" = ทีมสูสีตามเรตติ้ง ดู pairing.balanced_pair_teams
+PAIRING_MODES = ("random", "fair", "balanced")
+
+PLAN_REPEAT_WEIGHT = 3.0   # น้ำหนักการเจอคู่แข่งซ้ำ เทียบกับการรอ 1 แมตช์ของ 1 คน
+
+
+def new_streak() -> Dict:
+    return {"team": None, "count": 0, "first_loser": None}
+
+
+def fmt_team(team: Team) -> str:
+    return " & ".join(team)
+
+
+def _as_match(m) -> Optional[Match]:
+    return (tuple(m[0]), tuple(m[1])) if m else None
+
+
+def _as_streak(streak: Dict) -> Dict:
+    return {k: tuple(v) if isinstance(v, list) else v for k, v in streak.items()}
+
+
+def _int_keys(d: Dict) -> Dict:
+    return {int(k): v for k, v in d.items()}
+
+
+def _seats_players(method: Callable) -> Callable:
+    """เมธอดที่เปลี่ยนคนบนคอร์ท: จบแล้วแจ้ง IdleTracker ว่าตอนนี้ใครอยู่บนคอร์ท (ปิด/เริ่มช่วงรอ)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.idle.seat(self.on_court(), self._now())
+        return result
+    return wrapper
+
+
+class _BaseScheduler:
+    """สถานะร่วม: รายชื่อ, สถิติ, ประวัติ และตัวสุ่มของ session"""
+
+    KIND = ""
+    # ฟิลด์ที่ต้องเก็บใน snapshot (history/stats derive จาก log ได้ จึงไม่ต้องเก็บ)
+    STATE_FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, players: List[str], *, pairing: str = "random",
+                 rng: Optional[random.Random] = None, seed: Optional[int] = None,
+                 started_at: Optional[float] = None):
+        if pairing not in PAIRING_MODES:
+            raise ValueError(f"unknown pairing mode: {pairing}")
+        self.players: List[str] = list(players)
+        self.pairing = pairing
+        # seed อยู่ใน options() → ถูกบันทึกใน start event ของ log
+        # seed + ลำดับผลแมตช์ = เล่นซ้ำทั้งคืนได้ตรงทุกการสุ่ม (ใช้ตอนมีข้อโต้แย้งเรื่องการหมุน)
+        if rng is None:
+            if seed is None:
+                seed = random.SystemRandom().randrange(2 ** 32)
+            rng = random.Random(seed)
+        self.seed = seed
+        self.rng = rng
+        # เวลาของเหตุการณ์ที่กำลังใช้ (apply_event ตั้งจาก log) → replay ได้เวลารอเท่าเดิม
+        self.event_ts: Optional[float] = None
+        self.started_at = started_at if started_at is not None else time.time()
+        self.history: List[Dict] = []   # {"court", "winner", "loser", "ts"}
+        # คนมาสาย: แต้มต่อจำนวนแมตช์ (ใช้จัดคิวเท่านั้น สถิติที่แสดงเป็นของจริง)
+        # และ [ลำดับแมตช์, เวลา] ที่เข้าก๊วน (เริ่มนับเวลารอจากตอนนั้น)
+        self.handicap: Dict[str, int] = {}
+        self.joined: Dict[str, List] = {}
+        self.init_stats()
+
+    def init_stats(self, roster: Optional[List[str]] = None):
+        """ตารางสถิติเริ่มต้น — roster = ทุกคนที่เคยอยู่ในก๊วน (ค่าเริ่มต้นคือรายชื่อตอนนี้)"""
+        roster = self.players if roster is None else roster
+        self.stats = {p: {"played": 0, "win": 0} for p in roster}
+        self.ratings: Dict[str, float] = {p: DEFAULT_RATING for p in roster}   # Elo สะสม
+        self.pairs = PairIndex(roster)   # นับคู่/คู่แข่งสะสม ถามค่าได้ O(1)
+        # bucket ตามจำนวนแมตช์ (รวมแต้มต่อ) — มีเฉพาะคนที่ยังอยู่ในก๊วน
+        self.played_index = PlayedIndex(self.players, self.handicap)
+        self.stats_table = StatsTable(self.stats, self.ratings)   # ตารางสถิติที่เรียงไว้แล้ว
+        self.player_matches: Dict[str, List[int]] = {}   # ดัชนีใน history ของแต่ละคน (ค้นประวัติ)
+        # เวลานั่งรอของแต่ละคน (คนมาสายเพิ่มตอน replay ถึงแมตช์ที่เข้าก๊วน ดู restore)
+        self.idle = IdleTracker([p for p in self.players if p not in self.joined], self.started_at)
+
+    def _now(self) -> float:
+        return self.event_ts if self.event_ts is not None else time.time()
+
+    def live_matches(self) -> List[Match]:
+        return []
+
+    def on_court(self) -> List[str]:
+        return [p for match in self.live_matches() for team in match for p in team]
+
+    def _update_stats(self, team: Team, *, is_winner: bool, rating_delta: float = 0.0):
+        for p in team:
+            s = self.stats.setdefault(p, {"played": 0, "win": 0})
+            s["played"] += 1
+            if p in self.played_index:   # คนที่ออกไปแล้วไม่กลับเข้า index ตอน replay
+                self.played_index.bump(p)
+            if is_winner:
+                s["win"] += 1
+            self.ratings[p] = self.ratings.get(p, DEFAULT_RATING) + (rating_delta if is_winner else -rating_delta)
+            self.stats_table.update(p)
+
+    def _record(self, court: int, winner: Team, loser: Team, ts: Optional[float] = None):
+        ts = self._now() if ts is None else ts
+        winner, loser = tuple(winner), tuple(loser)   # history ที่อ่านจาก JSON เป็น list
+        self._append_history(court, winner, loser, ts)
+        delta = elo_delta(winner, loser, self.ratings)   # คำนวณก่อนอัปเดตฝั่งใดฝั่งหนึ่ง
+        self._update_stats(winner, is_winner=True, rating_delta=delta)
+        self._update_stats(loser, is_winner=False, rating_delta=delta)
+        self.pairs.record(winner, loser)
+
+    def _append_history(self, court: int, winner: Team, loser: Team, ts: Optional[float]):
+        """ส่วนของ _record ที่ไม่เกี่ยวกับสถิติ (ใช้ตรงๆ ตอน restore ที่มีตารางสถิติมาแล้ว)"""
+        for p in winner + loser:
+            self.player_matches.setdefault(p, []).append(len(self.history))
+        self.history.append({"court": court, "winner": winner, "loser": loser, "ts": ts})
+        self.idle.record(winner + loser, ts)
+
+    # -----------------------------
+    # Snapshot / Restore
+    # -----------------------------
+    def options(self) -> Dict:
+        return {"pairing": self.pairing, "seed": self.seed, "started_at": self.started_at}
+
+    def snapshot(self) -> Dict:
+        state = {name: getattr(self, name) for name in self.STATE_FIELDS}
+        version, internal, gauss = self.rng.getstate()
+        state["rng"] = [version, list(internal), gauss]
+        state["started_at"] = self.started_at
+        state["players"] = self.players
+        # ทุกคนที่เคยอยู่ในก๊วน (รวมคนที่ออกไปก่อนได้เล่น) → ตารางสถิติหลังโหลดมีแถวครบเหมือนตอนเล่นจริง
+        state["roster"] = list(self.stats)
+        state["handicap"] = self.handicap
+        state["joined"] = self.joined
+        # ลำดับใน bucket ใช้ตัดสินคนเสมอกัน — เพิ่ม/ลบคนระหว่างคืนทำให้สร้างใหม่จาก history ไม่ได้ลำดับเดิม
+        buckets = self.played_index.buckets
+        state["played_order"] = [p for k in sorted(buckets) for p in buckets[k]]
+        state["idle"] = self.idle.state()
+        return state
+
+    def restore(self, state: Dict, history: List[Dict], *, tables: Optional[Dict] = None):
+        """คืนสถานะจาก snapshot แล้วคำนวณ stats/pairs ใหม่จาก history ที่อ่านจาก log
+
+        tables = {"stats", "ratings", "pairs"} ที่เก็บไว้แล้ว (binary snapshot) → ใช้ตรงๆ ไม่คำนวณใหม่
+        """
+        for name in self.STATE_FIELDS:
+            setattr(self, name, state[name])
+        version, internal, gauss = state["rng"]
+        self.rng.setstate((version, tuple(internal), gauss))
+        self._fix_state()
+        self.started_at = state["started_at"]
+        self.players = list(state["players"])
+        self.handicap = dict(state["handicap"])
+        self.joined = dict(state["joined"])
+        self.history = []
+        self.init_stats(state["roster"])
+        for rec in history:
+            if tables:
+                self._append_history(rec["court"], tuple(rec["winner"]), tuple(rec["loser"]), rec.get("ts"))
+            else:
+                self._record(rec["court"], rec["winner"], rec["loser"], rec.get("ts"))
+        if tables:
+            self._load_tables(tables)
+        # เวลารอ/ลำดับตัดสินเสมอ สร้างจาก history อย่างเดียวไม่ได้ → ใช้ค่าใน snapshot ตรงๆ
+        self.idle = IdleTracker.from_state(state["idle"])
+        count = self.played_index.count
+        self.played_index = PlayedIndex()
+        for p in state["played_order"]:
+            self.played_index.add(p, count[p])
+
+    def _load_tables(self, tables: Dict):
+        self.stats = tables["stats"]
+        self.ratings = tables["ratings"]
+        self.pairs = tables["pairs"]
+        self.stats_table = StatsTable(self.stats, self.ratings)
+        # จำนวนใน index = ที่เล่นจริง + แต้มต่อ (เหมือน replay ที่ bump ทีละแมตช์)
+        self.played_index = PlayedIndex(self.players, {
+            p: self.stats.get(p, {"played": 0})["played"] + self.handicap.get(p, 0) for p in self.players
+        })
+
+    def _fix_state(self):
+        """แปลงค่าที่ JSON ทำหาย (tuple, key เป็น int) กลับให้เหมือนเดิม"""
+
+    # -----------------------------
+    # Live roster (มาสาย / กลับก่อน โดยไม่ต้องเริ่มรอบใหม่)
+    # -----------------------------
+    @_seats_players
+    def add_player(self, p: str):
+        """เพิ่มคนระหว่างคืน: แก้แค่คิว/คนพักที่เกี่ยวข้อง ไม่สุ่มรอบใหม่
+
+        แต้มต่อ = นับเหมือนเล่นไปแล้วเท่าคนที่เล่นน้อยสุดตอนนี้ → ไม่แซงคิวยาวๆ จนกว่าจะตามทัน
+        (คนที่กลับมาอีกรอบใช้จำนวนเดิมของตัวเองถ้ามากกว่า)
+        """
+        if p in self.played_index:
+            raise ValueError(f"{p} อยู่ในก๊วนแล้ว")
+        s = self.stats.setdefault(p, {"played": 0, "win": 0})
+        floor = self.played_index.lo if len(self.played_index) else 0
+        count = max(floor, s["played"] + self.handicap.get(p, 0))
+        if count > s["played"]:
+            self.handicap[p] = count - s["played"]
+        self.players.append(p)
+        self.ratings.setdefault(p, DEFAULT_RATING)
+        self.played_index.add(p, count)
+        self.stats_table.add(p)
+        self.pairs.add(p)
+        now = self._now()
+        self.joined[p] = [self.idle.matches, now]
+        self.idle.remove(p)
+        self.idle.add(p, ts=now)
+        self._seat(p)
+
+    @_seats_players
+    def remove_player(self, p: str):
+        """เอาคนออกระหว่างคืน (สถิติที่เล่นไปแล้วยังอยู่ในตาราง)"""
+        if p not in self.played_index:
+            raise ValueError(f"ไม่มี {p} ในก๊วน")
+        self.players.remove(p)
+        self.played_index.remove(p)
+        self.idle.remove(p)
+        self.joined.pop(p, None)
+        self._unseat(p)
+
+    def _seat(self, p: str):
+        """จัดที่ให้คนมาใหม่ในคิว/คนพัก (แต่ละ engine)"""
+
+    def _unseat(self, p: str):
+        """เอา p ออกจากคอร์ท/คิว/คนพัก แล้วอุดช่องด้วยคนที่ว่างอยู่ (แต่ละ engine)"""
+
+    def _split(self, team: Team, p: str) -> Team:
+        return [q for q in team if q != p]
+
+    def _by_count(self, players: List[str]) -> List[str]:
+        return sorted(players, key=lambda q: self.played_index.count[q])
+
+    def _choose_resting_player(self, players: List[str]) -> Optional[str]:
+        """พักจากคนที่เล่นเยอะที่สุด (ถ้าจำนวนคนเป็นคี่) — หยิบจาก bucket บนสุด O(1)"""
+        if len(players) % 2 == 0:
+            return None
+        picked = self.played_index.pick_most_played(self.rng)
+        return picked[0] if picked else None
+
+    def _pair_teams(self, active_players: List[str]) -> List[Team]:
+        if self.pairing == "balanced":
+            return balanced_pair_teams(active_players, self.ratings, rng=self.rng)
+        if self.pairing == "fair":
+            played = {p: self.played_index.count[p] for p in active_players}
+            return fair_pair_teams(active_players, played, partner_count=self.pairs.partners,
+                                   opponent_count=self.pairs.opponents, rng=self.rng)
+        shuffled = active_players[:]
+        self.rng.shuffle(shuffled)
+        if len(shuffled) % 2 == 1:
+            shuffled = shuffled[:-1]
+        return [make_team(shuffled[i:i+2]) for i in range(0, len(shuffled), 2)]
+
+
+class TeamStreakScheduler(_BaseScheduler):
+    """คอร์ทเดียว ทีมชนะอยู่ต่อจนชนะครบ max_streak แล้วออกทั้งทีม
+
+    loser_fallback=True คือกติกาของ badminton_rotation_test.py:
+    ถ้าคิวหมดตอนทีมชนะต้องออก ให้ทีมที่แพ้ล่าสุดมาเจอ first_loser แทนการสุ่มรอบใหม่
+
+    lookahead=K > 0: จัดลำดับ K ทีมแรกของคิวด้วย planner (รอนาน/เล่นน้อยก่อน + เลี่ยงคู่แข่งซ้ำ)
+    แทน FIFO ตามลำดับสุ่ม — ทีมที่ประกาศไปแล้วไม่ถูกเลื่อน วางแผนเพิ่มเฉพาะท้ายแผน
+    """
+
+    KIND = "team_streak"
+    STATE_FIELDS = ("current_match", "queue", "winner_streak", "resting_player", "last_match")
+
+    def __init__(self, players: List[str], *, max_streak: int = 2,
+                 loser_fallback: bool = False, lookahead: int = 0, pairing: str = "random",
+                 rng: Optional[random.Random] = None, seed: Optional[int] = None,
+                 started_at: Optional[float] = None):
+        super().__init__(players, pairing=pairing, rng=rng, seed=seed, started_at=started_at)
+        self.max_streak = max_streak
+        self.loser_fallback = loser_fallback
+        self.lookahead = lookahead
+        self.current_match: Optional[Match] = None
+        self.queue: List[Team] = []
+        self.winner_streak = new_streak()
+        self.resting_player: Optional[str] = None
+        self.last_match: Optional[Match] = None   # ป้องกันไม่ให้เจอคู่เดิมซ้ำทันที
+
+    def options(self) -> Dict:
+        return dict(super().options(), max_streak=self.max_streak, loser_fallback=self.loser_fallback,
+                    lookahead=self.lookahead)
+
+    def live_matches(self) -> List[Match]:
+        return [self.current_match] if self.current_match else []
+
+    def _fix_state(self):
+        self.current_match = _as_match(self.current_match)
+        self.last_match = _as_match(self.last_match)
+        self.queue = [tuple(t) for t in self.queue]
+        self.winner_streak = _as_streak(self.winner_streak)
+
+    @_seats_players
+    def start_new_round(self):
+        players = self.players[:]
+        if len(players) < 4:
+            self.current_match = None
+            self.queue = []
+            return
+
+        self.resting_player = self._choose_resting_player(players)
+        active = [p for p in players if p != self.resting_player]
+
+        teams = self._pair_teams(active)
+        if len(teams) < 2:
+            self.current_match = None
+            self.queue = []
+            return
+
+        # หลีกเลี่ยงจับคู่ซ้ำกับ last_match (ทันที)
+        first, second = teams[0], teams[1]
+        if self.last_match:
+            if {first, second} == set(self.last_match) and len(teams) > 2:
+                if self.pairing != "random":
+                    # คงลำดับที่คำนวณไว้ แค่เปลี่ยนคู่แข่งเป็นทีมถัดไป
+                    teams[1], teams[2] = teams[2], teams[1]
+                else:
+                    self.rng.shuffle(teams)
+                first, second = teams[0], teams[1]
+
+        self.current_match = (first, second)
+        self.queue = teams[2:]
+        self.winner_streak = new_streak()
+        self._plan(keep=0)
+
+    # -----------------------------
+    # Lookahead planning
+    # -----------------------------
+    def _waited(self, p: str) -> int:
+        """จำนวนแมตช์ที่นั่งรอตั้งแต่เล่นครั้งล่าสุด — O(1) จาก player_matches"""
+        played_at = self.player_matches.get(p)
+        return len(self.history) - (played_at[-1] + 1 if played_at else 0)
+
+    def _urgency(self, team: Team) -> float:
+        top = self.played_index.hi
+        return sum(self._waited(p) + (top - self.played_index.count[p]) for p in team)
+
+    def _repeat_cost(self, prev: Optional[Team], team: Team) -> float:
+        if not prev:
+            return 0.0
+        return PLAN_REPEAT_WEIGHT * sum(self.pairs.opponents(a, b) for a in prev for b in team)
+
+    def _plan(self, keep: int):
+        """จัดลำดับ lookahead ทีมแรกของคิว ตั้งแต่ตำแหน่ง keep (ส่วนหน้าคงเดิม)"""
+        if self.lookahead <= 0 or not self.queue:
+            return
+        # ทีมแรกของคิวจะเจอผู้ชนะแมตช์ปัจจุบัน (ยังไม่รู้ฝั่ง) → ใช้ทั้งสองทีมเป็นตัวตั้ง
+        head = [p for t in self.current_match for p in t] if self.current_match else None
+        self.queue = plan_queue(self.queue, k=self.lookahead, keep=keep, urgency=self._urgency,
+                                link=self._repeat_cost, head=head)
+
+    def upcoming(self) -> List[Team]:
+        """ทีมที่จะได้ลงคอร์ทตามลำดับ (แผน lookahead ถ้าเปิดไว้)"""
+        return self.queue[:self.lookahead] if self.lookahead > 0 else list(self.queue)
+
+    # -----------------------------
+    # Live roster
+    # -----------------------------
+    def _seat(self, p: str):
+        if not self.current_match:
+            self.start_new_round()
+        elif self.resting_player is not None:
+            # มีคนพักรออยู่ → จับคู่กับคนมาใหม่เป็นทีมท้ายคิว (ไม่ขยับทีมที่ประกาศไปแล้ว)
+            self.queue.append(make_team([self.resting_player, p]))
+            self.resting_player = None
+        else:
+            self.resting_player = p   # รอคู่ หรือได้ลงตอนจัดรอบใหม่ (แต้มต่อไม่ให้ถูกพักก่อน)
+
+    def _unseat(self, p: str):
+        # ทีมที่มี p ไม่ใช่ทีมเดิมอีกต่อไป → สตรีคที่อ้างถึงทีมนั้นใช้ต่อไม่ได้
+        if self.winner_streak["team"] and p in self.winner_streak["team"]:
+            self.winner_streak = new_streak()
+        elif self.winner_streak["first_loser"] and p in self.winner_streak["first_loser"]:
+            self.winner_streak["first_loser"] = None
+        was_resting = p == self.resting_player
+        if was_resting:
+            self.resting_player = None
+        if len(self.players) < 4:
+            self.start_new_round()
+            return
+        if was_resting:
+            return
+        for i, team in enumerate(self.queue):
+            if p in team:
+                mate = self._split(team, p)
+                if self.resting_player is not None:
+                    self.queue[i] = make_team(mate + [self.resting_player])
+                    self.resting_player = None
+                else:
+                    del self.queue[i]
+                    self.resting_player = mate[0]
+                    self._plan(keep=i)
+                return
+        if not self.current_match or not any(p in team for team in self.current_match):
+            return
+
+        side = 0 if p in self.current_match[0] else 1
+        mate = self._split(self.current_match[side], p)
+        if self.resting_player is not None:
+            fixed = make_team(mate + [self.resting_player])
+            self.resting_player = None
+        elif self.queue:
+            # ยืมคนที่เล่นน้อยกว่าจากทีมหน้าคิว อีกคนไปพักแทน
+            sub, spare = self._by_count(self.queue.pop(0))
+            fixed = make_team(mate + [sub])
+            self.resting_player = spare
+            self._plan(keep=self.lookahead - 1)
+        else:
+            self.start_new_round()
+            return
+        match = list(self.current_match)
+        match[side] = fixed
+        self.current_match = self.last_match = (match[0], match[1])
+
+    @_seats_players
+    def process_result(self, winner_side: str):
+        if not self.current_match:
+            return
+
+        left, right = self.current_match
+        winner = left if winner_side == "left" else right
+        loser = right if winner_side == "left" else left
+        self._record(0, winner, loser)
+        popped = False
+
+        # อัปเดตสตรีคของทีมที่ชนะ
+        if self.winner_streak["team"] == winner:
+            self.winner_streak["count"] += 1
+        else:
+            # เริ่มสตรีคใหม่และจำ "ทีมที่แพ้ในแมตช์แรกของสตรีค"
+            self.winner_streak = {"team": winner, "count": 1, "first_loser": loser}
+
+        if self.winner_streak["count"] >= self.max_streak:
+            # ชนะครบ → ทีมชนะออก ให้ first_loser เจอทีมจากคิว (หรือ loser ถ้าเปิด fallback)
+            first_loser = self.winner_streak["first_loser"]
+            if self.queue:
+                incoming = self.queue.pop(0)
+                popped = True
+            elif self.loser_fallback:
+                incoming = loser
+            else:
+                incoming = None
+
+            if incoming is None or not first_loser:
+                self.start_new_round()
+            else:
+                self.current_match = (first_loser, incoming)
+            self.winner_streak = new_streak()
+        else:
+            # ทีมชนะอยู่ต่อ + หาคู่ใหม่
+            if self.queue:
+                incoming = self.queue.pop(0)
+                self.current_match = (winner, incoming)
+                popped = True
+            else:
+                self.start_new_round()
+
+        if popped:
+            # ทีมที่ประกาศไว้แล้วเลื่อนขึ้นหนึ่งช่อง วางแผนใหม่แค่ช่องท้าย
+            self._plan(keep=self.lookahead - 1)
+        self.last_match = self.current_match
+
+
+class MultiCourtScheduler(_BaseScheduler):
+    """หลายคอร์ท: ทุกคอร์ทดึงทีมจากคิวรอกลางคิวเดียว และเดินเกมของตัวเองโดยไม่รบกวนคอร์ทอื่น
+
+    - ทีมชนะอยู่ต่อ ทีมแพ้ไปต่อท้ายคิวกลาง แล้วคอร์ทนั้นดึงทีมหน้าคิวมาเล่น
+    - ชนะครบ max_streak → ทั้งสองทีมไปต่อท้ายคิว แล้วดึงสองทีมหน้าคิวลงคอร์ทแทน
+    - ทีมที่กลับเข้าคิวถูกแยกแล้วจับคู่ใหม่ (ผสมกับทีมท้ายคิวถ้าออกมาทีมเดียว) → คู่ไม่ตายตัวทั้งคืน
+    - คอร์ทเดิมเลี่ยงคู่แข่งที่เพิ่งเจอกัน ถ้าคิวมีทีมอื่นให้เลือก
+    - คิวว่างและไม่มีคนพัก → แลกคนหนึ่งคนกับทีมท้าทายของคอร์ทอื่น (ไม่มีคอร์ทไหนเป็นกลุ่มปิด)
+    การเปลี่ยนทีมต่อคอร์ทเป็น O(1) (deque) ไม่ว่าจะมีกี่คอร์ทหรือกี่คน
+    """
+
+    KIND = "multi_court"
+    STATE_FIELDS = ("current_matches", "wait_pool", "winner_streaks", "resting_players", "last_matches")
+
+    def __init__(self, players: List[str], *, num_courts: int = 1, max_streak: int = 2,
+                 pairing: str = "random", rng: Optional[random.Random] = None,
+                 seed: Optional[int] = None, started_at: Optional[float] = None):
+        super().__init__(players, pairing=pairing, rng=rng, seed=seed, started_at=started_at)
+        self.num_courts = num_courts
+        self.max_streak = max_streak
+        self.current_matches: List[Optional[Match]] = []
+        self.wait_pool: Deque[Team] = deque()   # คิวรอกลางของทุกคอร์ท
+        self.winner_streaks: Dict[int, Dict] = {}
+        self.resting_players: List[str] = []
+        self.last_matches: Dict[int, Match] = {}
+
+    def options(self) -> Dict:
+        return dict(super().options(), num_courts=self.num_courts, max_streak=self.max_streak)
+
+    def live_matches(self) -> List[Match]:
+        return [m for m in self.current_matches if m]
+
+    def snapshot(self) -> Dict:
+        state = super().snapshot()
+        state["wait_pool"] = list(self.wait_pool)
+        return state
+
+    def _fix_state(self):
+        self.current_matches = [_as_match(m) for m in self.current_matches]
+        self.wait_pool = deque(tuple(t) for t in self.wait_pool)
+        self.winner_streaks = {c: _as_streak(s) for c, s in _int_keys(self.winner_streaks).items()}
+        self.last_matches = {c: _as_match(m) for c, m in _int_keys(self.last_matches).items()}
+
+    def _choose_resting_players(self, players: List[str], num_rest: int) -> List[str]:
+        """พักจากคนที่เล่นเยอะที่สุด ตามจำนวนที่ต้องการ"""
+        if num_rest <= 0:
+            return []
+        return self.played_index.pick_most_played(self.rng, num_rest)
+
+    def _take(self, avoid: Optional[Team] = None) -> Optional[Team]:
+        """ดึงทีมหน้าคิว ถ้าเป็นทีม avoid (เพิ่งเจอกัน) และคิวมีทีมอื่น ให้ข้ามไปทีมถัดไป"""
+        if not self.wait_pool:
+            return None
+        team = self.wait_pool.popleft()
+        if avoid is not None and team == avoid and self.wait_pool:
+            team, nxt = self.wait_pool.popleft(), team
+            self.wait_pool.appendleft(nxt)
+        return team
+
+    def _last_opponent(self, court_idx: int, team: Optional[Team]) -> Optional[Team]:
+        """ทีมที่ team เพิ่งเจอในคอร์ทนี้ (ใช้เป็น avoid ของ _take)"""
+        last = self.last_matches.get(court_idx)
+        if not last or team is None or team not in last:
+            return None
+        return last[1] if last[0] == team else last[0]
+
+    def _requeue(self, leaving: List[Team]):
+        """ทีมที่ออกจากคอร์ทกลับเข้าคิวแบบจับคู่ใหม่
+
+        ออกมาทีมเดียว → ผสมกับทีมท้ายคิว (คนที่เพิ่งเข้าคิวเหมือนกัน) ก่อนจับคู่ ไม่งั้นทีมเดิมวนกลับมาตลอด
+        """
+        mix = list(leaving)
+        if len(mix) == 1 and self.wait_pool:
+            mix.append(self.wait_pool.pop())
+        if len(mix) < 2:
+            self.wait_pool.extend(mix)
+            return
+        teams = self._pair_teams([p for team in mix for p in team])
+        # ทีมที่เล่นน้อยกว่าได้ลงก่อน (random/balanced คืนลำดับตามการสุ่ม/เรตติ้ง)
+        count = self.played_index.count
+        teams.sort(key=lambda t: sum(count[p] for p in t))
+        self.wait_pool.extend(teams)
+
+    def _borrow(self, court_idx: int, leaving: List[Team]) -> List[Team]:
+        """คิวว่างและไม่มีคนพัก (คน = 4 × คอร์ท) → แลกคนหนึ่งคนกับทีมท้าทายของคอร์ทอื่น
+
+        ไม่งั้นคนที่ออกจากคอร์ทได้กลับมาคอร์ทเดิมกับคนกลุ่มเดิมทั้งคืน (คอร์ทกลายเป็นกลุ่มปิด)
+        หน้าเดิมสุ่มใหม่ทุกคอร์ทตอนคิวหมด ที่นี่แตะแค่ทีมเดียวของคอร์ทเดียว คืนทีมที่เหลือให้ _requeue
+        """
+        # คนที่ถูกยืมออกมาเสียเกมที่ค้างอยู่ → เลือกคนที่เล่นมากสุดจากทีมท้าทาย (ไม่ใช่ทีมที่กำลังติดสตรีค)
+        count = self.played_index.count
+        best = None
+        for c, match in enumerate(self.current_matches):
+            if c == court_idx or not match:
+                continue
+            holder = self.winner_streaks.get(c, new_streak())["team"]
+            for side, team in enumerate(match):
+                if team == holder:
+                    continue
+                for out in team:
+                    key = (count[out], self.rng.random())
+                    if best is None or key > best[0]:
+                        best = (key, c, side, out)
+        if best is None:
+            return leaving
+        _, c, side, out = best
+        match = self.current_matches[c]
+        keep = match[side][0] if match[side][1] == out else match[side][1]
+        players = [p for team in leaving for p in team]
+        joiner = players.pop(self.rng.randrange(len(players)))
+        patched = list(match)
+        patched[side] = make_team([keep, joiner])
+        self.current_matches[c] = self.last_matches[c] = (patched[0], patched[1])
+        players.append(out)
+        return [make_team(players[i:i + 2]) for i in range(0, len(players), 2)]
+
+    def _rotate_resting(self, team: Team) -> Team:
+        """คนที่พักอยู่เข้าแทนคนที่เล่นมากสุดของทีมที่กำลังกลับเข้าคิว (ถ้าคนพักเล่นน้อยกว่า)"""
+        if not self.resting_players:
+            return team
+        count = self.played_index.count
+        incoming = min(self.resting_players, key=lambda p: count[p])
+        outgoing = max(team, key=lambda p: count[p])
+        if count[incoming] >= count[outgoing]:
+            return team
+        self.resting_players[self.resting_players.index(incoming)] = outgoing
+        return make_team(incoming if p == outgoing else p for p in team)
+
+    @_seats_players
+    def start_new_round(self):
+        """จับทีมใหม่ทั้งหมดแล้วลงทุกคอร์ท (ใช้ตอนเริ่มคืน/กดเริ่มรอบใหม่เท่านั้น)"""
+        players = self.players[:]
+        self.current_matches = []
+        self.wait_pool = deque()
+        self.winner_streaks = {}
+        if len(players) < 4:
+            return
+
+        self.resting_players = self._choose_resting_players(players, len(players) % 2)
+        resting = set(self.resting_players)
+        active = [p for p in players if p not in resting]
+        self.wait_pool = deque(self._pair_teams(active))
+        for c in range(self.num_courts):
+            if len(self.wait_pool) < 2:
+                self.current_matches.append(None)
+                continue
+            self.current_matches.append((self.wait_pool.popleft(), self.wait_pool.popleft()))
+            self.winner_streaks[c] = new_streak()
+            self.last_matches[c] = self.current_matches[c]
+
+    def validate_results(self, results: Dict[int, str]):
+        """ตรวจผลทุกคอร์ทก่อนบันทึก (ValueError ถ้ามีรายการไหนใช้ไม่ได้ → ไม่บันทึกสักคอร์ท)"""
+        for court_idx, side in results.items():
+            if side not in ("left", "right"):
+                raise ValueError(f"court {court_idx}: unknown side {side!r}")
+            if not 0 <= court_idx < len(self.current_matches) or not self.current_matches[court_idx]:
+                raise ValueError(f"court {court_idx}: no match in progress")
+
+    @_seats_players
+    def process_results(self, results: Dict[int, str]):
+        """บันทึกผลหลายคอร์ทพร้อมกัน: บันทึกทุกแมตช์ → ส่งทีมที่ออกเข้าคิว → จัดคอร์ทว่างรอบเดียว"""
+        self.validate_results(results)
+        stayers: Dict[int, Optional[Team]] = {}
+        leaving: List[Team] = []
+        for court_idx in sorted(results):
+            left, right = self.current_matches[court_idx]
+            winner = left if results[court_idx] == "left" else right
+            loser = right if results[court_idx] == "left" else left
+            self._record(court_idx, winner, loser)
+
+            streak = self.winner_streaks.get(court_idx) or new_streak()
+            if streak["team"] == winner:
+                streak["count"] += 1
+            else:
+                streak = {"team": winner, "count": 1, "first_loser": loser}
+            self.winner_streaks[court_idx] = streak
+
+            # คนแพ้ (และคนชนะที่ครบ streak) ออกจากคอร์ท → จับคู่ใหม่ทั้งชุดแล้วต่อท้ายคิว ก่อนดึงทีมใหม่
+            leaving.append(self._rotate_resting(loser))
+            if streak["count"] >= self.max_streak:
+                leaving.append(self._rotate_resting(winner))
+                self.winner_streaks[court_idx] = new_streak()
+                stayers[court_idx] = None
+            else:
+                stayers[court_idx] = winner
+        if len(stayers) == 1 and not self.wait_pool and not self.resting_players:
+            leaving = self._borrow(court_idx, leaving)
+        self._requeue(leaving)
+
+        for court_idx, stayer in stayers.items():
+            if stayer is None:
+                first = self._take()
+                self.current_matches[court_idx] = (first, self._take(avoid=self._last_opponent(court_idx, first)))
+            else:
+                self.current_matches[court_idx] = (stayer, self._take(avoid=self._last_opponent(court_idx, stayer)))
+            self.last_matches[court_idx] = self.current_matches[court_idx]
+
+    def process_result(self, winner_side: str, court_idx: int):
+        if not 0 <= court_idx < len(self.current_matches) or not self.current_matches[court_idx]:
+            return
+        self.process_results({court_idx: winner_side})
+
+    # -----------------------------
+    # Live roster
+    # -----------------------------
+    def _pop_resting(self) -> str:
+        """คนพักที่เล่นน้อยสุด (แต้มต่อรวมแล้ว)"""
+        p = self._by_count(self.resting_players)[0]
+        self.resting_players.remove(p)
+        return p
+
+    def _seat(self, p: str):
+        if not any(self.current_matches) and not self.wait_pool:
+            self.start_new_round()
+            return
+        if self.resting_players:
+            self.wait_pool.append(make_team([self._pop_resting(), p]))
+        else:
+            self.resting_players.append(p)
+        # คอร์ทที่ว่างอยู่ (คนไม่พอ) ได้ทีมลงเล่นทันทีที่คิวมีครบสองทีม
+        for c in range(self.num_courts):
+            if c == len(self.current_matches):
+                self.current_matches.append(None)
+            if self.current_matches[c] is None and len(self.wait_pool) >= 2:
+                self.current_matches[c] = self.last_matches[c] = (self._take(), self._take())
+                self.winner_streaks[c] = new_streak()
+
+    def _unseat(self, p: str):
+        was_resting = p in self.resting_players
+        if was_resting:
+            self.resting_players.remove(p)
+        if len(self.players) < 4:
+            self.start_new_round()
+            return
+        if was_resting:
+            return
+        for i, team in enumerate(self.wait_pool):
+            if p in team:
+                mate = self._split(team, p)
+                if self.resting_players:
+                    self.wait_pool[i] = make_team(mate + [self._pop_resting()])
+                else:
+                    del self.wait_pool[i]
+                    self.resting_players.extend(mate)
+                return
+        for c, match in enumerate(self.current_matches):
+            if match and any(p in team for team in match):
+                break
+        else:
+            return
+
+        side = 0 if p in match[0] else 1
+        mate = self._split(match[side], p)
+        self.winner_streaks[c] = new_streak()
+        if self.resting_players:
+            fixed = make_team(mate + [self._pop_resting()])
+        elif self.wait_pool:
+            sub, spare = self._by_count(self.wait_pool.popleft())
+            fixed = make_team(mate + [sub])
+            self.resting_players.append(spare)
+        else:
+            # ไม่มีใครมาแทน → คอร์ทนี้ว่าง อีกทีมกลับเข้าคิว (คอร์ทอื่นเล่นต่อตามเดิม)
+            self.wait_pool.append(match[1 - side])
+            self.resting_players.extend(mate)
+            self.current_matches[c] = None
+            return
+        patched = list(match)
+        patched[side] = fixed
+        self.current_matches[c] = self.last_matches[c] = (patched[0], patched[1])
+
+
+class IndividualStreakScheduler(_BaseScheduler):
+    """กติกาของ test1.py: นับ streak รายคน และดึงคนที่เล่นน้อยสุดเข้ามาแทน"""
+
+    KIND = "individual_streak"
+    STATE_FIELDS = ("matches", "current_match", "win_streak", "resting")
+
+    def __init__(self, players: List[str], *, max_streak: int = 2,
+                 pairing: str = "random", rng: Optional[random.Random] = None,
+                 seed: Optional[int] = None, started_at: Optional[float] = None):
+        super().__init__(players, pairing=pairing, rng=rng, seed=seed, started_at=started_at)
+        self.max_streak = max_streak
+        self.matches: List[Match] = []
+        self.current_match: Optional[Match] = None
+        self.win_streak: Dict[str, int] = {}
+        self.resting: Optional[str] = None
+        self.reset()
+
+    def options(self) -> Dict:
+        return dict(super().options(), max_streak=self.max_streak)
+
+    def live_matches(self) -> List[Match]:
+        return [self.current_match] if self.current_match else []
+
+    def _fix_state(self):
+        self.matches = [_as_match(m) for m in self.matches]
+        self.current_match = _as_match(self.current_match)
+
+    def reset(self):
+        self.matches = []
+        self.current_match = None
+        self.win_streak = {p: 0 for p in self.players}
+        if self.history:
+            self.started_at = self._now()   # ล้างคืนที่เล่นไปแล้ว → เวลารอเริ่มนับใหม่
+        self.history = []
+        self.handicap = {}
+        self.joined = {}
+        self.init_stats()
+        self.resting = None
+        self.make_new_round()
+
+    def make_teams(self, players: List[str]) -> List[Team]:
+        if self.pairing != "random":
+            return self._pair_teams(players)
+        self.rng.shuffle(players)
+        return [make_team(players[i:i+2]) for i in range(0, len(players), 2)]
+
+    @_seats_players
+    def make_new_round(self):
+        players = self.players.copy()
+
+        # ถ้าจำนวนคนเป็นคี่ → ให้พักคนที่เล่นเยอะที่สุด
+        if len(players) % 2 == 1:
+            most_played = self.played_index.pick_most_played(self.rng)[0]
+            self.resting = most_played
+            players.remove(most_played)
+        else:
+            self.resting = None
+
+        teams = self.make_teams(players)
+
+        # สร้างแมตช์ใหม่จากทีม
+        self.matches = []
+        for i in range(0, len(teams), 2):
+            if i+1 < len(teams):
+                self.matches.append((teams[i], teams[i+1]))
+
+        if self.matches:
+            self.current_match = self.matches.pop(0)
+        else:
+            self.current_match = None
+
+    @_seats_players
+    def process_result(self, winner_side: str):
+        if not self.current_match:
+            return
+
+        left, right = self.current_match
+        winner = left if winner_side == "left" else right
+        loser = right if winner_side == "left" else left
+        self._record(0, winner, loser)
+
+        for p in winner:
+            self.win_streak[p] += 1
+        for p in loser:
+            self.win_streak[p] = 0
+
+        # ถ้าชนะติดครบ → ต้องออก
+        if all(self.win_streak[p] >= self.max_streak for p in winner):
+            for p in winner:
+                self.win_streak[p] = 0
+            survivor = None
+        else:
+            survivor = winner
+
+        # คนใหม่เข้ามาแทนที่: เลือกคนเล่นน้อยสุดจาก bucket ล่างสุด (ข้ามคนที่อยู่บนคอร์ท)
+        new_players = self.played_index.least_played(len(loser), exclude=set(winner + loser))
+
+        if survivor:
+            if len(new_players) == len(loser):
+                self.current_match = (survivor, make_team(new_players))
+            else:
+                self.make_new_round()   # คนนอกคอร์ทไม่พอเปลี่ยนทีม (ก๊วนเหลือ 4–5 คน)
+        else:
+            if len(new_players) == 4:
+                self.current_match = (make_team(new_players[:2]), make_team(new_players[2:]))
+            else:
+                self.make_new_round()
+
+    # -----------------------------
+    # Live roster
+    # -----------------------------
+    def _seat(self, p: str):
+        # คนนอกคอร์ทรอแบบไม่มีคิว → คนมาใหม่ถูกเลือกเมื่อแต้มต่อเท่ากับคนที่เล่นน้อยสุด
+        self.win_streak[p] = 0
+        if not self.current_match:
+            self.make_new_round()
+
+    def _unseat(self, p: str):
+        self.win_streak.pop(p, None)
+        if p == self.resting:
+            self.resting = None
+        self.matches = [m for m in self.matches if p not in m[0] + m[1]]
+        if len(self.players) < 4:
+            self.current_match = None
+            return
+        if not self.current_match or not any(p in team for team in self.current_match):
+            return
+        on_court = [q for team in self.current_match for q in team]
+        sub = self.played_index.least_played(1, exclude=on_court)
+        if not sub:
+            self.make_new_round()
+            return
+        self.win_streak[sub[0]] = 0
+        left, right = (make_team(sub[0] if q == p else q for q in team) for team in self.current_match)
+        self.current_match = (left, right)
+
+
+ENGINES = {cls.KIND: cls for cls in (TeamStreakScheduler, MultiCourtScheduler, IndividualStreakScheduler)}
+
+
+def create_engine(kind: str, players: List[str], options: Optional[Dict] = None,
+                  rng: Optional[random.Random] = None) -> _BaseScheduler:
+    if kind not in ENGINES:
+        raise ValueError(f"unknown engine kind: {kind}")
+    return ENGINES[kind](players, rng=rng, **(options or {}))
@@ -0,0 +1,234 @@
+import json
+import os
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .engine import MultiCourtScheduler, create_engine
+
+# ============================================================
+# 📝 Append-only Event Log + Snapshot (กันข้อมูลหายตอน refresh/restart)
+# ============================================================
+# <id>.jsonl       — ทุกเหตุการณ์ของคืน (start / result / round / reset / add/remove_player) ต่อท้ายอย่างเดียว
+#                    คืนที่นำเข้าจากไฟล์ (binsnap) มี import ต่อจาก start = สถานะ + ประวัติทั้งหมดตอนนำเข้า
+# <id>.snap.json   — สถานะจัดคิวล่าสุด เขียนทุก SNAPSHOT_EVERY เหตุการณ์
+# โหลดคืน = อ่าน snapshot + replay เฉพาะเหตุการณ์หลัง snapshot
+# history/stats คำนวณจาก result ใน log (ไม่มีลิสต์ข้อความแยกเก็บอีกชุด)
+
+DATA_DIR = os.environ.get("BADMINTON_DATA_DIR", ".badminton_data")
+SNAPSHOT_EVERY = 25
+
+
+def sessions_dir(directory: Optional[str] = None) -> str:
+    return os.path.join(directory or DATA_DIR, "sessions")
+
+
+def new_session_id() -> str:
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + uuid.uuid4().hex[:6]
+
+
+def apply_event(engine, event: Dict):
+    """เล่นเหตุการณ์หนึ่งรายการกับ engine (ใช้ทั้งตอนกดจริงและตอน replay)"""
+    kind = event["type"]
+    engine.event_ts = event.get("ts")
+    if kind == "result":
+        if isinstance(engine, MultiCourtScheduler):
+            engine.process_result(event["side"], event["court"])
+        else:
+            engine.process_result(event["side"])
+    elif kind == "results":
+        # ผลหลายคอร์ทในเหตุการณ์เดียว (บันทึกทั้งชุดหรือไม่บันทึกเลย)
+        engine.process_results({court: side for court, side in event["sides"]})
+    elif kind == "round":
+        if hasattr(engine, "start_new_round"):
+            engine.start_new_round()
+        else:
+            engine.make_new_round()
+    elif kind == "reset":
+        engine.reset()
+    elif kind == "add_player":
+        engine.add_player(event["player"])
+    elif kind == "remove_player":
+        engine.remove_player(event["player"])
+    elif kind == "import":
+        engine.restore(event["state"], event["history"])
+    else:
+        raise ValueError(f"unknown event type: {kind}")
+
+
+def read_events(path: str) -> Iterator[Tuple[int, Dict]]:
+    """อ่านทีละบรรทัด คืน (offset หลังบรรทัด, event) — บรรทัดท้ายที่เขียนไม่จบจะถูกข้าม"""
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                event = json.loads(line)
+            except ValueError:
+                break
+            offset += len(line)
+            yield offset, event
+
+
+class SessionLog:
+    def __init__(self, session_id: str, *, directory: Optional[str] = None,
+                 snapshot_every: int = SNAPSHOT_EVERY):
+        self.session_id = session_id
+        self.dir = sessions_dir(directory)
+        self.snapshot_every = snapshot_every
+        self.seq = -1
+        self.last_snapshot_seq = -1
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.dir, f"{self.session_id}.jsonl")
+
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.dir, f"{self.session_id}.snap.json")
+
+    # -----------------------------
+    # Write
+    # -----------------------------
+    @classmethod
+    def start(cls, engine, *, session_id: Optional[str] = None, directory: Optional[str] = None,
+              snapshot_every: int = SNAPSHOT_EVERY, imported: bool = False) -> "SessionLog":
+        """เริ่มคืนใหม่: บันทึก start + snapshot แรก (engine ต้องจัดรอบแรกไว้แล้ว)
+
+        imported=True = engine มาจากไฟล์ snapshot กลางคืน → เก็บสถานะ + ประวัติไว้ใน import event
+        """
+        log = cls(session_id or new_session_id(), directory=directory, snapshot_every=snapshot_every)
+        os.makedirs(log.dir, exist_ok=True)
+        log._append({
+            "type": "start",
+            "kind": engine.KIND,
+            "players": engine.players,
+            "options": engine.options(),
+        })
+        if imported:
+            log._append({"type": "import", "state": engine.snapshot(), "history": engine.history})
+        log.write_snapshot(engine)
+        return log
+
+    def _append(self, event: Dict) -> Dict:
+        self.seq += 1
+        event = dict(event, seq=self.seq)
+        event.setdefault("ts", round(time.time(), 3))
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        return event
+
+    def write_snapshot(self, engine):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"seq": self.seq, "state": engine.snapshot()}, f, ensure_ascii=False,
+                      separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        self.last_snapshot_seq = self.seq
+
+    def commit(self, engine, event: Dict) -> Dict:
+        """ใช้เหตุการณ์กับ engine แล้วต่อท้าย log (result จะเก็บทีมชนะ/แพ้ไว้ด้วย)"""
+        before = len(engine.history)
+        # ประทับเวลาก่อนใช้ → engine กับ log เห็นเวลาเดียวกัน (replay ได้เวลารอตรงกัน)
+        event = dict(event, ts=event.get("ts", round(time.time(), 3)))
+        apply_event(engine, event)
+        if event["type"] == "result":
+            if len(engine.history) == before:
+                return event   # ไม่มีแมตช์ให้บันทึก
+            rec = engine.history[-1]
+            event = dict(event, court=rec["court"], winner=rec["winner"], loser=rec["loser"])
+        elif event["type"] == "results":
+            event = dict(event, records=engine.history[before:])
+        event = self._append(event)
+        if self.seq - self.last_snapshot_seq >= self.snapshot_every:
+            self.write_snapshot(engine)
+        return event
+
+    def result(self, engine, side: str, court: int = 0) -> Dict:
+        return self.commit(engine, {"type": "result", "side": side, "court": court})
+
+    def results(self, engine, sides: Dict[int, str]) -> Dict:
+        """ผลทุกคอร์ทเป็นเหตุการณ์เดียว → version ขยับครั้งเดียว"""
+        return self.commit(engine, {"type": "results", "sides": sorted(sides.items())})
+
+    # -----------------------------
+    # Load (snapshot + replay)
+    # -----------------------------
+    @classmethod
+    def load(cls, session_id: str, *, directory: Optional[str] = None,
+             snapshot_every: int = SNAPSHOT_EVERY, use_snapshot: bool = True):
+        """คืนค่า (engine, log) ของคืนที่บันทึกไว้
+
+        use_snapshot=False = เล่นซ้ำทั้งคืนจาก seed ใน start event + ทุกเหตุการณ์
+        """
+        log = cls(session_id, directory=directory, snapshot_every=snapshot_every)
+        snap = None
+        if use_snapshot and os.path.exists(log.snapshot_path):
+            with open(log.snapshot_path, encoding="utf-8") as f:
+                snap = json.load(f)
+
+        engine = None
+        history: List[Dict] = []
+        tail: List[Dict] = []
+        good_offset = 0
+        for good_offset, event in read_events(log.path):
+            log.seq = event["seq"]
+            if event["type"] == "start":
+                engine = create_engine(event["kind"], event["players"], event["options"])
+                continue
+            if snap and event["seq"] <= snap["seq"]:
+                if event["type"] == "reset":
+                    history = []
+                elif event["type"] == "import":
+                    history = list(event["history"])
+                elif event["type"] == "result":
+                    history.append({"court": event["court"], "winner": event["winner"],
+                                    "loser": event["loser"], "ts": event.get("ts")})
+                elif event["type"] == "results":
+                    history.extend(event["records"])
+            else:
+                tail.append(event)
+        if engine is None:
+            raise FileNotFoundError(f"no start event in {log.path}")
+
+        # ตัดบรรทัดที่เขียนไม่จบ (เช่นไฟดับกลางการเขียน) เพื่อให้ต่อท้ายได้ถูกต้อง
+        if os.path.getsize(log.path) != good_offset:
+            with open(log.path, "r+b") as f:
+                f.truncate(good_offset)
+
+        if snap:
+            engine.restore(snap["state"], history)
+            log.last_snapshot_seq = snap["seq"]
+        elif hasattr(engine, "start_new_round"):
+            engine.start_new_round()   # start = สร้าง engine + จัดรอบแรก
+        for event in tail:
+            apply_event(engine, event)
+        return engine, log
+
+
+def replay(session_id: str, *, directory: Optional[str] = None):
+    """สร้างคืนนั้นใหม่ตั้งแต่ต้นจาก seed + ผลแมตช์ (ไม่อ่าน snapshot)"""
+    engine, _ = SessionLog.load(session_id, directory=directory, use_snapshot=False)
+    return engine
+
+
+def verify_replay(session_id: str, *, directory: Optional[str] = None) -> bool:
+    """เทียบสถานะจาก snapshot กับการเล่นซ้ำจาก seed — True = การหมุนคืนนั้นตรวจซ้ำได้ตรงทุกขั้น"""
+    loaded, _ = SessionLog.load(session_id, directory=directory)
+    replayed = replay(session_id, directory=directory)
+    same_state = json.dumps(loaded.snapshot(), sort_keys=True) == json.dumps(replayed.snapshot(), sort_keys=True)
+    return same_state and loaded.history == replayed.history
+
+
+def list_sessions(directory: Optional[str] = None) -> List[str]:
+    """รายชื่อคืนที่บันทึกไว้ ใหม่สุดก่อน"""
+    d = sessions_dir(directory)
+    if not os.path.isdir(d):
+        return []
+    return sorted((f[:-len(".jsonl")] for f in os.listdir(d) if f.endswith(".jsonl")), reverse=True)
@@ -0,0 +1,34 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# ============================================================
+# 📜 Windowed History (ล่าสุด N แมตช์ + เปิดหน้าเก่า + ค้นตามชื่อ)
+# ============================================================
+# ต้นทุนต่อการแสดงผล = O(page_size) ไม่ว่าคืนนั้นจะมีกี่แมตช์
+# การค้นตามชื่อใช้ player_matches (ดัชนีแมตช์ของแต่ละคน ที่ engine เติมทีละแมตช์)
+
+PAGE_SIZE = 10
+
+
+def page_count(total: int, page_size: int = PAGE_SIZE) -> int:
+    return max(1, -(-total // page_size))
+
+
+def history_window(history: Sequence[Dict], *, page: int = 0, page_size: int = PAGE_SIZE,
+                   player: Optional[str] = None,
+                   player_matches: Optional[Dict[str, List[int]]] = None) -> Tuple[List[Tuple[int, Dict]], int]:
+    """คืน ([(ลำดับแมตช์เริ่มที่ 1, record), ...] ใหม่สุดก่อน, จำนวนแมตช์ทั้งหมดที่ตรงเงื่อนไข)
+
+    page 0 = หน้าล่าสุด
+    """
+    if player is not None:
+        indices = (player_matches or {}).get(player, [])
+        total = len(indices)
+        end = total - page * page_size
+        start = max(0, end - page_size)
+        picked = indices[start:max(0, end)]
+    else:
+        total = len(history)
+        end = total - page * page_size
+        start = max(0, end - page_size)
+        picked = range(start, max(0, end))
+    return [(i + 1, history[i]) for i in reversed(picked)], total
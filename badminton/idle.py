@@ -0,0 +1,163 @@
+import csv
+import io
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# ============================================================
+# ⏱️ Idle Tracker (นั่งรอกี่แมตช์ / กี่นาที ต่อคน)
+# ============================================================
+# ช่วงรอ = ตั้งแต่ออกจากคอร์ท (หรือมาถึง) จนลงคอร์ทครั้งถัดไป — ไม่รวมเวลาที่เล่นอยู่
+# นับเป็นจำนวนผลที่บันทึกระหว่างนั้น (คอร์ทไหนก็ได้) และเป็นวินาที; ช่วงที่ไม่ได้นั่งรอสักแมตช์ไม่นับ
+# engine เรียก record() ตอนแมตช์จบ และ seat() หลังทุกเหตุการณ์ด้วยรายชื่อคนที่อยู่บนคอร์ทตอนนี้
+# ช่วงที่จบแล้วเก็บเป็น histogram (จำนวนแมตช์ → จำนวนครั้ง) ช่วงที่ยังรออยู่คำนวณสดตอนแสดงผล
+
+MAX_WAIT_ALERT = 4   # รอเกินกี่แมตช์ติดกันถึงเตือนผู้จัด (ค่าเริ่มต้นของหน้าเว็บ)
+
+
+class IdleTracker:
+    __slots__ = ("started_at", "matches", "on_court", "left", "left_ts", "longest", "longest_seconds",
+                 "idle_seconds", "stretches", "histogram")
+
+    def __init__(self, players: Iterable[str], started_at: float):
+        self.started_at = started_at
+        self.matches = 0                      # จำนวนผลที่บันทึกแล้ว (ทุกคอร์ท)
+        self.on_court: Set[str] = set()
+        self.left: Dict[str, int] = {}        # ค่า matches ตอนออกจากคอร์ท/มาถึง
+        self.left_ts: Dict[str, float] = {}   # เวลาที่ออกจากคอร์ท/มาถึง
+        self.longest: Dict[str, int] = {}
+        self.longest_seconds: Dict[str, float] = {}
+        self.idle_seconds: Dict[str, float] = {}
+        self.stretches: Dict[str, int] = {}
+        self.histogram: Dict[int, int] = {}
+        for p in players:
+            self.add(p)
+
+    def add(self, p: str, *, at_match: Optional[int] = None, ts: Optional[float] = None):
+        """เริ่มนับเวลารอของ p (คนมาสายเริ่มนับตอนมาถึง ไม่ใช่ตอนเปิดคืน)"""
+        if p in self.left:
+            return
+        self.left[p] = self.matches if at_match is None else at_match
+        self.left_ts[p] = self.started_at if ts is None else ts
+        self.longest[p] = 0
+        self.longest_seconds[p] = 0.0
+        self.idle_seconds[p] = 0.0
+        self.stretches[p] = 0
+
+    def remove(self, p: str):
+        self.on_court.discard(p)
+        for d in (self.left, self.left_ts, self.longest, self.longest_seconds,
+                  self.idle_seconds, self.stretches):
+            d.pop(p, None)
+
+    def record(self, players: Iterable[str], ts: float):
+        """แมตช์เพิ่งจบ: ทุกคนในแมตช์ออกจากคอร์ท (ทีมที่อยู่ต่อจะถูก seat() กลับทันทีโดยไม่มีช่วงรอ)"""
+        self.matches += 1
+        for p in players:
+            if p not in self.left:
+                self.add(p)
+            self.on_court.discard(p)
+            self.left[p] = self.matches
+            self.left_ts[p] = ts
+
+    def seat(self, players: Iterable[str], ts: float):
+        """คนที่อยู่บนคอร์ทหลังเหตุการณ์ล่าสุด — ปิดช่วงรอของคนที่เพิ่งลง, เริ่มนับคนที่ถูกเอาออกโดยไม่จบแมตช์"""
+        now = set(players)
+        for p in now - self.on_court:
+            if p not in self.left:
+                self.add(p, ts=ts)
+            gap = self.matches - self.left[p]
+            if gap <= 0:
+                continue
+            waited = max(0.0, ts - self.left_ts[p])
+            self.histogram[gap] = self.histogram.get(gap, 0) + 1
+            if gap > self.longest[p]:
+                self.longest[p] = gap
+            if waited > self.longest_seconds[p]:
+                self.longest_seconds[p] = waited
+            self.idle_seconds[p] += waited
+            self.stretches[p] += 1
+        for p in self.on_court - now:
+            if p in self.left:   # จัดรอบใหม่/เอาคนออก → ออกจากคอร์ทโดยไม่ได้จบแมตช์
+                self.left[p] = self.matches
+                self.left_ts[p] = ts
+        self.on_court = now
+
+    # -----------------------------
+    # Snapshot (เก็บใน snapshot ของ engine — ช่วงที่ลงคอร์ทสร้างจาก history อย่างเดียวไม่ได้)
+    # -----------------------------
+    def state(self) -> Dict:
+        return {
+            "started_at": self.started_at,
+            "matches": self.matches,
+            "on_court": sorted(self.on_court),
+            "left": self.left,
+            "left_ts": self.left_ts,
+            "longest": self.longest,
+            "longest_seconds": self.longest_seconds,
+            "idle_seconds": self.idle_seconds,
+            "stretches": self.stretches,
+            "histogram": sorted(self.histogram.items()),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "IdleTracker":
+        idle = cls((), state["started_at"])
+        idle.matches = state["matches"]
+        idle.on_court = set(state["on_court"])
+        for name in ("left", "left_ts", "longest", "longest_seconds", "idle_seconds", "stretches"):
+            setattr(idle, name, dict(state[name]))
+        idle.histogram = {int(k): v for k, v in state["histogram"]}
+        return idle
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def waiting(self, p: str) -> int:
+        """รอมาแล้วกี่แมตช์ติดกัน (นับถึงตอนนี้, 0 ถ้าอยู่บนคอร์ท)"""
+        return 0 if p in self.on_court else self.matches - self.left[p]
+
+    def waiting_seconds(self, p: str, now: float) -> float:
+        return 0.0 if p in self.on_court else max(0.0, now - self.left_ts[p])
+
+    def over(self, threshold: int) -> List[Tuple[str, int]]:
+        """คนนอกคอร์ทที่รอถึง threshold แมตช์แล้ว (รอนานสุดก่อน)"""
+        out = [(p, self.waiting(p)) for p in self.left if self.waiting(p) >= threshold]
+        return sorted(out, key=lambda x: -x[1])
+
+    def live_histogram(self) -> Dict[int, int]:
+        """histogram ของช่วงรอที่จบแล้ว + ช่วงที่ยังรออยู่ตอนนี้"""
+        hist = dict(self.histogram)
+        for p in self.left:
+            w = self.waiting(p)
+            if w > 0:
+                hist[w] = hist.get(w, 0) + 1
+        return dict(sorted(hist.items()))
+
+    def rows(self, now: float) -> List[Dict]:
+        """รายงานรายคนของคืนนี้ (รอนานสุดก่อน)"""
+        rows = []
+        for p in self.left:
+            current = self.waiting(p)
+            current_s = self.waiting_seconds(p, now)
+            rows.append({
+                "ผู้เล่น": p,
+                "รออยู่ (แมตช์)": current,
+                "รออยู่ (นาที)": round(current_s / 60, 1),
+                "รอนานสุด (แมตช์)": max(self.longest[p], current),
+                "รอนานสุด (นาที)": round(max(self.longest_seconds[p], current_s) / 60, 1),
+                "รอเฉลี่ย (นาที)": round(self.idle_seconds[p] / self.stretches[p] / 60, 1)
+                if self.stretches[p] else 0.0,
+            })
+        rows.sort(key=lambda r: (-r["รอนานสุด (แมตช์)"], -r["รออยู่ (แมตช์)"]))
+        return rows
+
+    def to_csv(self, now: float) -> str:
+        rows = self.rows(now)
+        buf = io.StringIO()
+        if rows:
+            w = csv.DictWriter(buf, fieldnames=list(rows[0]))
+            w.writeheader()
+            w.writerows(rows)
+        buf.write("\nidle_matches,count\n")
+        for gap, n in self.live_histogram().items():
+            buf.write(f"{gap},{n}\n")
+        return buf.getvalue()
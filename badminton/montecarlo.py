@@ -0,0 +1,251 @@
+"""ประเมินกติกาหมุนคอร์ทแบบ Monte Carlo ด้วย NumPy (เดินหลายหมื่นคืนพร้อมกันเป็น array)
+
+    python -m badminton.montecarlo --policy all --players 5,9,16 --nights 100000
+    python -m badminton.montecarlo --policy rotation --players 12 --max-streak 3
+
+ต้องมี numpy (ติดมากับ streamlit อยู่แล้ว) — ถ้าต้องการดูผลทีละขั้นหรือจับเวลาเมธอดจริง ใช้ badminton.simulate
+กติกาจำลองตาม engine เดิม ยกเว้นรายละเอียดเล็กที่ไม่กระทบสถิติภาพรวม:
+ไม่หลบ last_match ตอนจัดรอบใหม่ และลำดับใน bucket ของ PlayedIndex ประมาณด้วยเวลาที่เล่นล่าสุด
+"""
+import argparse
+import json
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .policies import get_policy
+
+# ชื่อ policy → สคริปต์ต้นทาง (ชุดเดียวกับ badminton.policies ยกเว้นหลายคอร์ท)
+POLICIES = {name: get_policy(name).script for name in ("live", "rotation", "individual")}
+
+MIN_PLAYERS, MAX_PLAYERS = 4, 200
+
+
+class _Tracker:
+    """จำนวนแมตช์ + ช่วงนั่งรอที่ยาวที่สุดของทุกคนในทุกคืน (S x P)"""
+
+    def __init__(self, sessions: int, players: int):
+        self.rows = np.arange(sessions)[:, None]
+        self.played = np.zeros((sessions, players), dtype=np.int32)
+        self.last = np.full((sessions, players), -1, dtype=np.int32)
+        self.longest = np.zeros((sessions, players), dtype=np.int32)
+
+    def record(self, step: int, on_court: np.ndarray):
+        """on_court: S x 4 (ผู้เล่นไม่ซ้ำกันในแต่ละแถว)"""
+        gap = step - self.last[self.rows, on_court] - 1
+        self.longest[self.rows, on_court] = np.maximum(self.longest[self.rows, on_court], gap)
+        self.last[self.rows, on_court] = step
+        self.played[self.rows, on_court] += 1
+
+    def finish(self, matches: int) -> Dict[str, np.ndarray]:
+        longest = np.maximum(self.longest, matches - self.last - 1)
+        return {
+            "played": self.played,
+            "longest_idle": longest,
+            "played_spread": self.played.max(axis=1) - self.played.min(axis=1),
+            "max_idle": longest.max(axis=1),
+        }
+
+
+def _most_played(played: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """คนที่เล่นมากสุดของแต่ละแถว เสมอกันสุ่ม (noise < 1 จึงไม่ข้ามจำนวนเต็ม)"""
+    return np.argmax(played + rng.random(played.shape) * 0.5, axis=1)
+
+
+def _shuffle_active(played: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """สุ่มลำดับผู้เล่นทุกแถว ถ้าคนเป็นคี่ให้คนเล่นมากสุดไปอยู่ท้าย (= พัก)"""
+    k, n = played.shape
+    keys = rng.random((k, n))
+    if n % 2:
+        keys[np.arange(k), _most_played(played, rng)] = 2.0
+    return np.argsort(keys, axis=1)
+
+
+def simulate_team_streak(num_players: int, nights: int, matches: int, *, max_streak: int = 2,
+                         loser_fallback: bool = False, seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """TeamStreakScheduler: ทีมคงที่ทั้งรอบ คิว FIFO หมดคิวแล้วสุ่มรอบใหม่"""
+    rng = np.random.default_rng(seed)
+    S, P = nights, num_players
+    T = P // 2
+    track = _Tracker(S, P)
+    rows = np.arange(S)
+
+    teams = np.zeros((S, T, 2), dtype=np.int64)
+    left = np.zeros(S, dtype=np.int64)
+    right = np.ones(S, dtype=np.int64)
+    ptr = np.full(S, 2, dtype=np.int64)          # ทีมถัดไปในคิว (ทีมถูกสุ่มลำดับแล้ว → คิว = ลำดับ id)
+    streak_team = np.full(S, -1, dtype=np.int64)
+    streak_count = np.zeros(S, dtype=np.int64)
+    first_loser = np.full(S, -1, dtype=np.int64)
+
+    def new_round(mask: np.ndarray):
+        idx = np.flatnonzero(mask)
+        if not len(idx):
+            return
+        perm = _shuffle_active(track.played[idx], rng)[:, :2 * T]
+        teams[idx] = perm.reshape(len(idx), T, 2)
+        left[idx], right[idx], ptr[idx] = 0, 1, 2
+        streak_team[idx], streak_count[idx], first_loser[idx] = -1, 0, -1
+
+    new_round(np.ones(S, dtype=bool))
+    for step in range(matches):
+        left_wins = rng.random(S) < 0.5
+        winner = np.where(left_wins, left, right)
+        loser = np.where(left_wins, right, left)
+        track.record(step, np.concatenate([teams[rows, left], teams[rows, right]], axis=1))
+
+        same = streak_team == winner
+        streak_count = np.where(same, streak_count + 1, 1)
+        first_loser = np.where(same, first_loser, loser)
+        streak_team = winner.copy()
+
+        done = streak_count >= max_streak
+        has_queue = ptr < T
+        to_queue = done & has_queue
+        to_loser = done & ~has_queue & loser_fallback
+        stays = ~done & has_queue
+        left = np.select([to_queue | to_loser, stays], [first_loser, winner], left)
+        right = np.select([to_queue | stays, to_loser], [ptr, loser], right)
+        ptr = ptr + (to_queue | stays)
+        reset = to_queue | to_loser
+        streak_team[reset], streak_count[reset], first_loser[reset] = -1, 0, -1
+        new_round(~(to_queue | to_loser | stays))
+    return track.finish(matches)
+
+
+def simulate_individual_streak(num_players: int, nights: int, matches: int, *, max_streak: int = 2,
+                               seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """IndividualStreakScheduler: streak รายคน ทีมชนะอยู่ต่อ ดึงสองคนที่เล่นน้อยสุดเข้ามาแทนทีมแพ้"""
+    rng = np.random.default_rng(seed)
+    S, P = nights, num_players
+    track = _Tracker(S, P)
+    rows = track.rows
+    win_streak = np.zeros((S, P), dtype=np.int32)
+    court = np.zeros((S, 4), dtype=np.int64)     # [ซ้าย 2 คน, ขวา 2 คน]
+
+    def new_round(mask: np.ndarray):
+        idx = np.flatnonzero(mask)
+        if len(idx):
+            court[idx] = _shuffle_active(track.played[idx], rng)[:, :4]
+
+    new_round(np.ones(S, dtype=bool))
+    for step in range(matches):
+        left_wins = (rng.random(S) < 0.5)[:, None]
+        winner = np.where(left_wins, court[:, :2], court[:, 2:])
+        loser = np.where(left_wins, court[:, 2:], court[:, :2])
+        track.record(step, court)
+
+        win_streak[rows, winner] += 1
+        win_streak[rows, loser] = 0
+        out = (win_streak[rows, winner] >= max_streak).all(axis=1)
+        win_streak[rows[out], winner[out]] = 0
+
+        # คนเล่นน้อยสุดก่อน เสมอกันให้คนที่เข้า bucket ก่อน (เล่นล่าสุดนานกว่า) ได้ก่อน แบบ PlayedIndex
+        key = track.played + (track.last + 1) / (step + 2) * 0.5
+        key[rows, court] = np.inf
+        incoming = np.argpartition(key, 2, axis=1)[:, :2]
+        court = np.concatenate([winner, incoming], axis=1)
+        new_round(out)
+    return track.finish(matches)
+
+
+def simulate(policy: str, num_players: int, nights: int, matches: int, *, max_streak: int = 2,
+             seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    if not MIN_PLAYERS <= num_players <= MAX_PLAYERS:
+        raise ValueError(f"players must be between {MIN_PLAYERS} and {MAX_PLAYERS}")
+    if policy == "live":
+        return simulate_team_streak(num_players, nights, matches, max_streak=max_streak, seed=seed)
+    if policy == "rotation":
+        return simulate_team_streak(num_players, nights, matches, max_streak=max_streak,
+                                    loser_fallback=True, seed=seed)
+    if policy == "individual":
+        if num_players < 6:
+            # ต้องมีคนนอกคอร์ทอย่างน้อย 2 คนถึงจะดึงคนใหม่มาแทนทีมแพ้ได้ครบ
+            raise ValueError("the individual policy needs at least 6 players")
+        return simulate_individual_streak(num_players, nights, matches, max_streak=max_streak, seed=seed)
+    raise ValueError(f"unknown policy: {policy}")
+
+
+def _dist(values: np.ndarray) -> Dict[str, float]:
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {"mean": float(values.mean()), "p50": float(p50), "p90": float(p90),
+            "p99": float(p99), "max": float(values.max())}
+
+
+def evaluate(policy: str, num_players: int, *, nights: int = 100_000, matches: int = 60,
+             max_streak: int = 2, seed: int = 0, batch: int = 50_000) -> Dict:
+    """รันทีละ batch (คุมหน่วยความจำ) แล้วสรุปการกระจายของแมตช์ที่ได้เล่นและเวลานั่งรอ"""
+    t0 = time.perf_counter()
+    parts: List[Dict[str, np.ndarray]] = []
+    for i, start in enumerate(range(0, nights, batch)):
+        parts.append(simulate(policy, num_players, min(batch, nights - start), matches,
+                              max_streak=max_streak, seed=seed + i))
+    merged = {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+    elapsed = time.perf_counter() - t0
+    games = np.bincount(merged["played"].ravel(), minlength=matches + 1)
+    return {
+        "policy": policy,
+        "players": num_players,
+        "nights": nights,
+        "matches": matches,
+        "max_streak": max_streak,
+        "seconds": elapsed,
+        "nights_per_sec": nights / elapsed if elapsed else 0.0,
+        "games_played": _dist(merged["played"].ravel()),
+        "games_played_hist": games[:int(merged["played"].max()) + 1].tolist(),
+        "played_spread": _dist(merged["played_spread"]),
+        "longest_idle": _dist(merged["longest_idle"].ravel()),
+        "max_idle": _dist(merged["max_idle"]),
+    }
+
+
+def _fmt(d: Dict[str, float]) -> str:
+    return f"mean {d['mean']:.2f} | p50 {d['p50']:.0f} p90 {d['p90']:.0f} p99 {d['p99']:.0f} max {d['max']:.0f}"
+
+
+def _print_report(r: Dict):
+    print(f"== {r['policy']} ({POLICIES[r['policy']]}) | {r['players']} players | max streak {r['max_streak']} | "
+          f"{r['nights']:,} nights x {r['matches']} matches in {r['seconds']:.2f}s "
+          f"({r['nights_per_sec']:,.0f} nights/sec)")
+    print(f"   games played / player : {_fmt(r['games_played'])}")
+    print(f"   played spread / night : {_fmt(r['played_spread'])}")
+    print(f"   longest wait / player : {_fmt(r['longest_idle'])}")
+    print(f"   worst wait / night    : {_fmt(r['max_idle'])}")
+
+
+def _parse_players(text: str) -> List[int]:
+    counts = [int(x) for x in text.split(",") if x.strip()]
+    for n in counts:
+        if not MIN_PLAYERS <= n <= MAX_PLAYERS:
+            raise argparse.ArgumentTypeError(f"players must be between {MIN_PLAYERS} and {MAX_PLAYERS}")
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Vectorised Monte Carlo comparison of rotation rules.")
+    parser.add_argument("--policy", choices=list(POLICIES) + ["all"], default="all")
+    parser.add_argument("--players", type=_parse_players, default=[5, 9, 16],
+                        help="comma separated player counts (4-200)")
+    parser.add_argument("--nights", type=int, default=100_000, help="simulated nights per configuration")
+    parser.add_argument("--matches", type=int, default=60, help="results per night")
+    parser.add_argument("--max-streak", type=int, default=2, help="wins before a team/player must sit out")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    args = parser.parse_args(argv)
+
+    policies = list(POLICIES) if args.policy == "all" else [args.policy]
+    for policy in policies:
+        for n in args.players:
+            if policy == "individual" and n < 6:
+                continue
+            report = evaluate(policy, n, nights=args.nights, matches=args.matches,
+                              max_streak=args.max_streak, seed=args.seed)
+            if args.json:
+                print(json.dumps(report))
+            else:
+                _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import heapq
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .roster import Team
+
+# ============================================================
+# 🔮 Lookahead Planner (วางลำดับ K ทีมถัดไปในคิวด้วย beam search)
+# ============================================================
+# ต้นทุนของลำดับ = Σ (slot - k) × urgency(ทีม)   (ทีมที่รอนาน/เล่นน้อยควรได้ลงก่อน
+#                  ทีมที่ไม่ถูกเลือกนับเป็น slot k → การเลือกทีมไหนขึ้นก่อนคือการ "ลด" ต้นทุน)
+#               + Σ link(ทีมก่อนหน้า, ทีมนี้)  (ทีมที่ต่อกันในคิวมักได้เจอกัน → เลี่ยงคู่แข่งซ้ำ)
+# ตำแหน่งที่ประกาศไปแล้ว (keep) ไม่ถูกแตะ วางแผนใหม่เฉพาะส่วนท้าย → คำทำนายบนจอไม่กระโดด
+
+BEAM_WIDTH = 8
+
+
+def plan_queue(queue: Sequence[Team], *, k: int, keep: int = 0,
+               urgency: Callable[[Team], float],
+               link: Callable[[Optional[Team], Team], float],
+               head: Optional[Team] = None,
+               beam_width: int = BEAM_WIDTH) -> List[Team]:
+    """คืนคิวใหม่: queue[:keep] เหมือนเดิม, ตำแหน่ง keep..k-1 เลือกด้วย beam search,
+    ที่เหลือต่อท้ายตามลำดับเดิม
+
+    head = ทีมที่ทีมแรกของคิวจะได้เจอ (ใช้กับ link ของ slot 0) — O(k × beam × len(queue))
+    """
+    queue = list(queue)
+    keep = max(0, min(keep, len(queue)))
+    slots = min(k, len(queue)) - keep
+    if slots <= 0:
+        return queue
+
+    fixed, pool = queue[:keep], queue[keep:]
+    urg = [urgency(t) for t in pool]
+    prev0 = fixed[-1] if fixed else head
+
+    # beam: (ต้นทุน, ลำดับดัชนีใน pool)
+    beam: List[Tuple[float, Tuple[int, ...]]] = [(0.0, ())]
+    for step in range(slots):
+        slot = keep + step
+        candidates = []
+        for cost, seq in beam:
+            used = set(seq)
+            prev = pool[seq[-1]] if seq else prev0
+            for i, team in enumerate(pool):
+                if i in used:
+                    continue
+                candidates.append((cost + (slot - k) * urg[i] + link(prev, team), seq + (i,)))
+        beam = heapq.nsmallest(beam_width, candidates)
+
+    best = beam[0][1]
+    chosen = set(best)
+    return fixed + [pool[i] for i in best] + [t for i, t in enumerate(pool) if i not in chosen]
@@ -0,0 +1,107 @@
+import random
+from typing import Collection, Dict, List, Optional
+
+# ============================================================
+# 🪣 Bucket-by-played Index (เลือกคนพัก / คนเข้าแทน แบบไม่ต้องสแกนทุกคน)
+# ============================================================
+# buckets[k] = รายชื่อคนที่เล่นไปแล้ว k แมตช์  (ลบออกแบบ swap-pop ได้ O(1))
+# lo / hi = จำนวนแมตช์น้อยสุด / มากสุดที่ยังมีคนอยู่
+
+
+class PlayedIndex:
+    __slots__ = ("buckets", "count", "_pos", "lo", "hi")
+
+    def __init__(self, players: Collection[str] = (), played: Optional[Dict[str, int]] = None):
+        self.buckets: Dict[int, List[str]] = {}
+        self.count: Dict[str, int] = {}
+        self._pos: Dict[str, int] = {}
+        self.lo = 0
+        self.hi = 0
+        for p in players:
+            self.add(p, (played or {}).get(p, 0))
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    def __contains__(self, p: str) -> bool:
+        return p in self.count
+
+    def _put(self, p: str, k: int):
+        bucket = self.buckets.setdefault(k, [])
+        self._pos[p] = len(bucket)
+        bucket.append(p)
+        self.count[p] = k
+
+    def _take(self, p: str) -> int:
+        k = self.count.pop(p)
+        bucket = self.buckets[k]
+        i = self._pos.pop(p)
+        last = bucket.pop()
+        if last != p:
+            bucket[i] = last
+            self._pos[last] = i
+        if not bucket:
+            del self.buckets[k]
+        return k
+
+    def add(self, p: str, played: int = 0):
+        if p in self.count:
+            self.remove(p)
+        was_empty = not self.count
+        self._put(p, played)
+        if was_empty:
+            self.lo = self.hi = played
+        else:
+            self.lo = min(self.lo, played)
+            self.hi = max(self.hi, played)
+
+    def remove(self, p: str):
+        k = self._take(p)
+        if not self.count:
+            self.lo = self.hi = 0
+            return
+        # สแกนหา bucket ที่ยังมีคน (เกิดเฉพาะตอนลบคนออกจากก๊วน)
+        if k == self.lo:
+            while self.lo not in self.buckets:
+                self.lo += 1
+        if k == self.hi:
+            while self.hi not in self.buckets:
+                self.hi -= 1
+
+    def bump(self, p: str):
+        """เล่นเพิ่ม 1 แมตช์ — O(1)"""
+        if p not in self.count:
+            self.add(p, 0)
+        k = self._take(p)
+        self._put(p, k + 1)
+        if k + 1 > self.hi:
+            self.hi = k + 1
+        if k == self.lo and k not in self.buckets:
+            self.lo = k + 1
+
+    def most_played(self) -> List[str]:
+        return self.buckets.get(self.hi, [])
+
+    def pick_most_played(self, rng: random.Random, k: int = 1) -> List[str]:
+        """สุ่ม k คนจาก bucket ที่เล่นเยอะที่สุด (ไม่เกินจำนวนคนใน bucket)"""
+        candidates = self.most_played()
+        if not candidates or k <= 0:
+            return []
+        if k == 1:
+            return [rng.choice(candidates)]
+        return rng.sample(candidates, min(k, len(candidates)))
+
+    def least_played(self, k: int, exclude: Collection[str] = ()) -> List[str]:
+        """k คนที่เล่นน้อยที่สุด ไล่ bucket จาก lo ขึ้นไป — O(k + |exclude| + จำนวน bucket)"""
+        out: List[str] = []
+        if k <= 0 or not self.count:
+            return out
+        level = self.lo
+        while len(out) < k and level <= self.hi:
+            for p in self.buckets.get(level, ()):
+                if p not in exclude:
+                    out.append(p)
+                    if len(out) == k:
+                        break
+            level += 1
+        return out
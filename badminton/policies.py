@@ -0,0 +1,57 @@
+from typing import Dict, List, Optional, Tuple
+
+# ============================================================
+# 🧩 Rotation Policies (เลือกกติกาหมุนคอร์ทตอนรัน)
+# ============================================================
+# policy = engine ที่ใช้ + ค่าตั้งต้น + options ที่ผู้ใช้ปรับได้
+# หน้าเว็บ (badminton.app) ซิมูเลชัน และสคริปต์หน้าเดิมทั้ง 4 ไฟล์อ่านจาก registry เดียวกัน
+# ไม่ import engine ตอนโหลดโมดูล (engine โหลดเมื่อสร้างจริงครั้งแรก)
+
+POLICIES: Dict[str, "Policy"] = {}
+
+
+class Policy:
+    __slots__ = ("name", "kind", "title", "script", "defaults", "options", "min_players")
+
+    def __init__(self, name: str, kind: str, title: str, *, script: str = "",
+                 defaults: Optional[Dict] = None, options: Tuple[str, ...] = ("pairing",),
+                 min_players: int = 4):
+        self.name = name
+        self.kind = kind                      # engine KIND (ดู engine.ENGINES)
+        self.title = title
+        self.script = script                  # หน้าเดิมที่ policy นี้มาจาก
+        self.defaults = defaults or {}        # options ที่ตายตัวของ policy นี้
+        self.options = options                # options ที่ผู้ใช้ปรับได้ (ที่เหลือถูกข้าม)
+        self.min_players = min_players
+
+    def create(self, players: List[str], *, seed: Optional[int] = None, **options):
+        """สร้าง engine ของ policy นี้ — options ที่ policy ไม่ใช้ (เช่น num_courts ของคอร์ทเดียว) ถูกข้าม"""
+        from .engine import create_engine
+
+        chosen = {k: v for k, v in options.items() if k in self.options}
+        return create_engine(self.kind, players, dict(self.defaults, seed=seed, **chosen))
+
+    def required_players(self, options: Dict) -> int:
+        return self.min_players * options.get("num_courts", 1)
+
+
+def register(policy: Policy) -> Policy:
+    POLICIES[policy.name] = policy
+    return policy
+
+
+def get_policy(name: str) -> Policy:
+    if name not in POLICIES:
+        raise ValueError(f"unknown policy: {name}")
+    return POLICIES[name]
+
+
+register(Policy("live", "team_streak", "🏸 Badminton Scheduler ก๊วนลุงๆ🧔🏻",
+                script="badminton_live_scheduler.py", options=("pairing", "lookahead")))
+register(Policy("rotation", "team_streak", "🏸 Badminton Scheduler ก๊วนลุงๆ🧔🏻",
+                script="badminton_rotation_test.py", defaults={"loser_fallback": True},
+                options=("pairing", "lookahead")))
+register(Policy("multi", "multi_court", "🏸 Badminton Scheduler (Multi-Court)",
+                script="badminton_live_scheduler2.py", options=("pairing", "num_courts")))
+register(Policy("individual", "individual_streak", "🏸 Badminton Match Rotation",
+                script="test1.py", min_players=2))
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from .eventlog import DATA_DIR
+from .simulate import percentile
+
+# ============================================================
+# 🩺 Rerun Profiler (เปิดเมื่อต้องการ: BADMINTON_PROFILE=1 หรือ ?profile=1)
+# ============================================================
+# ทุก rerun ของหน้า = 1 record: เวลาแต่ละช่วง (init / input / schedule / render ...)
+# เก็บใน ring buffer ของ process (เก่าสุดหลุดเอง) แล้ว export เป็น JSONL ไปวิเคราะห์ต่อได้
+# ไม่ import streamlit — หน้าเว็บเรียกผ่าน ui.begin_profile / ui.end_profile
+
+RING_SIZE = 2000
+# rerun ที่ตามหลัง action ภายในช่วงนี้ (และ version ไม่เปลี่ยน) นับเป็น rerun ของ action เดียวกัน
+CHAIN_GAP_SECONDS = 1.5
+
+
+def profiles_dir(directory: Optional[str] = None) -> str:
+    return os.path.join(directory or DATA_DIR, "profiles")
+
+
+class RunTimer:
+    """จับเวลา rerun หนึ่งครั้ง: mark(name) ปิดช่วงที่เปิดอยู่แล้วเปิดช่วงใหม่ชื่อ name"""
+
+    def __init__(self, profiler: "RerunProfiler", page: str, session: str, version: int,
+                 *, fragment: bool = False):
+        self.profiler = profiler
+        self.record: Dict = {
+            "ts": round(time.time(), 3),
+            "page": page,
+            "session": session,
+            "fragment": fragment,
+            "version_before": version,
+            "phases": {},
+        }
+        self._t0 = self._mark = time.perf_counter()
+        self._phase = "init"
+
+    def mark(self, name: str):
+        now = time.perf_counter()
+        phases = self.record["phases"]
+        phases[self._phase] = phases.get(self._phase, 0.0) + (now - self._mark) * 1000
+        self._phase, self._mark = name, now
+
+    def finish(self, version: int, *, interrupted: bool = False) -> Dict:
+        """interrupted=True: run ถูกตัดด้วย st.rerun() — นับเวลาถึง mark ล่าสุดเท่านั้น"""
+        if interrupted:
+            self.record["interrupted"] = True
+        else:
+            self.mark("")
+            self.record["phases"].pop("", None)
+        self.record["total_ms"] = (self._mark - self._t0) * 1000
+        self.record["version_after"] = version
+        self.profiler.push(self.record)
+        return self.record
+
+
+class RerunProfiler:
+    def __init__(self, maxlen: int = RING_SIZE):
+        self.buffer: Deque[Dict] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def begin(self, page: str, session: str, version: int, *, fragment: bool = False) -> RunTimer:
+        return RunTimer(self, page, session, version, fragment=fragment)
+
+    def push(self, record: Dict):
+        with self._lock:
+            self.buffer.append(record)
+
+    def records(self) -> List[Dict]:
+        with self._lock:
+            return list(self.buffer)
+
+    def actions(self) -> List[Dict]:
+        """จัดกลุ่ม rerun เป็น action: run ที่เห็น version ใหม่ (เปลี่ยนระหว่าง run หรือใน callback ก่อน run)
+        เริ่ม action ใหม่ run ที่ตามมาติดๆ (ห่างไม่เกิน CHAIN_GAP_SECONDS และ version ไม่เปลี่ยน)
+        นับเป็น rerun ต่อเนื่องของ action เดิม"""
+        groups: List[Dict] = []
+        open_by_session: Dict[str, Dict] = {}
+        last_version: Dict[str, int] = {}
+        for rec in self.records():
+            group = open_by_session.get(rec["session"])
+            changed = rec["version_after"] != last_version.get(rec["session"], rec["version_before"])
+            last_version[rec["session"]] = rec["version_after"]
+            end = rec["ts"] + rec["total_ms"] / 1000
+            if group and not changed and rec["ts"] - group["end"] <= CHAIN_GAP_SECONDS:
+                group["reruns"] += 1
+                group["total_ms"] += rec["total_ms"]
+                group["end"] = end
+                continue
+            group = {"session": rec["session"], "page": rec["page"], "ts": rec["ts"], "end": end,
+                     "reruns": 1, "total_ms": rec["total_ms"], "changed_state": changed}
+            open_by_session[rec["session"]] = group
+            groups.append(group)
+        return groups
+
+    def summary(self) -> Dict:
+        records = self.records()
+        phases: Dict[str, List[float]] = {}
+        for rec in records:
+            for name, ms in rec["phases"].items():
+                phases.setdefault(name, []).append(ms)
+        totals = sorted(rec["total_ms"] for rec in records)
+        actions = [a for a in self.actions() if a["changed_state"]]
+        reruns = [a["reruns"] for a in actions]
+
+        def dist(values: List[float]) -> Dict[str, float]:
+            values = sorted(values)
+            return {"n": len(values), "p50_ms": percentile(values, 50),
+                    "p95_ms": percentile(values, 95), "max_ms": values[-1] if values else 0.0}
+
+        return {
+            "runs": len(records),
+            "total": dist(totals),
+            "phases": {name: dist(values) for name, values in phases.items()},
+            "actions": len(actions),
+            "reruns_per_action_mean": sum(reruns) / len(reruns) if reruns else 0.0,
+            "reruns_per_action_max": max(reruns, default=0),
+        }
+
+    def export(self, path: Optional[str] = None, *, directory: Optional[str] = None) -> str:
+        """เขียน record ทั้งหมดใน buffer ตอนนี้เป็นไฟล์ JSONL ใหม่ แล้วคืน path"""
+        if path is None:
+            d = profiles_dir(directory)
+            os.makedirs(d, exist_ok=True)
+            path = os.path.join(d, time.strftime("%Y%m%d-%H%M%S") + ".jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for rec in self.records():
+                f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+        return path
@@ -0,0 +1,27 @@
+from typing import Dict
+
+from .roster import Team
+
+# ============================================================
+# 📈 Skill Rating (Elo แบบประเภทคู่)
+# ============================================================
+# ความแข็งของทีม = ค่าเฉลี่ยเรตติ้งของสองคน ทุกคนในทีมได้/เสียแต้มเท่ากัน
+# อัปเดตทีละแมตช์ O(ขนาดทีม) — ไม่ต้องคำนวณย้อนจาก history
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 24.0
+
+
+def team_rating(team: Team, ratings: Dict[str, float]) -> float:
+    return sum(ratings.get(p, DEFAULT_RATING) for p in team) / len(team)
+
+
+def win_probability(team: Team, other: Team, ratings: Dict[str, float]) -> float:
+    """โอกาสที่ team ชนะ other ตามเรตติ้งปัจจุบัน"""
+    diff = team_rating(other, ratings) - team_rating(team, ratings)
+    return 1.0 / (1.0 + 10 ** (diff / 400.0))
+
+
+def elo_delta(winner: Team, loser: Team, ratings: Dict[str, float], k: float = K_FACTOR) -> float:
+    """แต้มที่ผู้เล่นฝั่งชนะได้ (ฝั่งแพ้เสียเท่ากัน) — ชนะทีมที่แข็งกว่าได้มากกว่า"""
+    return k * (1.0 - win_probability(winner, loser, ratings))
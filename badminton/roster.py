@@ -0,0 +1,38 @@
+from typing import Dict, Iterable, List, Tuple
+
+# ============================================================
+# 🪪 Roster (ชื่อผู้เล่น ↔ เลข id เล็กๆ ที่ไม่เปลี่ยนตลอดคืน)
+# ============================================================
+# id ใช้เป็นแถว/คอลัมน์ของเมทริกซ์ใน PairIndex (array ของตัวเลข แทน dict ซ้อน dict)
+# คนที่ออกไปแล้วยังคง id เดิม → กลับมาอีกรอบได้แถวเดิมในเมทริกซ์
+
+Team = Tuple[str, ...]
+
+
+class Roster:
+    __slots__ = ("names", "ids")
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.ids
+
+    def intern(self, name: str) -> int:
+        """id ของ name (ให้เลขใหม่ต่อท้ายถ้ายังไม่เคยเห็น) — O(1)"""
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+
+def make_team(players: Iterable[str]) -> Team:
+    """ทีม = tuple ที่เรียงชื่อแล้ว (เทียบ/hash ได้ทันที และใช้เป็น key ของ dict ได้)"""
+    return tuple(sorted(players))
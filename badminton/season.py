@@ -0,0 +1,361 @@
+"""สรุปทั้งซีซัน (หลายเดือน/หลายปี) จาก log รายคืน แบบ stream ทีละคืน ไม่โหลดทั้งหมดเข้าหน่วยความจำ
+
+    python -m badminton.season
+    python -m badminton.season --min-games 10 --top 15
+    python -m badminton.season --data-dir /srv/club --rebuild --json
+
+ผลที่ได้: อัตราชนะรายคน, คู่ที่เข้ากันดี/ไม่ดี (synergy), การมาเล่น (attendance), เกมต่อชั่วโมงรายเดือน
+ยอดรวมเก็บใน cache (season_cache.json ข้าง sessions/) → รันซ้ำอ่านเฉพาะคืนใหม่ / คืนที่ยังเล่นอยู่
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .eventlog import DATA_DIR, read_events, sessions_dir
+
+CACHE_VERSION = 1
+CACHE_FILE = "season_cache.json"
+# คืนที่ log ถูกเขียนภายในช่วงนี้ยังถือว่า "เปิดอยู่" → เก็บยอดของคืนนั้นแยกไว้ เผื่อมีผลเพิ่มแล้วต้องหักออกก่อนบวกใหม่
+OPEN_SECONDS = 12 * 3600
+
+Pair = Tuple[str, str]
+
+
+# -----------------------------
+# Stage 1-2: คืน → เหตุการณ์
+# -----------------------------
+def night_paths(directory: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+    """(night_id, path) ของทุกคืน เรียงตามเวลาเริ่ม (id ขึ้นต้นด้วยวันเวลา)"""
+    d = sessions_dir(directory)
+    if not os.path.isdir(d):
+        return
+    for name in sorted(os.listdir(d)):
+        if name.endswith(".jsonl"):
+            yield name[:-len(".jsonl")], os.path.join(d, name)
+
+
+def night_events(path: str) -> Iterator[Dict]:
+    return (event for _, event in read_events(path))
+
+
+# -----------------------------
+# Stage 3: เหตุการณ์ → แมตช์ของคืน
+# -----------------------------
+def night_matches(events: Iterable[Dict]) -> Iterator[Tuple[str, object]]:
+    """("start"|"join"|"reset"|"match", ค่า) — แมตช์อ่านแบบเดียวกับ SessionLog.load
+    (reset ล้างประวัติ, import แทนที่ประวัติทั้งคืน)
+    """
+    for event in events:
+        kind = event["type"]
+        if kind == "start":
+            yield "start", event
+        elif kind == "add_player":
+            yield "join", event["player"]
+        elif kind == "reset":
+            yield "reset", None
+        elif kind == "result" and "winner" in event:
+            yield "match", event
+        elif kind == "results":
+            for rec in event["records"]:
+                yield "match", rec
+        elif kind == "import":
+            yield "reset", None
+            for p in event["state"].get("players", []):
+                yield "join", p
+            for rec in event["history"]:
+                yield "match", rec
+
+
+# -----------------------------
+# Stage 4: แมตช์ → ยอดของคืน
+# -----------------------------
+def summarize_night(night_id: str, matches: Iterable[Tuple[str, object]]) -> Optional[Dict]:
+    """ยอดของคืนเดียว (played/win นับแบบเดียวกับ engine._update_stats: ลงเล่น +1 ทุกคน, ทีมชนะ win +1)"""
+    started = None
+    roster = set()
+    players: Dict[str, List[int]] = {}
+    pairs: Dict[Pair, List[int]] = {}
+    count = 0
+    first_ts = last_ts = None
+    for tag, value in matches:
+        if tag == "start":
+            started = value.get("ts")
+            roster.update(value["players"])
+        elif tag == "join":
+            roster.add(value)
+        elif tag == "reset":
+            players, pairs, count = {}, {}, 0
+            first_ts = last_ts = None
+        else:
+            winner, loser, ts = value["winner"], value["loser"], value.get("ts")
+            count += 1
+            for team, won in ((winner, 1), (loser, 0)):
+                for p in team:
+                    s = players.setdefault(p, [0, 0])
+                    s[0] += 1
+                    s[1] += won
+                for k, a in enumerate(team):
+                    for b in team[k+1:]:
+                        pair = pairs.setdefault(tuple(sorted((a, b))), [0, 0])
+                        pair[0] += 1
+                        pair[1] += won
+            if ts is not None:
+                first_ts = ts if first_ts is None else min(first_ts, ts)
+                last_ts = ts if last_ts is None else max(last_ts, ts)
+    if started is None:
+        return None   # log เสีย (ไม่มี start)
+    begin = min(started, first_ts) if first_ts is not None else started
+    return {
+        "night": night_id,
+        "month": time.strftime("%Y-%m", time.localtime(begin)),
+        "matches": count,
+        "seconds": (last_ts - begin) if last_ts is not None else 0.0,
+        "attended": sorted(roster | set(players)),
+        "players": players,
+        "pairs": [[a, b, g, w] for (a, b), (g, w) in pairs.items()],
+    }
+
+
+# -----------------------------
+# Stage 5: ยอดรายคืน → ยอดทั้งซีซัน
+# -----------------------------
+class SeasonStats:
+    """ยอดสะสม — บวก/ลบยอดของคืนได้ (sign=-1 ใช้หักคืนที่ยังเปิดอยู่ก่อนนับใหม่)"""
+    __slots__ = ("players", "pairs", "months", "nights")
+
+    def __init__(self):
+        self.players: Dict[str, List[int]] = {}        # ชื่อ → [played, win, nights]
+        self.pairs: Dict[Pair, List[int]] = {}         # (a, b) → [เกมที่เป็นคู่กัน, ชนะด้วยกัน]
+        self.months: Dict[str, List[float]] = {}       # YYYY-MM → [nights, matches, seconds, attendance]
+        self.nights = 0
+
+    def add(self, night: Dict, sign: int = 1):
+        self.nights += sign
+        for p in night["attended"]:
+            self.players.setdefault(p, [0, 0, 0])[2] += sign
+        for p, (played, win) in night["players"].items():
+            s = self.players.setdefault(p, [0, 0, 0])
+            s[0] += sign * played
+            s[1] += sign * win
+        for a, b, games, wins in night["pairs"]:
+            pair = self.pairs.setdefault((a, b), [0, 0])
+            pair[0] += sign * games
+            pair[1] += sign * wins
+        m = self.months.setdefault(night["month"], [0, 0, 0.0, 0])
+        m[0] += sign
+        m[1] += sign * night["matches"]
+        m[2] += sign * night["seconds"]
+        m[3] += sign * len(night["attended"])
+        self._prune(night)
+
+    def _prune(self, night: Dict):
+        for p in night["attended"]:
+            if self.players.get(p) == [0, 0, 0]:
+                del self.players[p]
+        for a, b, _, _ in night["pairs"]:
+            if self.pairs.get((a, b)) == [0, 0]:
+                del self.pairs[(a, b)]
+        if self.months.get(night["month"], [1])[0] == 0:
+            del self.months[night["month"]]
+
+    def to_json(self) -> Dict:
+        return {
+            "players": self.players,
+            "pairs": [[a, b, g, w] for (a, b), (g, w) in self.pairs.items()],
+            "months": self.months,
+            "nights": self.nights,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "SeasonStats":
+        season = cls()
+        season.players = data["players"]
+        season.pairs = {(a, b): [g, w] for a, b, g, w in data["pairs"]}
+        season.months = data["months"]
+        season.nights = data["nights"]
+        return season
+
+    # -----------------------------
+    # Report
+    # -----------------------------
+    def win_rates(self, min_games: int = 1) -> List[Dict]:
+        """คนที่เล่นอย่างน้อย min_games เกม (มาแต่ไม่ได้เล่นเลยไม่มีอัตราชนะ แม้ min_games=0)"""
+        min_games = max(min_games, 1)
+        rows = [
+            {"player": p, "played": played, "win": win, "win_rate": win / played, "nights": nights,
+             "games_per_night": played / nights if nights else 0.0}
+            for p, (played, win, nights) in self.players.items() if played >= min_games
+        ]
+        rows.sort(key=lambda r: (-r["win_rate"], -r["played"], r["player"]))
+        return rows
+
+    def synergy(self, min_games: int = 1) -> List[Dict]:
+        """อัตราชนะของคู่ เทียบกับค่าเฉลี่ยอัตราชนะรายคนของสองคนนั้น (lift > 0 = เข้าขากันดีกว่าที่คาด)"""
+        rate = {p: win / played for p, (played, win, _) in self.players.items() if played}
+        min_games = max(min_games, 1)
+        rows = []
+        for (a, b), (games, wins) in self.pairs.items():
+            if games < min_games:
+                continue
+            expected = (rate.get(a, 0.0) + rate.get(b, 0.0)) / 2
+            rows.append({"pair": [a, b], "games": games, "wins": wins, "win_rate": wins / games,
+                         "lift": wins / games - expected})
+        rows.sort(key=lambda r: (-r["lift"], -r["games"], r["pair"]))
+        return rows
+
+    def attendance(self) -> List[Dict]:
+        rows = [{"player": p, "nights": nights, "share": nights / self.nights if self.nights else 0.0}
+                for p, (_, _, nights) in self.players.items()]
+        rows.sort(key=lambda r: (-r["nights"], r["player"]))
+        return rows
+
+    def trends(self) -> List[Dict]:
+        rows = []
+        for month in sorted(self.months):
+            nights, matches, seconds, attendance = self.months[month]
+            rows.append({
+                "month": month,
+                "nights": nights,
+                "matches": matches,
+                "games_per_hour": matches / (seconds / 3600) if seconds else 0.0,
+                "attendance_per_night": attendance / nights if nights else 0.0,
+            })
+        return rows
+
+
+# -----------------------------
+# Incremental cache
+# -----------------------------
+def default_cache_path(directory: Optional[str] = None) -> str:
+    return os.path.join(directory or DATA_DIR, CACHE_FILE)
+
+
+def _load_cache(path: str) -> Optional[Dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cache if cache.get("version") == CACHE_VERSION else None
+
+
+def _save_cache(path: str, cache: Dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def build(directory: Optional[str] = None, *, cache_path: Optional[str] = None,
+          rebuild: bool = False, now: Optional[float] = None) -> Tuple[SeasonStats, Dict[str, int]]:
+    """คืน (ยอดทั้งซีซัน, {"scanned", "processed", "skipped"})
+
+    cache_path=None = ไม่ใช้ cache (อ่านทุกคืน) — คืนเก่าที่ไม่อยู่ในช่วง "เปิดอยู่" ถูกแก้/ลบ → สร้างใหม่ทั้งหมด
+    """
+    now = time.time() if now is None else now
+    cache = None if rebuild or cache_path is None else _load_cache(cache_path)
+    if cache:
+        season = SeasonStats.from_json(cache["season"])
+        seen: Dict[str, int] = cache["seen"]          # night_id → ขนาดไฟล์ตอนนับ (log ต่อท้ายอย่างเดียว)
+        open_nights: Dict[str, Dict] = cache["open"]  # night_id → ยอดของคืนที่อาจยังมีผลเพิ่ม
+    else:
+        season, seen, open_nights = SeasonStats(), {}, {}
+
+    counts = {"scanned": 0, "processed": 0, "skipped": 0}
+    present = set()
+    for night_id, path in night_paths(directory):
+        counts["scanned"] += 1
+        present.add(night_id)
+        st = os.stat(path)
+        if seen.get(night_id) == st.st_size:
+            counts["skipped"] += 1
+            if night_id in open_nights and now - st.st_mtime > OPEN_SECONDS:
+                del open_nights[night_id]   # ไม่มีใครเขียนแล้ว → ปิดคืน (ยอดอยู่ใน season แล้ว)
+            continue
+        if night_id in seen:
+            if night_id not in open_nights:
+                # คืนที่ปิดไปแล้วถูกเขียนเพิ่ม (เปิดคืนเก่ามาเล่นต่อ) → หักยอดเดิมไม่ได้ → นับใหม่ทั้งหมด
+                return build(directory, cache_path=cache_path, rebuild=True, now=now)
+            season.add(open_nights.pop(night_id), sign=-1)
+        night = summarize_night(night_id, night_matches(night_events(path)))
+        seen[night_id] = st.st_size
+        counts["processed"] += 1
+        if night is None:
+            continue
+        season.add(night)
+        if now - st.st_mtime <= OPEN_SECONDS:
+            open_nights[night_id] = night
+
+    if set(seen) - present:
+        return build(directory, cache_path=cache_path, rebuild=True, now=now)   # มีคืนถูกลบ
+    if cache_path is not None:
+        _save_cache(cache_path, {"version": CACHE_VERSION, "season": season.to_json(),
+                                 "seen": seen, "open": open_nights})
+    return season, counts
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def _print_report(season: SeasonStats, counts: Dict[str, int], *, min_games: int, top: int):
+    print(f"== season | {season.nights} nights, {len(season.players)} players | "
+          f"read {counts['processed']} of {counts['scanned']} logs ({counts['skipped']} from cache)")
+    print(f"-- win rate (min {min_games} games)")
+    for r in season.win_rates(min_games)[:top]:
+        print(f"   {r['player']:<16} {r['win_rate']:6.1%}  {r['win']:>4}/{r['played']:<4} "
+              f"{r['games_per_night']:.1f} games/night")
+    pairs = season.synergy(min_games)
+    print(f"-- partner synergy (min {min_games} games together, lift = pair rate - mean of own rates)")
+    for label, rows in (("best", pairs[:top]), ("worst", pairs[::-1][:top])):
+        for r in rows:
+            a, b = r["pair"]
+            print(f"   {label:<5} {a} & {b}: {r['win_rate']:.1%} over {r['games']} games (lift {r['lift']:+.1%})")
+        if len(pairs) <= top:
+            break
+    print("-- attendance")
+    for r in season.attendance()[:top]:
+        print(f"   {r['player']:<16} {r['nights']:>4} nights ({r['share']:.0%})")
+    print("-- games per hour by month")
+    trend = season.trends()
+    for r in trend:
+        print(f"   {r['month']}  {r['games_per_hour']:5.1f} games/h  {r['matches']:>5} matches  "
+              f"{r['nights']:>3} nights  {r['attendance_per_night']:.1f} players/night")
+    rates = [r["games_per_hour"] for r in trend if r["games_per_hour"]]
+    if len(rates) >= 2:
+        print(f"   median {statistics.median(rates):.1f} games/h, last vs first month {rates[-1] - rates[0]:+.1f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Season analytics over the saved nightly logs.")
+    parser.add_argument("--data-dir", default=None, help=f"club data directory (default {DATA_DIR})")
+    parser.add_argument("--cache", default=None, help="aggregate cache file (default <data-dir>/season_cache.json)")
+    parser.add_argument("--no-cache", action="store_true", help="read every night and do not write the cache")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cache and count every night again")
+    parser.add_argument("--min-games", type=int, default=5, help="minimum games for win rate / synergy rows")
+    parser.add_argument("--top", type=int, default=10, help="rows per section")
+    parser.add_argument("--json", action="store_true", help="print the report as one JSON object")
+    args = parser.parse_args(argv)
+
+    cache_path = None if args.no_cache else (args.cache or default_cache_path(args.data_dir))
+    season, counts = build(args.data_dir, cache_path=cache_path, rebuild=args.rebuild)
+    if args.json:
+        json.dump({
+            "nights": season.nights,
+            "logs": counts,
+            "win_rates": season.win_rates(args.min_games),
+            "synergy": season.synergy(args.min_games),
+            "attendance": season.attendance(),
+            "trends": season.trends(),
+        }, sys.stdout, ensure_ascii=False)
+        print()
+    else:
+        _print_report(season, counts, min_games=args.min_games, top=args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""จำลองทั้งคืนแบบไม่มี UI เพื่อวัดความเร็วและความยุติธรรมของกติกาหมุนคอร์ท
+
+    python -m badminton.simulate --policy all --players 5,9,16 --sessions 500
+    python -m badminton.simulate --policy rotation --players 12 --winners LLR
+    python -m badminton.simulate --policy all --players 16 --sessions 20000 --jobs 8
+"""
+import argparse
+import json
+import math
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .engine import PAIRING_MODES, MultiCourtScheduler
+from .policies import POLICIES, get_policy
+
+MIN_PLAYERS, MAX_PLAYERS = 4, 200
+
+
+def make_engine(policy: str, players: List[str], *, courts: int = 2,
+                pairing: str = "random", lookahead: int = 0, seed: Optional[int] = None):
+    return get_policy(policy).create(players, seed=seed, num_courts=courts, pairing=pairing,
+                                     lookahead=lookahead)
+
+
+def _timed(fn: Callable, sink: List[float]) -> Callable:
+    def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sink.append(time.perf_counter() - t0)
+    return wrapper
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """nearest-rank percentile (q อยู่ระหว่าง 0-100) ของลิสต์ที่เรียงแล้ว"""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values), math.ceil(q / 100 * len(sorted_values))) - 1)
+    return sorted_values[k]
+
+
+def _winner_picker(script: Optional[str], rng: random.Random) -> Callable[[int], str]:
+    """สุ่มผู้ชนะ หรือใช้สคริปต์ L/R วนซ้ำ (เช่น "LLR")"""
+    if not script:
+        return lambda step: "left" if rng.random() < 0.5 else "right"
+    sides = ["left" if ch == "L" else "right" for ch in script.upper() if ch in "LR"]
+    if not sides:
+        raise ValueError("winner script must contain L and/or R")
+    return lambda step: sides[step % len(sides)]
+
+
+def _busy_courts(eng) -> List[int]:
+    if isinstance(eng, MultiCourtScheduler):
+        return [c for c, m in enumerate(eng.current_matches) if m]
+    return [0] if eng.current_match else []
+
+
+def longest_idle(players: List[str], history: List[Dict]) -> Dict[str, int]:
+    """จำนวนแมตช์ที่นั่งรอติดต่อกันนานที่สุดของแต่ละคน (นับจาก history)"""
+    last = {p: -1 for p in players}
+    longest = {p: 0 for p in players}
+    for i, rec in enumerate(history):
+        for p in rec["winner"] + rec["loser"]:
+            gap = i - last[p] - 1
+            if gap > longest[p]:
+                longest[p] = gap
+            last[p] = i
+    end = len(history)
+    for p in players:
+        longest[p] = max(longest[p], end - last[p] - 1)
+    return longest
+
+
+def run_session(policy: str, num_players: int, matches: int, *, courts: int = 2,
+                pairing: str = "random", lookahead: int = 0, winners: Optional[str] = None,
+                seed: Optional[int] = None,
+                timings: Optional[Dict[str, List[float]]] = None) -> Dict:
+    """เล่นหนึ่งคืน คืนค่า metric ความยุติธรรมของคืนนั้น"""
+    rng = random.Random(seed)
+    players = [f"P{i+1:03d}" for i in range(num_players)]
+    if timings is None:
+        timings = {}
+    eng = make_engine(policy, players, courts=courts, pairing=pairing, lookahead=lookahead,
+                      seed=rng.randrange(2 ** 32))
+
+    # ห่อเมธอดของ instance เพื่อจับเวลาการเรียกจากข้างในด้วย (process_result → start_new_round)
+    for name in ("process_result", "start_new_round", "make_new_round"):
+        if hasattr(eng, name):
+            setattr(eng, name, _timed(getattr(eng, name), timings.setdefault(name, [])))
+
+    if hasattr(eng, "start_new_round"):
+        eng.start_new_round()
+    pick = _winner_picker(winners, rng)
+
+    for step in range(matches):
+        busy = _busy_courts(eng)
+        if not busy:
+            break
+        side = pick(step)
+        if isinstance(eng, MultiCourtScheduler):
+            eng.process_result(side, rng.choice(busy))
+        else:
+            eng.process_result(side)
+
+    played = [eng.stats[p]["played"] for p in players]
+    idle = longest_idle(players, eng.history)
+    return {
+        "matches": len(eng.history),
+        "played_spread": max(played) - min(played),
+        "played_stdev": statistics.pstdev(played),
+        "max_idle": max(idle.values()),
+        "mean_longest_idle": statistics.fmean(idle.values()),
+    }
+
+
+def _run_seeds(policy: str, num_players: int, matches: int, courts: int, pairing: str,
+               lookahead: int, winners: Optional[str], seeds: range) -> Tuple[List[Dict], Dict[str, List[float]]]:
+    """รันหลายคืน (1 คืนต่อ seed) — แยกเป็นฟังก์ชันระดับโมดูลเพื่อส่งให้ process อื่นได้"""
+    timings: Dict[str, List[float]] = {}
+    nights = [run_session(policy, num_players, matches, courts=courts, pairing=pairing,
+                          lookahead=lookahead, winners=winners, seed=s, timings=timings) for s in seeds]
+    return nights, timings
+
+
+def run(policy: str, num_players: int, *, sessions: int, matches: int, courts: int = 2,
+        pairing: str = "random", lookahead: int = 0, winners: Optional[str] = None, seed: int = 0,
+        jobs: int = 1) -> Dict:
+    """คืนที่ i ใช้ seed + i เสมอ → ผลเหมือนกันทุกครั้งไม่ว่าจะแบ่งกี่ process"""
+    timings: Dict[str, List[float]] = {}
+    nights: List[Dict] = []
+    t0 = time.perf_counter()
+    if jobs <= 1:
+        nights, timings = _run_seeds(policy, num_players, matches, courts, pairing, lookahead, winners,
+                                     range(seed, seed + sessions))
+    else:
+        step = -(-sessions // jobs)
+        chunks = [range(start, min(start + step, seed + sessions))
+                  for start in range(seed, seed + sessions, step)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(_run_seeds, policy, num_players, matches, courts, pairing,
+                                   lookahead, winners, chunk) for chunk in chunks]
+            for future in futures:
+                chunk_nights, chunk_timings = future.result()
+                nights.extend(chunk_nights)
+                for name, values in chunk_timings.items():
+                    timings.setdefault(name, []).extend(values)
+    elapsed = time.perf_counter() - t0
+
+    steps = sum(n["matches"] for n in nights)
+    latency = {}
+    for name, values in timings.items():
+        if not values:
+            continue
+        values.sort()
+        latency[name] = {
+            "calls": len(values),
+            "p50_us": percentile(values, 50) * 1e6,
+            "p95_us": percentile(values, 95) * 1e6,
+            "p99_us": percentile(values, 99) * 1e6,
+            "max_us": values[-1] * 1e6,
+        }
+    return {
+        "policy": policy,
+        "pairing": pairing,
+        "lookahead": lookahead,
+        "players": num_players,
+        "sessions": sessions,
+        "seed": seed,
+        "jobs": jobs,
+        "steps": steps,
+        "steps_per_sec": steps / elapsed if elapsed else 0.0,
+        "latency": latency,
+        "played_spread_mean": statistics.fmean(n["played_spread"] for n in nights),
+        "played_spread_max": max(n["played_spread"] for n in nights),
+        "played_stdev_mean": statistics.fmean(n["played_stdev"] for n in nights),
+        "max_idle_mean": statistics.fmean(n["max_idle"] for n in nights),
+        "max_idle_worst": max(n["max_idle"] for n in nights),
+    }
+
+
+def _print_report(r: Dict):
+    print(f"== {r['policy']} ({POLICIES[r['policy']].script}) | {r['pairing']} pairing | {r['players']} players | "
+          f"{r['sessions']} nights, {r['steps']} results")
+    print(f"   throughput      : {r['steps_per_sec']:,.0f} steps/sec")
+    for name, lat in r["latency"].items():
+        print(f"   {name:<16}: n={lat['calls']:<8} p50={lat['p50_us']:.1f}us "
+              f"p95={lat['p95_us']:.1f}us p99={lat['p99_us']:.1f}us max={lat['max_us']:.1f}us")
+    print(f"   played spread   : mean {r['played_spread_mean']:.2f}, worst {r['played_spread_max']} "
+          f"(stdev mean {r['played_stdev_mean']:.2f})")
+    print(f"   longest idle    : mean {r['max_idle_mean']:.2f} matches, worst {r['max_idle_worst']}")
+
+
+def _parse_players(text: str) -> List[int]:
+    counts = [int(x) for x in text.split(",") if x.strip()]
+    for n in counts:
+        if not MIN_PLAYERS <= n <= MAX_PLAYERS:
+            raise argparse.ArgumentTypeError(f"players must be between {MIN_PLAYERS} and {MAX_PLAYERS}")
+    return counts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Simulate whole club nights through the rotation engines.")
+    parser.add_argument("--policy", choices=list(POLICIES) + ["all"], default="all")
+    parser.add_argument("--players", type=_parse_players, default=[5, 9, 16],
+                        help="comma separated player counts (4-200)")
+    parser.add_argument("--sessions", type=int, default=1000, help="nights per configuration")
+    parser.add_argument("--matches", type=int, default=60, help="results per night")
+    parser.add_argument("--courts", type=int, default=2, help="courts for the multi policy")
+    parser.add_argument("--pairing", choices=PAIRING_MODES, default="random")
+    parser.add_argument("--lookahead", type=int, default=0,
+                        help="queue teams planned ahead for the live/rotation policies (0 = FIFO)")
+    parser.add_argument("--winners", default=None,
+                        help="scripted winners cycled per result, e.g. LLR (default: random)")
+    parser.add_argument("--seed", type=int, default=0, help="night i uses seed + i")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes to fan the seeds out over")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    args = parser.parse_args(argv)
+
+    policies = list(POLICIES) if args.policy == "all" else [args.policy]
+    for policy in policies:
+        for n in args.players:
+            if policy == "multi" and n < args.courts * 4:
+                continue
+            report = run(policy, n, sessions=args.sessions, matches=args.matches,
+                         courts=args.courts, pairing=args.pairing, lookahead=args.lookahead,
+                         winners=args.winners, seed=args.seed, jobs=args.jobs)
+            if args.json:
+                print(json.dumps(report))
+            else:
+                _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
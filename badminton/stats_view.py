@@ -0,0 +1,82 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+# ============================================================
+# 📊 Stats Table (เรียงลำดับแบบ incremental + cache ตาม revision)
+# ============================================================
+# ลำดับเดิมของตาราง: played น้อยก่อน, win มากก่อน, เสมอกันใช้ลำดับในรายชื่อ
+# ผลแมตช์หนึ่งครั้งขยับแค่ 4 แถว → ลบ/แทรกด้วย bisect แทนการ sort ทั้งตาราง
+
+Key = Tuple[int, int, int, str]
+
+
+class StatsTable:
+    __slots__ = ("stats", "ratings", "_order", "_keys", "_sorted", "revision", "_rows")
+
+    def __init__(self, stats: Dict[str, Dict[str, int]], ratings: Optional[Dict[str, float]] = None):
+        self.stats = stats
+        self.ratings = ratings   # เปลี่ยนพร้อม played เสมอ → revision เดิมใช้ cache ได้
+        self._order: Dict[str, int] = {}
+        self._keys: Dict[str, Key] = {}
+        self._sorted: List[Key] = []
+        self.revision = 0
+        self._rows: Dict[bool, Tuple[int, List[Dict]]] = {}
+        for p in stats:
+            self.add(p)
+
+    def _key(self, p: str) -> Key:
+        s = self.stats[p]
+        return (s["played"], -s["win"], self._order[p], p)
+
+    def add(self, p: str):
+        if p in self._keys:
+            return
+        self._order[p] = len(self._order)
+        key = self._keys[p] = self._key(p)
+        insort(self._sorted, key)
+        self.revision += 1
+
+    def remove(self, p: str):
+        key = self._keys.pop(p, None)
+        if key is None:
+            return
+        del self._sorted[bisect_left(self._sorted, key)]
+        self.revision += 1
+
+    def update(self, p: str):
+        """เรียกหลัง stats[p] เปลี่ยน — O(log n) หา + O(n) memmove ของ list"""
+        if p not in self._keys:
+            self.add(p)
+            return
+        old = self._keys[p]
+        new = self._key(p)
+        if new == old:
+            return
+        del self._sorted[bisect_left(self._sorted, old)]
+        insort(self._sorted, new)
+        self._keys[p] = new
+        self.revision += 1
+
+    def ordered(self) -> List[str]:
+        return [key[3] for key in self._sorted]
+
+    def rows(self, *, rank: bool = False) -> List[Dict]:
+        """แถวของตารางสถิติ (คำนวณครั้งเดียวต่อ revision)"""
+        hit = self._rows.get(rank)
+        if hit and hit[0] == self.revision:
+            return hit[1]
+        rows = []
+        for i, (played, neg_win, _, name) in enumerate(self._sorted):
+            win = -neg_win
+            row = {"ลำดับ": i + 1} if rank else {}
+            row.update({
+                "ผู้เล่น": name,
+                "แมตช์": played,
+                "ชนะ": win,
+                "อัตราชนะ (%)": round((win / played * 100) if played else 0, 1),
+            })
+            if self.ratings is not None:
+                row["เรตติ้ง"] = round(self.ratings.get(name, 0))
+            rows.append(row)
+        self._rows[rank] = (self.revision, rows)
+        return rows
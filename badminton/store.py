@@ -0,0 +1,191 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .eventlog import SessionLog
+
+# ============================================================
+# 🌐 Shared Club Store (ทุกมือถือที่เปิด session เดียวกันเห็น state ชุดเดียวกัน)
+# ============================================================
+# 1 process มี store เดียว (หน้า Streamlit ได้มาจาก st.cache_resource)
+# version = seq ของเหตุการณ์ล่าสุดใน log → เขียนได้เฉพาะคนที่เห็น version ล่าสุด
+# (optimistic concurrency) กดพร้อมกันสองเครื่อง เครื่องที่สองจะได้ VersionConflict
+# หลายก๊วนใช้ server เดียวกันได้: เก็บในหน่วยความจำไม่เกิน max_clubs คืน (LRU) และคืนที่ไม่มีใครแตะ
+# เกิน ttl วินาทีถูกเขียน snapshot ลง disk แล้วปล่อยจากหน่วยความจำ — เปิด/กดครั้งถัดไปค่อยโหลดกลับ
+
+MAX_CLUBS = int(os.environ.get("BADMINTON_MAX_CLUBS", "32"))
+CLUB_TTL_SECONDS = float(os.environ.get("BADMINTON_CLUB_TTL", "3600"))
+SPILLED_VERSIONS = 4096   # จำ version ของคืนที่ถูก evict ไว้ให้ polling เทียบ (ไม่ต้องโหลดกลับ)
+
+
+class VersionConflict(Exception):
+    def __init__(self, expected: int, actual: int):
+        super().__init__(f"expected version {expected}, store is at {actual}")
+        self.expected = expected
+        self.actual = actual
+
+
+class ClubState:
+    def __init__(self, club_id: str, engine, log: SessionLog):
+        self.club_id = club_id
+        self.engine = engine
+        self.log = log
+        self.lock = threading.RLock()
+        self.last_used = time.monotonic()
+        self.evicted = False   # ถูกปล่อยจากหน่วยความจำแล้ว → ห้ามเขียนผ่าน object นี้อีก
+        self._cache: Dict[str, Tuple[int, Any]] = {}
+
+    @property
+    def version(self) -> int:
+        return self.log.seq
+
+    def cached(self, name: str, build: Callable[[], Any]) -> Any:
+        """ค่าที่คำนวณจาก state (เช่นตารางสถิติ) คำนวณครั้งเดียวต่อ version แล้วแชร์ทุกเครื่อง"""
+        version = self.version
+        hit = self._cache.get(name)
+        if hit and hit[0] == version:
+            return hit[1]
+        value = build()
+        self._cache[name] = (version, value)
+        return value
+
+
+class SharedStore:
+    def __init__(self, directory: Optional[str] = None, *, max_clubs: int = MAX_CLUBS,
+                 ttl: float = CLUB_TTL_SECONDS):
+        self.directory = directory
+        self.max_clubs = max(1, max_clubs)
+        self.ttl = ttl
+        self._clubs: "OrderedDict[str, ClubState]" = OrderedDict()   # เก่าสุด (ใช้ล่าสุดนานสุด) อยู่หน้า
+        self._spilled: "OrderedDict[str, int]" = OrderedDict()
+        self._spilling: Dict[str, ClubState] = {}   # ถอดออกแล้ว กำลังเขียน snapshot (ถือ club.lock อยู่)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._clubs)
+
+    def get(self, club_id: str) -> Optional[ClubState]:
+        """club ที่อยู่ในหน่วยความจำเท่านั้น (ไม่โหลดจาก disk)"""
+        club = self._clubs.get(club_id)
+        if club:
+            self._touch(club)
+        return club
+
+    def version(self, club_id: str) -> int:
+        """ถูกพอจะเรียกทุก rerun / ทุกรอบ polling (ไม่ต้องล็อก, ไม่นับเป็นการใช้งาน → ไม่กัน evict)"""
+        club = self._clubs.get(club_id)
+        if club:
+            return club.version
+        return self._spilled.get(club_id, -1)
+
+    def create(self, engine, *, imported: bool = False) -> ClubState:
+        """เปิดคืนใหม่จาก engine ที่จัดรอบแรกแล้ว (imported=True = engine มาจากไฟล์ snapshot)"""
+        log = SessionLog.start(engine, directory=self.directory, imported=imported)
+        club = ClubState(log.session_id, engine, log)
+        with self._lock:
+            self._clubs[club.club_id] = club
+            detached = self._evict_locked(keep=club.club_id)
+        self._spill(detached)
+        return club
+
+    def open(self, club_id: str) -> ClubState:
+        """คืน club ที่อยู่ในหน่วยความจำ หรือโหลดจาก snapshot + log (FileNotFoundError ถ้าไม่มี)"""
+        club = self._clubs.get(club_id)
+        if club:
+            self._touch(club)
+            return club
+        while True:
+            with self._lock:
+                club = self._clubs.get(club_id)
+                pending = self._spilling.get(club_id) if club is None else None
+                if pending is None:
+                    if club is None:
+                        engine, log = SessionLog.load(club_id, directory=self.directory)
+                        club = self._clubs[club_id] = ClubState(club_id, engine, log)
+                        self._spilled.pop(club_id, None)
+                    detached = self._evict_locked(keep=club_id)
+                    break
+            with pending.lock:
+                pass   # คืนนี้กำลังถูกเขียนลง disk → รอให้เสร็จก่อนโหลดกลับ (ไม่ถือล็อกกลางระหว่างรอ)
+        self._spill(detached)
+        return club
+
+    def commit(self, club_id: str, expected_version: int, event: Dict) -> int:
+        """ใช้เหตุการณ์ถ้า version ยังตรงกับที่ผู้กดเห็น คืน version ใหม่"""
+        while True:
+            club = self.open(club_id)
+            with club.lock:
+                if club.evicted:
+                    continue   # ถูก evict ระหว่างรอล็อก → เปิดใหม่จาก disk แล้วลองอีกครั้ง
+                if club.version != expected_version:
+                    raise VersionConflict(expected_version, club.version)
+                club.log.commit(club.engine, event)
+                return club.version
+
+    # -----------------------------
+    # Eviction (LRU + TTL, spill ลง disk)
+    # -----------------------------
+    def _touch(self, club: ClubState):
+        club.last_used = time.monotonic()
+        try:
+            self._clubs.move_to_end(club.club_id)
+        except KeyError:
+            pass   # ถูก evict ไปพร้อมกันพอดี
+
+    def evict(self, club_id: str) -> bool:
+        """ปล่อย club ออกจากหน่วยความจำ (คืน False ถ้าไม่อยู่ หรือกำลังมีคนบันทึกผลอยู่)"""
+        with self._lock:
+            club = self._detach(club_id)
+        if club is None:
+            return False
+        self._spill([club])
+        return True
+
+    def sweep(self) -> List[str]:
+        """evict คืนที่เกิน ttl และที่ล้น max_clubs คืนรายชื่อ club ที่ถูกปล่อย"""
+        with self._lock:
+            detached = self._evict_locked()
+        self._spill(detached)
+        return [club.club_id for club in detached]
+
+    def _evict_locked(self, keep: Optional[str] = None) -> List[ClubState]:
+        now = time.monotonic()
+        detached = []
+        # เรียงจากใช้ล่าสุดนานสุด → หยุดเมื่อเจอคืนที่ยังไม่หมดอายุและจำนวนไม่ล้นแล้ว
+        for club_id, club in list(self._clubs.items()):
+            expired = now - club.last_used > self.ttl
+            if not expired and len(self._clubs) <= self.max_clubs:
+                break
+            if club_id != keep:
+                club = self._detach(club_id)
+                if club is not None:
+                    detached.append(club)
+        return detached
+
+    def _detach(self, club_id: str) -> Optional[ClubState]:
+        """ถอด club ออกจาก LRU (เรียกขณะถือ self._lock) — คืน club ที่ยังถือ club.lock ไว้ให้ _spill เขียนต่อ"""
+        club = self._clubs.get(club_id)
+        if club is None or not club.lock.acquire(blocking=False):
+            return None
+        club.evicted = True
+        del self._clubs[club_id]
+        self._spilling[club_id] = club
+        self._spilled[club_id] = club.version
+        self._spilled.move_to_end(club_id)
+        while len(self._spilled) > SPILLED_VERSIONS:
+            self._spilled.popitem(last=False)
+        return club
+
+    def _spill(self, clubs: List[ClubState]):
+        """เขียน snapshot ของ club ที่ถอดแล้วนอก self._lock → ก๊วนอื่นเปิด/บันทึกผลต่อได้ระหว่างรอ disk"""
+        for club in clubs:
+            try:
+                if club.log.seq != club.log.last_snapshot_seq:
+                    club.log.write_snapshot(club.engine)   # โหลดกลับ = อ่าน snapshot ไม่ต้อง replay tail
+            finally:
+                with self._lock:
+                    if self._spilling.get(club.club_id) is club:
+                        del self._spilling[club.club_id]
+                club.lock.release()
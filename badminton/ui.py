@@ -0,0 +1,403 @@
+import html
+import os
+import time
+import uuid
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import streamlit as st
+
+from . import binsnap
+from .cooccurrence import PairIndex
+from .eventlog import list_sessions
+from .history_view import PAGE_SIZE, history_window, page_count
+from .idle import MAX_WAIT_ALERT
+from .rating import win_probability
+from .store import ClubState, SharedStore, VersionConflict
+
+if TYPE_CHECKING:
+    from .profiling import RerunProfiler
+
+# ============================================================
+# 🧩 ส่วน UI ที่ใช้ร่วมกันทุกหน้า (import streamlit ได้เฉพาะไฟล์นี้)
+# ============================================================
+
+
+def _heat_color(value: int, top: int, rgb: str) -> str:
+    if not value or not top:
+        return "#ffffff"
+    alpha = 0.15 + 0.85 * value / top
+    return f"rgba({rgb},{alpha:.2f})"
+
+
+def pair_heatmap_html(pairs: PairIndex, kind: str = "partner") -> str:
+    rows = pairs.matrix(kind)
+    top = max((v for row in rows for v in row), default=0)
+    rgb = "79,70,229" if kind == "partner" else "220,38,38"
+    names = [html.escape(p) for p in pairs.players]
+
+    head = "".join(
+        f"<th style='writing-mode:vertical-rl;font-weight:normal;padding:2px'>{n}</th>" for n in names
+    )
+    body = []
+    for name, row in zip(names, rows):
+        cells = "".join(
+            f"<td title='{v}' style='width:22px;height:22px;text-align:center;font-size:0.7rem;"
+            f"background:{_heat_color(v, top, rgb)}'>{v or ''}</td>"
+            for v in row
+        )
+        body.append(f"<tr><th style='text-align:right;font-weight:normal;padding-right:6px'>{name}</th>{cells}</tr>")
+    return (
+        "<div style='overflow-x:auto'><table style='border-collapse:collapse'>"
+        f"<tr><th></th>{head}</tr>{''.join(body)}</table></div>"
+    )
+
+
+def table_html(rows: List[Dict]) -> str:
+    """ตารางเล็กเป็น HTML ล้วน — ใช้แทน st.table/st.dataframe ที่ต้องโหลด pandas+pyarrow (~0.5s ตอนเปิดหน้าแรก)"""
+    if not rows:
+        return ""
+    cols = list(rows[0])
+    head = "".join(f"<th style='text-align:left;padding:4px 8px'>{html.escape(str(c))}</th>" for c in cols)
+    body = "".join(
+        "<tr>" + "".join(f"<td style='padding:4px 8px'>{html.escape(str(row[c]))}</td>" for c in cols) + "</tr>"
+        for row in rows
+    )
+    return (
+        "<div style='overflow-x:auto'><table style='border-collapse:collapse;width:100%'>"
+        f"<tr style='border-bottom:1px solid #e6e8ef'>{head}</tr>{body}</table></div>"
+    )
+
+
+def render_pair_heatmap(pairs: PairIndex, *, key: str = "heatmap"):
+    """Heatmap คู่ซ้ำ/เจอกันซ้ำ + ปุ่มดาวน์โหลด CSV สำหรับผู้จัด"""
+    # toggle แทน expander: expander สร้างเนื้อหาข้างในทุก rerun แม้ปิดอยู่ ส่วน toggle ไม่สร้างเลยจนกว่าจะเปิด
+    if st.toggle("🔥 Heatmap คู่ซ้ำ / เจอกันซ้ำ", key=key):
+        tab_partner, tab_opponent = st.tabs(["🤝 เป็นคู่กัน", "⚔️ เจอกันข้ามเน็ต"])
+        for tab, kind in ((tab_partner, "partner"), (tab_opponent, "opponent")):
+            with tab:
+                st.markdown(pair_heatmap_html(pairs, kind), unsafe_allow_html=True)
+                top = pairs.top_pairs(kind, limit=5)
+                if top:
+                    st.caption("ซ้ำบ่อยสุด: " + ", ".join(f"{a} & {b} ({n})" for a, b, n in top))
+                st.download_button(
+                    "⬇️ ดาวน์โหลด CSV",
+                    pairs.to_csv(kind),
+                    file_name=f"{kind}_counts.csv",
+                    mime="text/csv",
+                    key=f"pair_csv_{kind}",
+                )
+
+
+PAIRING_LABELS = {
+    "random": "🎲 สุ่ม",
+    "fair": "⚖️ ยุติธรรม (เลี่ยงคู่ซ้ำ + คนเล่นน้อยได้ลงก่อน)",
+    "balanced": "📈 สูสีตามเรตติ้ง",
+}
+
+
+def pairing_picker() -> str:
+    """เลือกโหมดจับคู่ คืนค่าที่ส่งให้ engine ได้ตรงๆ"""
+    return st.radio("วิธีจับคู่", list(PAIRING_LABELS), format_func=PAIRING_LABELS.get,
+                    horizontal=True, key="pairing_mode")
+
+
+def lookahead_picker() -> int:
+    """จำนวนทีมในคิวที่ให้ planner วางลำดับล่วงหน้า (0 = ตามลำดับสุ่มเดิม)"""
+    return int(st.number_input("🔮 วางแผนคิวล่วงหน้า (จำนวนทีม, 0 = ปิด)", min_value=0, max_value=8,
+                               value=0, step=1, key="lookahead"))
+
+
+def render_odds(eng, left, right):
+    """โอกาสชนะของแต่ละฝั่งตามเรตติ้งปัจจุบัน"""
+    p = win_probability(left, right, eng.ratings)
+    st.caption(f"📈 โอกาสชนะตามเรตติ้ง: ซ้าย {p:.0%} · ขวา {1 - p:.0%}")
+
+
+def render_history(eng, fmt: Callable[[Dict], str], *, key: str = "history"):
+    """ประวัติแบบแบ่งหน้า: แสดงทีละ PAGE_SIZE แมตช์ (ใหม่สุดก่อน) ค้นตามชื่อผู้เล่นได้"""
+    st.subheader("📜 ประวัติการแข่งขัน")
+    c1, c2 = st.columns([2, 1])
+    with c1:
+        # ทุกคนที่เคยอยู่ในก๊วนคืนนี้ (คนที่กลับไปแล้วยังมีแมตช์ใน log ให้ค้น)
+        who = st.selectbox("🔎 ค้นตามผู้เล่น", ["ทุกคน"] + list(eng.stats), key=f"{key}_player")
+    player = None if who == "ทุกคน" else who
+    total = len(eng.player_matches.get(player, [])) if player else len(eng.history)
+    pages = page_count(total, PAGE_SIZE)
+    with c2:
+        page = st.number_input("หน้า (1 = ล่าสุด)", min_value=1, max_value=pages, value=1,
+                               step=1, key=f"{key}_page")
+    window, total = history_window(eng.history, page=min(page, pages) - 1, page_size=PAGE_SIZE,
+                                   player=player, player_matches=eng.player_matches)
+    if not window:
+        st.caption("ยังไม่มีแมตช์")
+        return
+    # รวมเป็น markdown ก้อนเดียว แทน st.write ทีละบรรทัด
+    st.markdown("  \n".join(f"{i}. {fmt(rec)}" for i, rec in window))
+    st.caption(f"แสดง {len(window)} จาก {total} แมตช์ · หน้า {min(page, pages)}/{pages}")
+
+
+def render_idle(eng, *, key: str = "idle"):
+    """เตือนคนที่รอนานเกิน + histogram ช่วงรอ + รายงานรายคน (ดาวน์โหลด CSV ได้)"""
+    idle = eng.idle
+    threshold = st.session_state.get(f"{key}_alert", MAX_WAIT_ALERT)
+    waiting = idle.over(threshold)
+    if waiting:
+        st.warning("⏳ รอนานแล้ว: " + ", ".join(f"**{p}** ({n} แมตช์)" for p, n in waiting))
+
+    # รายงานเปิดเมื่อกดเท่านั้น (กราฟใช้ altair+pandas → แยกเป็นอีก toggle ไม่ให้โหลดติดมากับตาราง)
+    if st.toggle("⏱️ เวลานั่งรอของผู้เล่น", key=f"{key}_open"):
+        st.number_input("เตือนเมื่อรอติดกันเกิน (แมตช์)", min_value=1, max_value=50,
+                        value=MAX_WAIT_ALERT, step=1, key=f"{key}_alert")
+        hist = idle.live_histogram()
+        if hist and st.toggle("📊 กราฟช่วงรอ", key=f"{key}_chart"):
+            st.caption("จำนวนช่วงรอ แยกตามความยาว (แมตช์) — รวมช่วงที่ยังรออยู่")
+            st.bar_chart([{"รอ (แมตช์)": k, "จำนวนครั้ง": v} for k, v in hist.items()],
+                         x="รอ (แมตช์)", y="จำนวนครั้ง")
+        now = time.time()
+        st.markdown(table_html(idle.rows(now)), unsafe_allow_html=True)
+        st.download_button(
+            "⬇️ ดาวน์โหลดรายงานเวลารอ (CSV)",
+            idle.to_csv(now),
+            file_name="idle_report.csv",
+            mime="text/csv",
+            key=f"{key}_csv",
+        )
+
+
+def _roster_event(ss, kind: str, key: str):
+    """on_click ของปุ่มเพิ่ม/เอาคนออก: ส่งเป็นเหตุการณ์ใน log (เครื่องอื่นเห็นพร้อมกัน)"""
+    name = (ss.get(key) or "").strip()
+    if not name:
+        return
+    try:
+        ok = submit(ss, {"type": kind, "player": name})
+    except ValueError as e:
+        ss[f"{key}_error"] = str(e)
+        return
+    if ok and kind == "add_player":
+        ss[key] = ""
+    elif ok:
+        ss.pop(key, None)
+
+
+def render_roster(ss, eng, *, key: str = "roster"):
+    """เพิ่มคนมาสาย / เอาคนกลับก่อนออก โดยไม่ต้องเริ่มเกมใหม่ (แก้เฉพาะคิว/คอร์ทที่เกี่ยวข้อง)"""
+    with st.expander("🧑‍🤝‍🧑 เพิ่ม / เอาผู้เล่นออกระหว่างเกม"):
+        for k in (f"{key}_add_error", f"{key}_remove_error"):
+            if k in ss:
+                st.error(ss.pop(k))
+        c1, c2 = st.columns(2)
+        with c1:
+            st.text_input("ชื่อคนมาใหม่", key=f"{key}_add")
+            st.button("➕ เพิ่มเข้าก๊วน", key=f"{key}_add_btn", on_click=_roster_event,
+                      args=(ss, "add_player", f"{key}_add"))
+        with c2:
+            st.selectbox("คนที่กลับก่อน", eng.players, key=f"{key}_remove")
+            st.button("➖ เอาออกจากก๊วน", key=f"{key}_remove_btn", on_click=_roster_event,
+                      args=(ss, "remove_player", f"{key}_remove"))
+        late = [(p, n) for p, n in eng.handicap.items() if p in eng.played_index]
+        if late:
+            st.caption("แต้มต่อคนมาสาย (นับเหมือนเล่นไปแล้วกี่แมตช์ตอนจัดคิว): "
+                       + ", ".join(f"{p} +{n}" for p, n in late))
+
+
+# -----------------------------
+# Shared club session (ทุกเครื่องที่เปิด ?session=<id> เดียวกันใช้ state ร่วมกัน)
+# -----------------------------
+@st.cache_resource
+def shared_store() -> SharedStore:
+    return SharedStore()
+
+
+def _open_club(ss, session_id: str, kind: str) -> Optional[ClubState]:
+    try:
+        club = shared_store().open(session_id)
+    except FileNotFoundError:
+        return None
+    if club.engine.KIND != kind:
+        return None
+    ss.club_id = session_id
+    st.query_params["session"] = session_id
+    return club
+
+
+def current_club(ss, kind: str) -> Optional[ClubState]:
+    """club ของหน้านี้ — ถ้า ss ยังไม่มีแต่ URL มี ?session=<id> ให้เปิดจาก store/log"""
+    club_id = ss.get("club_id")
+    if club_id:
+        # ถูก evict ไปแล้ว (ไม่มีใครแตะนาน / ล้นจำนวน) ก็โหลดกลับจาก disk ได้ทันที
+        club = shared_store().get(club_id) or _open_club(ss, club_id, kind)
+        if club and club.engine.KIND == kind:
+            return club
+    session_id = st.query_params.get("session")
+    if session_id:
+        club = _open_club(ss, session_id, kind)
+        if club:
+            return club
+        st.query_params.clear()
+    return None
+
+
+def begin_session(ss, engine, *, imported: bool = False) -> ClubState:
+    """เปิดคืนใหม่จาก engine ที่จัดรอบแรกแล้ว (imported=True = มาจากไฟล์ snapshot)"""
+    club = shared_store().create(engine, imported=imported)
+    ss.club_id = club.club_id
+    ss.seen_version = club.version
+    st.query_params["session"] = club.club_id
+    return club
+
+
+def end_session(ss):
+    ss.pop("club_id", None)
+    st.query_params.clear()
+
+
+def submit(ss, event: Dict) -> bool:
+    """ส่งเหตุการณ์ด้วย version ที่ผู้ใช้เห็นล่าสุด (กันกดซ้ำ/กดพร้อมกันหลายเครื่อง)"""
+    try:
+        ss.seen_version = shared_store().commit(ss.club_id, ss.get("seen_version", -1), event)
+    except VersionConflict:
+        ss.version_conflict = True   # แสดงผ่าน show_conflict() (submit อาจถูกเรียกจาก callback)
+        return False
+    return True
+
+
+def show_conflict(ss):
+    if ss.pop("version_conflict", False):
+        st.warning("⚠️ มีคนบันทึกผลไปก่อนแล้ว — แสดงแมตช์ล่าสุดให้แทน")
+
+
+def mark_seen(ss, club: Optional[ClubState]):
+    """เรียกท้ายสคริปต์: จำ version ที่หน้าจอนี้แสดงอยู่"""
+    if club:
+        ss.seen_version = club.version
+
+
+# -----------------------------
+# Versioned partial updates (แทนการสั่ง rerun ซ้ำหลายรอบ)
+# -----------------------------
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
+VERSION_POLL_SECONDS = 2
+
+
+@fragment(run_every=VERSION_POLL_SECONDS)
+def watch_version():
+    """fragment ว่างที่เช็ก version ทุกไม่กี่วินาที — ถ้ามีเครื่องอื่นบันทึกผลจึง rerun หน้านี้ 1 ครั้ง"""
+    ss = st.session_state
+    store = shared_store()
+    store.sweep()   # ปล่อยคืนที่ไม่มีใครใช้เกิน ttl (เช็กแค่หัวคิว LRU → ถูก)
+    club_id = ss.get("club_id")
+    if club_id and store.version(club_id) != ss.get("seen_version", -1):
+        st.rerun()
+
+
+def render_saved_sessions(ss, kind: str):
+    sessions = list_sessions()
+    if not sessions:
+        return
+    with st.expander("📂 เปิดคืนที่บันทึกไว้"):
+        picked = st.selectbox("เลือกคืน", sessions[:50], key="saved_session")
+        if st.button("📥 โหลดคืนนี้", key="load_saved_session"):
+            if _open_club(ss, picked, kind):
+                st.rerun()
+            else:
+                st.error("โหลดไม่ได้ (ไฟล์เสีย หรือเป็นคืนของหน้าอื่น)")
+
+
+# -----------------------------
+# Binary snapshot (ย้ายคืนไปเครื่องอื่น / สำรองก่อน Reset)
+# -----------------------------
+def render_snapshot_export(club: ClubState, *, key: str = "snapshot"):
+    """ปุ่มดาวน์โหลดทั้งคืนเป็นไฟล์เดียว — สร้างไฟล์เมื่อเปิด toggle เท่านั้น (ครั้งเดียวต่อ version)"""
+    if st.toggle("💾 ย้ายเครื่อง / สำรองคืนนี้", key=key):
+        data = club.cached("binsnap", lambda: binsnap.dumps(club.engine))
+        st.download_button(
+            "⬇️ ดาวน์โหลดไฟล์ snapshot",
+            data,
+            file_name=f"{club.club_id}{binsnap.FILE_SUFFIX}",
+            mime="application/octet-stream",
+            key=f"{key}_download",
+        )
+        st.caption(f"{len(data):,} ไบต์ · เปิดต่อที่เครื่องอื่นด้วย \"📤 เปิดจากไฟล์ snapshot\"")
+
+
+def render_snapshot_import(ss, kind: str, *, key: str = "snapshot_upload"):
+    with st.expander("📤 เปิดจากไฟล์ snapshot"):
+        upload = st.file_uploader("ไฟล์ snapshot", type=[binsnap.FILE_SUFFIX.lstrip(".")], key=key)
+        if upload is None or not st.button("📥 เล่นคืนนี้ต่อ", key=f"{key}_open"):
+            return
+        try:
+            engine = binsnap.loads(upload.getvalue())
+        except ValueError as e:
+            st.error(f"เปิดไฟล์ไม่ได้: {e}")
+            return
+        if engine.KIND != kind:
+            st.error("เป็นคืนของกติกาอื่น — เลือกกติกาให้ตรงกับไฟล์ก่อน")
+            return
+        begin_session(ss, engine, imported=True)
+        st.rerun()
+
+
+# -----------------------------
+# Opt-in rerun profiling (BADMINTON_PROFILE=1 หรือเปิดหน้าด้วย ?profile=1)
+# -----------------------------
+@st.cache_resource
+def rerun_profiler() -> "RerunProfiler":
+    from .profiling import RerunProfiler   # โหลดเฉพาะตอนเปิด profiling (ดึง simulate มาด้วย)
+
+    return RerunProfiler()
+
+
+def profiling_enabled() -> bool:
+    return os.environ.get("BADMINTON_PROFILE") == "1" or st.query_params.get("profile") == "1"
+
+
+class _NoProfile:
+    def mark(self, name: str):
+        pass
+
+
+def _club_version(ss) -> int:
+    club_id = ss.get("club_id")
+    return shared_store().version(club_id) if club_id else -1
+
+
+def begin_profile(page: str, *, fragment: bool = False):
+    """เรียกบรรทัดแรกๆ ของสคริปต์/fragment แล้ว mark("ชื่อช่วง") ระหว่างส่วนต่างๆ"""
+    if not profiling_enabled():
+        return _NoProfile()
+    ss = st.session_state
+    if "profile_sid" not in ss:
+        ss.profile_sid = uuid.uuid4().hex[:8]
+    key = f"profile_run_{'fragment' if fragment else 'script'}"
+    unfinished = ss.pop(key, None)
+    if unfinished is not None:
+        # run ก่อนหน้าถูกตัดกลางทางด้วย st.rerun() → ยังนับเป็น 1 rerun ของ action นั้น
+        unfinished.finish(_club_version(ss), interrupted=True)
+    run = ss[key] = rerun_profiler().begin(page, ss.profile_sid, _club_version(ss), fragment=fragment)
+    return run
+
+
+def end_profile(run, *, show: bool = True):
+    """ปิดการจับเวลา rerun นี้ และ (ถ้า show) แสดงสรุป + ปุ่ม export"""
+    if isinstance(run, _NoProfile):
+        return
+    ss = st.session_state
+    ss.pop(f"profile_run_{'fragment' if run.record['fragment'] else 'script'}", None)
+    run.finish(_club_version(ss))
+    if not show:
+        return
+    prof = rerun_profiler()
+    with st.expander("🩺 Profiling (เวลาแต่ละช่วงของการ rerun)"):
+        summary = prof.summary()
+        st.caption(f"{summary['runs']} reruns ใน buffer · {summary['actions']} actions · "
+                   f"rerun ต่อ action เฉลี่ย {summary['reruns_per_action_mean']:.2f} "
+                   f"(สูงสุด {summary['reruns_per_action_max']})")
+        st.dataframe(
+            [{"ช่วง": name, "ครั้ง": d["n"], "p50 (ms)": round(d["p50_ms"], 2),
+              "p95 (ms)": round(d["p95_ms"], 2), "max (ms)": round(d["max_ms"], 2)}
+             for name, d in dict(summary["phases"], total=summary["total"]).items()],
+            hide_index=True,
+        )
+        if st.button("💾 บันทึกลงไฟล์ (JSONL)", key="profile_export"):
+            st.success(f"บันทึกแล้ว: {prof.export()}")
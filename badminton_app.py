@@ -0,0 +1,7 @@
+from badminton.app import main
+
+# ============================================================
+# 🏸 Badminton App (เลือกกติกาหมุนคอร์ทจาก sidebar)
+# ============================================================
+#   streamlit run badminton_app.py
+main()
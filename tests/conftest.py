@@ -0,0 +1,35 @@
+import random
+from typing import Optional
+
+import pytest
+
+from badminton.policies import get_policy
+
+POLICY_NAMES = ("live", "rotation", "multi", "individual")
+
+
+def new_engine(policy: str, players: int = 10, *, seed: int = 7, **options):
+    eng = get_policy(policy).create([f"P{i:02d}" for i in range(players)], seed=seed,
+                                    num_courts=2, **options)
+    if hasattr(eng, "start_new_round"):
+        eng.start_new_round()
+    return eng
+
+
+def play(log, eng, rng: random.Random, ts: Optional[float] = None):
+    """บันทึกผลหนึ่งครั้งผ่าน log (ทุกคอร์ทที่เล่นอยู่สำหรับ multi) — ts ตายตัวได้ เพื่อเทียบสองเครื่อง"""
+    if eng.KIND == "multi_court":
+        live = [c for c, m in enumerate(eng.current_matches) if m]
+        if not live:
+            return
+        event = {"type": "results", "sides": sorted((c, rng.choice(("left", "right"))) for c in live)}
+    else:
+        event = {"type": "result", "side": rng.choice(("left", "right")), "court": 0}
+    if ts is not None:
+        event["ts"] = ts
+    log.commit(eng, event)
+
+
+@pytest.fixture(params=POLICY_NAMES)
+def policy(request) -> str:
+    return request.param
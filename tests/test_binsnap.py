@@ -0,0 +1,48 @@
+import json
+import random
+
+import pytest
+
+from badminton import binsnap
+from badminton.eventlog import SessionLog
+
+from .conftest import new_engine, play
+
+
+def _same(a, b):
+    assert json.dumps(a.snapshot(), sort_keys=True) == json.dumps(b.snapshot(), sort_keys=True)
+    assert a.history == b.history
+    assert a.stats == b.stats
+    assert a.ratings == b.ratings
+    assert a.pairs.matrix("partner") == b.pairs.matrix("partner")
+    assert a.pairs.matrix("opponent") == b.pairs.matrix("opponent")
+
+
+def test_round_trip_then_continue(tmp_path, policy):
+    eng = new_engine(policy, 10)
+    log = SessionLog.start(eng, directory=str(tmp_path))
+    rng = random.Random(3)
+    for _ in range(8):
+        play(log, eng, rng)
+    log.commit(eng, {"type": "add_player", "player": "Late"})
+    log.commit(eng, {"type": "remove_player", "player": eng.players[0]})
+    for _ in range(5):
+        play(log, eng, rng)
+
+    copy = binsnap.loads(binsnap.dumps(eng))
+    _same(eng, copy)
+
+    # สุ่มต่อได้ตรงกัน: ผลเดียวกันต่อจากนี้ต้องได้คิวเดียวกัน
+    copy_log = SessionLog.start(copy, directory=str(tmp_path), imported=True)
+    for i in range(6):
+        play(log, eng, random.Random(i), ts=2e9 + i)
+        play(copy_log, copy, random.Random(i), ts=2e9 + i)
+    _same(eng, copy)
+
+
+def test_rejects_foreign_and_truncated_data():
+    with pytest.raises(ValueError):
+        binsnap.loads(b"not a snapshot at all")
+    data = binsnap.dumps(new_engine("live", 8))
+    with pytest.raises(ValueError):
+        binsnap.loads(data[:len(data) - 3])
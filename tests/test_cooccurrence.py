@@ -0,0 +1,68 @@
+import random
+from collections import Counter
+
+import pytest
+
+from badminton.cooccurrence import PairIndex
+
+
+def test_record_counts_partners_and_opponents_symmetrically():
+    idx = PairIndex(["a", "b", "c", "d"])
+    idx.record(["a", "b"], ["c", "d"])
+    idx.record(["a", "c"], ["b", "d"])
+    assert idx.partners("a", "b") == idx.partners("b", "a") == 1
+    assert idx.partners("a", "c") == 1
+    assert idx.partners("a", "d") == 0
+    assert idx.opponents("a", "d") == idx.opponents("d", "a") == 2
+    assert idx.opponents("a", "b") == 1
+    assert idx.opponents("a", "a") == 0
+
+
+def test_growing_past_capacity_keeps_counts():
+    idx = PairIndex(["a", "b", "c", "d"])
+    idx.record(["a", "b"], ["c", "d"])
+    for i in range(20):
+        idx.add(f"late{i}")
+    idx.record(["late19", "a"], ["late0", "b"])
+    assert idx.cap >= idx.n == 24
+    assert idx.partners("a", "b") == 1
+    assert idx.opponents("b", "d") == 1
+    assert idx.partners("late19", "a") == 1
+    assert idx.opponents("late0", "a") == 1
+
+
+def test_matches_brute_force_counter():
+    rng = random.Random(7)
+    names = [f"p{i}" for i in range(6)]
+    idx = PairIndex(names)
+    partner, opponent = Counter(), Counter()
+    for step in range(300):
+        if step % 50 == 0:
+            names.append(f"new{step}")   # คนที่ไม่อยู่ใน index ถูกเพิ่มเองตอน record
+        four = rng.sample(names, 4)
+        w, l = four[:2], four[2:]
+        idx.record(w, l)
+        partner[frozenset(w)] += 1
+        partner[frozenset(l)] += 1
+        for a in w:
+            for b in l:
+                opponent[frozenset((a, b))] += 1
+    for a in names:
+        for b in names:
+            if a != b:
+                assert idx.partners(a, b) == partner[frozenset((a, b))]
+                assert idx.opponents(a, b) == opponent[frozenset((a, b))]
+
+
+def test_exports():
+    idx = PairIndex(["a", "b, jr", "c", "d"])
+    idx.record(["a", "b, jr"], ["c", "d"])
+    idx.record(["a", "b, jr"], ["c", "d"])
+    idx.record(["a", "c"], ["b, jr", "d"])
+    assert idx.top_pairs("partner", limit=1) == [("a", "b, jr", 2)]
+    assert idx.matrix("opponent")[0] == [0, 1, 2, 3]
+    lines = idx.to_csv("partner").splitlines()
+    assert lines[0] == ',a,"b, jr",c,d'
+    assert lines[1] == "a,0,2,1,0"
+    with pytest.raises(ValueError):
+        idx.matrix("teammate")
@@ -0,0 +1,197 @@
+import json
+
+import pytest
+
+from badminton.engine import IndividualStreakScheduler, MultiCourtScheduler, TeamStreakScheduler
+
+from .conftest import new_engine
+
+PLAYERS = [f"P{i}" for i in range(12)]
+
+
+def _players(match):
+    return {p for team in match for p in team}
+
+
+# -----------------------------
+# TeamStreakScheduler
+# -----------------------------
+def test_team_streak_winner_stays_until_max_streak():
+    eng = TeamStreakScheduler(PLAYERS[:10], max_streak=2, seed=1)
+    eng.start_new_round()
+    winner, loser = eng.current_match
+    queued = eng.queue[0]
+
+    eng.process_result("left")
+    assert eng.current_match == (winner, queued)
+    assert eng.winner_streak == {"team": winner, "count": 1, "first_loser": loser}
+
+    # ชนะครบ → ทีมชนะออก first_loser กลับมาเจอทีมหน้าคิว
+    incoming = eng.queue[0]
+    eng.process_result("left")
+    assert eng.current_match == (loser, incoming)
+    assert eng.winner_streak["count"] == 0
+
+
+@pytest.mark.parametrize("fallback", [False, True])
+def test_team_streak_loser_fallback_when_queue_is_empty(fallback):
+    # 6 คน = 3 ทีม → หลังแมตช์แรกคิวหมด
+    eng = TeamStreakScheduler(PLAYERS[:6], max_streak=2, loser_fallback=fallback, seed=3)
+    eng.start_new_round()
+    winner, first_loser = eng.current_match
+    eng.process_result("left")
+    second_loser = eng.current_match[1]
+    assert not eng.queue
+
+    eng.process_result("left")
+    if fallback:
+        assert eng.current_match == (first_loser, second_loser)
+    else:
+        # ไม่มี fallback → จัดรอบใหม่ทั้งหมด สตรีคเริ่มใหม่
+        assert eng.winner_streak["team"] is None
+        assert _players(eng.current_match) | {p for t in eng.queue for p in t} == set(PLAYERS[:6])
+
+
+def test_team_streak_rests_most_played_when_odd():
+    eng = TeamStreakScheduler(PLAYERS[:9], seed=5)
+    eng.start_new_round()
+    rested = eng.resting_player
+    assert rested is not None
+    assert rested not in _players(eng.current_match)
+    assert all(rested not in t for t in eng.queue)
+
+
+# -----------------------------
+# MultiCourtScheduler
+# -----------------------------
+def test_multi_court_winner_stays_loser_requeued():
+    eng = MultiCourtScheduler(PLAYERS, num_courts=2, max_streak=2, seed=2)
+    eng.start_new_round()
+    winner, loser = eng.current_matches[0]
+    other_court = eng.current_matches[1]
+
+    eng.process_results({0: "left"})
+    assert eng.current_matches[0][0] == winner
+    assert eng.current_matches[1] == other_court   # คอร์ทอื่นไม่ถูกรบกวน
+    assert eng.winner_streaks[0]["count"] == 1
+    assert set(loser) <= {p for t in eng.wait_pool for p in t} | _players(eng.current_matches[0])
+
+
+def test_multi_court_max_streak_sends_both_teams_off():
+    eng = MultiCourtScheduler(PLAYERS, num_courts=2, max_streak=2, seed=2)
+    eng.start_new_round()
+    eng.process_results({0: "left"})
+    winner, opponent = eng.current_matches[0]
+
+    eng.process_results({0: "left"})
+    assert eng.winner_streaks[0]["count"] == 0
+    assert not _players(eng.current_matches[0]) & (set(winner) | set(opponent))
+
+
+@pytest.mark.parametrize("players, courts", [(8, 2), (12, 3), (16, 4)])
+def test_multi_court_full_courts_mix_across_courts(players, courts):
+    # คน = 4 × คอร์ท, ส่งผลทีละคอร์ท → คิวว่างตลอด ต้องยังมีการจับคู่ข้ามกลุ่มคอร์ทแรก
+    eng = MultiCourtScheduler(PLAYERS[:players] + [f"X{i}" for i in range(players - 12)],
+                              num_courts=courts, seed=3)
+    eng.start_new_round()
+    group = {p: c for c, m in enumerate(eng.current_matches) for t in m for p in t}
+    for i in range(60):
+        eng.process_results({i % courts: "left" if i % 3 else "right"})
+        on_court = eng.on_court()
+        assert sorted(on_court) == sorted(eng.players)   # ไม่มีใครหลุดหรือซ้ำ
+    crossed = [(a, b) for a in group for b in group if a < b and group[a] != group[b]
+               and eng.pairs.partners(a, b) + eng.pairs.opponents(a, b)]
+    assert crossed
+    played = [s["played"] for s in eng.stats.values()]
+    assert max(played) - min(played) <= 6
+
+
+def test_multi_court_bad_batch_is_rejected_without_changes():
+    eng = MultiCourtScheduler(PLAYERS, num_courts=2, seed=4)
+    eng.start_new_round()
+    eng.process_results({0: "left", 1: "right"})
+    before = json.dumps(eng.snapshot(), sort_keys=True)
+    history = list(eng.history)
+    stats = json.dumps(eng.stats, sort_keys=True)
+
+    for bad in ({0: "left", 5: "right"}, {0: "left", 1: "middle"}):
+        with pytest.raises(ValueError):
+            eng.process_results(bad)
+        assert json.dumps(eng.snapshot(), sort_keys=True) == before
+        assert eng.history == history
+        assert json.dumps(eng.stats, sort_keys=True) == stats
+
+
+def test_multi_court_batch_records_every_court_once():
+    eng = MultiCourtScheduler(PLAYERS, num_courts=3, seed=5)
+    eng.start_new_round()
+    before = list(eng.current_matches)
+    eng.process_results({2: "right", 0: "left", 1: "left"})
+    assert [(r["court"], r["winner"], r["loser"]) for r in eng.history] == [
+        (0, before[0][0], before[0][1]), (1, before[1][0], before[1][1]), (2, before[2][1], before[2][0])]
+    assert sorted(eng.on_court()) == sorted(eng.players)
+
+
+# -----------------------------
+# IndividualStreakScheduler
+# -----------------------------
+def test_individual_streak_replaces_loser_with_least_played():
+    eng = IndividualStreakScheduler(PLAYERS[:10], max_streak=2, seed=6)
+    winner, loser = eng.current_match
+    eng.process_result("left")
+    assert eng.current_match[0] == winner
+    assert not set(eng.current_match[1]) & (set(winner) | set(loser))
+    assert all(eng.win_streak[p] == 1 for p in winner)
+    assert all(eng.win_streak[p] == 0 for p in loser)
+
+
+def test_individual_streak_new_round_after_max_streak():
+    # ตามกติกาเดิมของ test1.py: ชนะครบแล้วทั้งคอร์ทต้องเปลี่ยน → สุ่มรอบใหม่ สตรีคเริ่มนับใหม่
+    eng = IndividualStreakScheduler(PLAYERS[:10], max_streak=2, seed=6)
+    eng.process_result("left")
+    eng.process_result("left")
+    assert all(v == 0 for v in eng.win_streak.values())
+    assert len(eng.matches) == 1   # 10 คน = 5 ทีม → แมตช์ปัจจุบัน + อีก 1 แมตช์รอ
+
+
+def test_individual_teams_are_canonical():
+    # ทีมเป็น tuple เรียงชื่อเสมอ (make_team) → เทียบทีม/นับคู่ซ้ำได้ตรงกับ engine อื่น
+    eng = IndividualStreakScheduler(PLAYERS[:9], max_streak=2, seed=8)
+    for step in range(30):
+        eng.process_result("left" if step % 3 else "right")
+        if step == 10:
+            eng.remove_player(eng.current_match[0][0])
+        for team in eng.current_match:
+            assert isinstance(team, tuple) and list(team) == sorted(team)
+        for rec in eng.history:
+            assert list(rec["winner"]) == sorted(rec["winner"])
+
+
+# -----------------------------
+# Snapshot / restore (ทุก policy)
+# -----------------------------
+def _step(eng, i: int):
+    side = "left" if i % 3 else "right"
+    if eng.KIND == "multi_court":
+        live = [c for c, m in enumerate(eng.current_matches) if m]
+        eng.process_results({c: side for c in live})
+    else:
+        eng.process_result(side)
+
+
+def test_snapshot_restore_continues_identically(policy):
+    eng = new_engine(policy, 11)
+    for i in range(15):
+        eng.event_ts = 1000.0 + i
+        _step(eng, i)
+
+    # ผ่าน JSON เหมือนตอนเก็บลงไฟล์ (tuple → list, key int → str)
+    copy = new_engine(policy, 11, seed=99)
+    copy.restore(json.loads(json.dumps(eng.snapshot())), json.loads(json.dumps(eng.history)))
+    for i in range(15, 40):
+        eng.event_ts = copy.event_ts = 1000.0 + i
+        _step(eng, i)
+        _step(copy, i)
+    assert json.dumps(copy.snapshot(), sort_keys=True) == json.dumps(eng.snapshot(), sort_keys=True)
+    assert [(r["winner"], r["loser"]) for r in copy.history] == [(r["winner"], r["loser"]) for r in eng.history]
+    assert copy.stats == eng.stats
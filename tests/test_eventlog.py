@@ -0,0 +1,127 @@
+import json
+import random
+
+import pytest
+
+from badminton.eventlog import SessionLog, list_sessions, read_events, replay, verify_replay
+
+from .conftest import new_engine, play
+
+
+def test_load_from_snapshot_plus_tail_matches_live(tmp_path, policy):
+    eng = new_engine(policy, 10)
+    log = SessionLog.start(eng, directory=str(tmp_path), snapshot_every=4)
+    rng = random.Random(5)
+    for _ in range(11):   # snapshot ล่าสุดไม่ตรงกับเหตุการณ์สุดท้าย → มี tail ให้ replay
+        play(log, eng, rng)
+    assert log.last_snapshot_seq < log.seq
+
+    loaded, reopened = SessionLog.load(log.session_id, directory=str(tmp_path))
+    assert json.dumps(loaded.snapshot(), sort_keys=True) == json.dumps(eng.snapshot(), sort_keys=True)
+    assert loaded.history == eng.history
+    assert reopened.seq == log.seq
+    assert list_sessions(str(tmp_path)) == [log.session_id]
+
+
+def test_verify_replay_after_roster_changes(tmp_path, policy):
+    eng = new_engine(policy, 9)
+    log = SessionLog.start(eng, directory=str(tmp_path), snapshot_every=5)
+    rng = random.Random(1)
+    for _ in range(6):
+        play(log, eng, rng)
+    log.commit(eng, {"type": "add_player", "player": "Late1"})
+    log.commit(eng, {"type": "add_player", "player": "Late2"})
+    for _ in range(4):
+        play(log, eng, rng)
+    # คนที่อยู่บนคอร์ท และคนที่ยังไม่ได้เล่นสักแมตช์
+    log.commit(eng, {"type": "remove_player", "player": eng.on_court()[0]})
+    log.commit(eng, {"type": "remove_player", "player": "Late2"})
+    for _ in range(7):
+        play(log, eng, rng)
+
+    assert verify_replay(log.session_id, directory=str(tmp_path))
+    loaded, _ = SessionLog.load(log.session_id, directory=str(tmp_path))
+    assert loaded.history == eng.history
+    assert loaded.players == eng.players
+    assert loaded.idle.state() == eng.idle.state()
+
+
+def test_removed_player_without_games_stays_in_stats(tmp_path, policy):
+    eng = new_engine(policy, 9)
+    log = SessionLog.start(eng, directory=str(tmp_path), snapshot_every=2)
+    log.commit(eng, {"type": "add_player", "player": "Late"})
+    benched = next(p for p in eng.players if p not in eng.on_court())
+    log.commit(eng, {"type": "remove_player", "player": benched})
+    log.commit(eng, {"type": "remove_player", "player": "Late"})
+    rng = random.Random(4)
+    for _ in range(5):
+        play(log, eng, rng)
+    assert eng.stats[benched] == {"played": 0, "win": 0}
+
+    for use_snapshot in (True, False):
+        loaded, _ = SessionLog.load(log.session_id, directory=str(tmp_path), use_snapshot=use_snapshot)
+        assert loaded.stats == eng.stats
+        assert loaded.ratings == eng.ratings
+        assert loaded.pairs.players == eng.pairs.players
+
+    # snapshot ที่ขาดฟิลด์ → โหลดไม่ผ่าน (ไม่เดารายชื่อเอาเอง)
+    state = eng.snapshot()
+    del state["roster"]
+    with pytest.raises(KeyError):
+        new_engine(policy, 9).restore(state, eng.history)
+
+
+def test_load_skips_partial_last_line(tmp_path):
+    eng = new_engine("live", 8)
+    log = SessionLog.start(eng, directory=str(tmp_path))
+    rng = random.Random(2)
+    for _ in range(3):
+        play(log, eng, rng)
+    with open(log.path, "a", encoding="utf-8") as f:
+        f.write('{"type":"result","side":"le')
+
+    loaded, reopened = SessionLog.load(log.session_id, directory=str(tmp_path))
+    assert loaded.history == eng.history
+    assert reopened.seq == log.seq
+    # บรรทัดที่เขียนไม่จบถูกตัดทิ้ง → ต่อท้ายแล้วอ่านได้ทุกบรรทัด
+    play(reopened, loaded, rng)
+    assert [e["seq"] for _, e in read_events(log.path)] == list(range(reopened.seq + 1))
+
+
+def test_result_events_carry_the_teams(tmp_path):
+    eng = new_engine("rotation", 8)
+    log = SessionLog.start(eng, directory=str(tmp_path))
+    event = log.result(eng, "left")
+    rec = eng.history[-1]
+    assert (event["winner"], event["loser"], event["court"]) == (rec["winner"], rec["loser"], 0)
+
+
+def test_rejected_batch_is_not_logged(tmp_path):
+    eng = new_engine("multi", 12)
+    log = SessionLog.start(eng, directory=str(tmp_path))
+    seq = log.seq
+    with pytest.raises(ValueError):
+        log.results(eng, {0: "left", 9: "left"})
+    assert log.seq == seq
+    assert [e["type"] for _, e in read_events(log.path)] == ["start"]
+
+
+def test_seeded_night_replays_exactly(tmp_path, policy):
+    eng = new_engine(policy, 11)
+    log = SessionLog.start(eng, directory=str(tmp_path), snapshot_every=6)
+    rng = random.Random(8)
+    for _ in range(14):
+        play(log, eng, rng)
+    log.commit(eng, {"type": "round"} if policy != "individual" else {"type": "reset"})
+    for _ in range(5):
+        play(log, eng, rng)
+    assert verify_replay(log.session_id, directory=str(tmp_path))
+    assert replay(log.session_id, directory=str(tmp_path)).history == eng.history
+
+
+def test_same_seed_same_rounds(policy):
+    first, second = new_engine(policy, 13, seed=42), new_engine(policy, 13, seed=42)
+    assert first.live_matches() == second.live_matches()
+    assert first.snapshot()["rng"] == second.snapshot()["rng"]
+    assert first.options()["seed"] == 42
+    assert new_engine(policy, 13, seed=43).snapshot()["rng"] != first.snapshot()["rng"]
@@ -0,0 +1,46 @@
+from badminton.engine import TeamStreakScheduler
+from badminton.history_view import history_window, page_count
+
+
+def _history(n):
+    return [{"court": 0, "winner": ("a", "b"), "loser": ("c", "d"), "n": i} for i in range(n)]
+
+
+def test_page_count():
+    assert page_count(0) == 1
+    assert page_count(10, 10) == 1
+    assert page_count(11, 10) == 2
+
+
+def test_pages_are_newest_first():
+    history = _history(25)
+    window, total = history_window(history, page=0, page_size=10)
+    assert total == 25
+    assert [i for i, _ in window] == list(range(25, 15, -1))
+    window, _ = history_window(history, page=2, page_size=10)
+    assert [i for i, _ in window] == [5, 4, 3, 2, 1]
+    assert history_window(history, page=3, page_size=10)[0] == []
+
+
+def test_search_by_player_uses_match_index():
+    history = _history(12)
+    player_matches = {"a": [1, 4, 7, 10, 11], "z": []}
+    window, total = history_window(history, page=0, page_size=3, player="a", player_matches=player_matches)
+    assert total == 5
+    assert [i for i, _ in window] == [12, 11, 8]
+    window, _ = history_window(history, page=1, page_size=3, player="a", player_matches=player_matches)
+    assert [i for i, _ in window] == [5, 2]
+    assert history_window(history, player="z", player_matches=player_matches) == ([], 0)
+
+
+def test_removed_player_history_stays_searchable():
+    eng = TeamStreakScheduler([f"P{i}" for i in range(8)], seed=2)
+    eng.start_new_round()
+    for i in range(6):
+        eng.process_result("left" if i % 2 else "right")
+    gone = eng.history[0]["winner"][0]
+    eng.remove_player(gone)
+    assert gone in eng.stats   # รายชื่อที่หน้า history ใช้ค้น
+    window, total = history_window(eng.history, player=gone, player_matches=eng.player_matches)
+    assert total == eng.stats[gone]["played"] > 0
+    assert all(gone in rec["winner"] + rec["loser"] for _, rec in window)
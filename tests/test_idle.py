@@ -0,0 +1,103 @@
+import random
+
+from badminton.eventlog import SessionLog
+from badminton.idle import IdleTracker
+from badminton.simulate import longest_idle
+
+from .conftest import new_engine, play
+
+T0 = 1000.0
+
+
+def _night():
+    """a,b,c,d เล่นสองแมตช์แรก (แมตช์ละ 600 วินาที) แล้ว a,b อยู่ต่อกับ e,f — c,d กลับมาแมตช์ที่สี่"""
+    idle = IdleTracker("abcdef", T0)
+    idle.seat("abcd", T0)
+    idle.record("abcd", T0 + 600)
+    idle.seat("abcd", T0 + 600)
+    idle.record("abcd", T0 + 1200)
+    idle.seat("abef", T0 + 1200)
+    idle.record("abef", T0 + 1800)
+    idle.seat("cdef", T0 + 1800)
+    return idle
+
+
+def test_waits_count_matches_between_leaving_and_playing():
+    idle = _night()
+    # c,d ออกหลังแมตช์ 2 ลงใหม่หลังแมตช์ 3 → รอ 1 แมตช์; e,f รอตั้งแต่เปิดคืน 2 แมตช์
+    assert idle.longest == {"a": 0, "b": 0, "c": 1, "d": 1, "e": 2, "f": 2}
+    assert idle.longest_seconds["c"] == 600 and idle.longest_seconds["e"] == 1200
+    assert idle.histogram == {1: 2, 2: 2}
+    # a,b เพิ่งออก ยังไม่ได้ลง → อยู่ใน live histogram เป็นช่วงที่ยังรออยู่
+    assert idle.waiting("a") == 0 and idle.matches - idle.left["a"] == 0
+    assert idle.live_histogram() == {1: 2, 2: 2}
+
+
+def test_staying_on_court_is_not_a_wait():
+    idle = IdleTracker("abcd", T0)
+    idle.seat("abcd", T0)
+    for i in range(1, 4):
+        idle.record("abcd", T0 + i)
+        idle.seat("abcd", T0 + i)
+    assert idle.histogram == {}
+    assert all(idle.waiting(p) == 0 for p in "abcd")
+
+
+def test_over_lists_longest_waits_first():
+    idle = IdleTracker("abcdef", T0)
+    idle.seat("abcd", T0)
+    idle.record("abcd", T0 + 1)
+    idle.seat("abcd", T0 + 1)
+    idle.record("abcd", T0 + 2)
+    idle.seat("abcd", T0 + 2)
+    assert idle.over(2) == [("e", 2), ("f", 2)]
+    assert idle.over(3) == []
+
+
+def test_late_arrival_counts_from_arrival():
+    idle = IdleTracker("abcd", T0)
+    idle.seat("abcd", T0)
+    idle.record("abcd", T0 + 300)
+    idle.add("z", ts=T0 + 300)
+    idle.seat("abcd", T0 + 300)
+    idle.record("abcd", T0 + 600)
+    idle.seat("abcz", T0 + 600)
+    assert idle.longest["z"] == 1 and idle.longest_seconds["z"] == 300
+
+
+def test_removed_player_drops_out():
+    idle = _night()
+    idle.remove("e")
+    assert "e" not in idle.left and "e" not in idle.on_court
+    assert "e" not in [r["ผู้เล่น"] for r in idle.rows(T0 + 2100)]
+
+
+def test_state_round_trip():
+    idle = _night()
+    back = IdleTracker.from_state(idle.state())
+    assert back.state() == idle.state()
+    assert back.rows(T0 + 2400) == idle.rows(T0 + 2400)
+
+
+def test_rows_and_csv():
+    idle = _night()
+    rows = idle.rows(T0 + 2400)
+    assert rows[0]["ผู้เล่น"] in "ef" and rows[0]["รอนานสุด (แมตช์)"] == 2
+    assert rows[0]["รอนานสุด (นาที)"] == 20.0
+    assert "idle_matches,count" in idle.to_csv(T0 + 2400)
+
+
+def test_engine_tracker_matches_history(tmp_path, policy):
+    # คอร์ทเดียว: ค่ารอนานสุดของ engine = ค่าที่คำนวณย้อนจาก history (นับช่วงที่ยังรออยู่ด้วย)
+    # หลายคอร์ท: แมตช์ของคอร์ทอื่นที่จบระหว่างที่ตัวเองเล่นอยู่ไม่นับเป็นการรอ → ไม่เกินค่าจาก history
+    eng = new_engine(policy, 11)
+    log = SessionLog.start(eng, directory=str(tmp_path))
+    rng = random.Random(4)
+    for i in range(40):
+        play(log, eng, rng, ts=2e9 + i)
+    live = {r["ผู้เล่น"]: r["รอนานสุด (แมตช์)"] for r in eng.idle.rows(2e9 + 40)}
+    counted = longest_idle(eng.players, eng.history)
+    if policy == "multi":
+        assert all(live[p] <= counted[p] for p in eng.players) and live != counted
+    else:
+        assert live == counted
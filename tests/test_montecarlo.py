@@ -0,0 +1,58 @@
+import statistics
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from badminton import montecarlo  # noqa: E402
+from badminton.simulate import run_session  # noqa: E402
+
+
+@pytest.mark.parametrize("policy, players", [("live", 9), ("rotation", 9), ("individual", 10)])
+def test_invariants(policy, players):
+    r = montecarlo.simulate(policy, players, 200, 40, seed=1)
+    assert r["played"].shape == (200, players)
+    assert (r["played"].sum(axis=1) == 4 * 40).all()   # 4 คนต่อแมตช์ทุกแมตช์
+    assert (r["played_spread"] == r["played"].max(axis=1) - r["played"].min(axis=1)).all()
+    assert (r["max_idle"] == r["longest_idle"].max(axis=1)).all()
+    assert (r["longest_idle"] >= 0).all()
+
+
+def test_four_players_never_wait():
+    r = montecarlo.simulate("live", 4, 50, 30, seed=2)
+    assert (r["played"] == 30).all()
+    assert (r["max_idle"] == 0).all()
+
+
+def test_same_seed_same_nights():
+    a = montecarlo.simulate("rotation", 11, 100, 25, seed=3)
+    b = montecarlo.simulate("rotation", 11, 100, 25, seed=3)
+    assert all((a[k] == b[k]).all() for k in a)
+
+
+def test_rejects_unsupported_sizes():
+    with pytest.raises(ValueError):
+        montecarlo.simulate("live", 3, 10, 10)
+    with pytest.raises(ValueError):
+        montecarlo.simulate("individual", 5, 10, 10)
+    with pytest.raises(ValueError):
+        montecarlo.simulate("multi", 8, 10, 10)
+
+
+@pytest.mark.parametrize("policy, players", [("live", 9), ("rotation", 7), ("individual", 9)])
+def test_agrees_with_the_engine(policy, players):
+    # ค่าเฉลี่ยของสถิติหลักต้องใกล้กับการเดิน engine จริง (กติกาเดียวกัน ต่างแค่รายละเอียดเล็ก)
+    matches = 60
+    mc = montecarlo.simulate(policy, players, 4000, matches, seed=4)
+    runs = [run_session(policy, players, matches, seed=s) for s in range(150)]
+    eng_spread = statistics.fmean(r["played_spread"] for r in runs)
+    eng_idle = statistics.fmean(r["max_idle"] for r in runs)
+    assert float(mc["played_spread"].mean()) == pytest.approx(eng_spread, rel=0.25, abs=0.5)
+    assert float(mc["max_idle"].mean()) == pytest.approx(eng_idle, rel=0.25, abs=0.5)
+
+
+def test_evaluate_report_fields():
+    r = montecarlo.evaluate("live", 6, nights=300, matches=20, batch=128)
+    assert r["nights"] == 300
+    assert sum(r["games_played_hist"]) == 300 * 6
+    assert r["played_spread"]["max"] >= r["played_spread"]["p50"] >= 0
@@ -0,0 +1,75 @@
+import itertools
+import random
+
+import pytest
+
+from badminton.cooccurrence import PairIndex
+from badminton.pairing import HUNGARIAN_BLOCK, fair_pair_teams, hungarian
+
+
+def _brute_force(cost):
+    n = len(cost)
+    return min(sum(cost[i][p[i]] for i in range(n)) for p in itertools.permutations(range(n)))
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 6])
+def test_hungarian_matches_brute_force(n):
+    rng = random.Random(n)
+    for _ in range(20):
+        cost = [[rng.randint(0, 9) for _ in range(n)] for _ in range(n)]
+        assign = hungarian(cost)
+        assert sorted(assign) == list(range(n))
+        assert sum(cost[i][assign[i]] for i in range(n)) == _brute_force(cost)
+
+
+def _covered(teams):
+    return sorted(p for t in teams for p in t)
+
+
+def test_fair_pairs_everyone_into_sorted_teams():
+    players = [f"P{i}" for i in range(10)]
+    teams = fair_pair_teams(players, {p: 0 for p in players}, rng=random.Random(1))
+    assert _covered(teams) == sorted(players)
+    assert all(list(t) == sorted(t) and len(t) == 2 for t in teams)
+
+
+def test_fair_odd_count_leaves_out_most_played():
+    players = ["a", "b", "c", "d", "e"]
+    played = {"a": 1, "b": 1, "c": 2, "d": 2, "e": 5}
+    teams = fair_pair_teams(players, played, rng=random.Random(2))
+    assert _covered(teams) == ["a", "b", "c", "d"]
+
+
+def test_fair_avoids_repeat_partners():
+    players = ["a", "b", "c", "d"]
+    pairs = PairIndex(players)
+    for _ in range(3):
+        pairs.record(["a", "b"], ["c", "d"])
+    for seed in range(10):
+        teams = fair_pair_teams(players, {p: 3 for p in players}, partner_count=pairs.partners,
+                                opponent_count=pairs.opponents, rng=random.Random(seed))
+        assert ("a", "b") not in teams and ("c", "d") not in teams
+
+
+def test_fair_least_played_go_first():
+    players = [f"P{i}" for i in range(8)]
+    played = {p: i // 2 for i, p in enumerate(players)}   # P0,P1 = 0 ... P6,P7 = 3
+    teams = fair_pair_teams(players, played, rng=random.Random(3))
+    assert ("P0", "P1") in teams[:2]
+    assert ("P6", "P7") == teams[-1]
+
+
+def test_fair_blocks_still_cover_everyone_and_pair_close_counts():
+    rng = random.Random(4)
+    players = [f"P{i:03d}" for i in range(HUNGARIAN_BLOCK * 3 + 10)]
+    played = {p: rng.randint(0, 12) for p in players}
+    teams = fair_pair_teams(players, played, rng=random.Random(5))
+    assert _covered(teams) == sorted(players)
+    assert max(abs(played[a] - played[b]) for a, b in teams) <= 1
+
+
+def test_fair_same_seed_same_teams():
+    players = [f"P{i}" for i in range(14)]
+    played = {p: i % 3 for i, p in enumerate(players)}
+    assert fair_pair_teams(players, played, rng=random.Random(9)) == \
+        fair_pair_teams(players, played, rng=random.Random(9))
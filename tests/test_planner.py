@@ -0,0 +1,79 @@
+import itertools
+import random
+
+from badminton.eventlog import SessionLog
+from badminton.planner import plan_queue
+
+from .conftest import new_engine, play
+
+TEAMS = [(f"a{i}", f"b{i}") for i in range(7)]
+
+
+def _no_link(prev, team):
+    return 0.0
+
+
+def _cost(order, k, urgency, link, head=None):
+    prev, total = head, 0.0
+    for slot, team in enumerate(order[:k]):
+        total += (slot - k) * urgency(team) + link(prev, team)
+        prev = team
+    return total
+
+
+def test_most_urgent_teams_go_first():
+    urgency = {t: i for i, t in enumerate(TEAMS)}.get
+    planned = plan_queue(TEAMS, k=3, urgency=urgency, link=_no_link)
+    assert planned[:3] == [TEAMS[6], TEAMS[5], TEAMS[4]]
+    assert planned[3:] == TEAMS[:4]          # ที่เหลือคงลำดับเดิม
+
+
+def test_keep_prefix_is_untouched():
+    urgency = {t: i for i, t in enumerate(TEAMS)}.get
+    planned = plan_queue(TEAMS, k=4, keep=2, urgency=urgency, link=_no_link)
+    assert planned[:2] == TEAMS[:2]
+    assert planned[2:4] == [TEAMS[6], TEAMS[5]]
+    assert sorted(planned) == sorted(TEAMS)
+
+
+def test_nothing_to_plan_returns_queue():
+    urgency = {t: 1.0 for t in TEAMS}.get
+    assert plan_queue(TEAMS, k=2, keep=2, urgency=urgency, link=_no_link) == TEAMS
+    assert plan_queue([], k=3, urgency=urgency, link=_no_link) == []
+
+
+def test_link_avoids_repeat_opponents_after_head():
+    # head เพิ่งเจอ TEAMS[0] มาแล้ว → แม้ TEAMS[0] จะเร่งสุดก็ไม่ควรเป็นทีมถัดไป
+    urgency = {t: 7 - i for i, t in enumerate(TEAMS)}.get
+    head = ("h1", "h2")
+
+    def link(prev, team):
+        return 100.0 if (prev, team) == (head, TEAMS[0]) else 0.0
+
+    planned = plan_queue(TEAMS, k=3, urgency=urgency, link=link, head=head)
+    assert planned[0] != TEAMS[0] and TEAMS[0] in planned[:3]
+
+
+def test_wide_beam_finds_the_optimum():
+    rng = random.Random(1)
+    urg = {t: rng.randint(0, 5) for t in TEAMS}
+    pen = {(a, b): rng.randint(0, 6) for a in TEAMS + [None] for b in TEAMS}
+
+    def link(prev, team):
+        return pen[prev, team]
+
+    best = min(_cost(list(p), 3, urg.get, link) for p in itertools.permutations(TEAMS, 3))
+    planned = plan_queue(TEAMS, k=3, urgency=urg.get, link=link, beam_width=10_000)
+    assert _cost(planned, 3, urg.get, link) == best
+
+
+def test_engine_lookahead_queue_stays_consistent(tmp_path):
+    eng = new_engine("live", 12, lookahead=4)
+    log = SessionLog.start(eng, directory=str(tmp_path))
+    rng = random.Random(2)
+    for _ in range(25):
+        play(log, eng, rng)
+        on_court = [p for t in eng.current_match for p in t]
+        queued = [p for t in eng.queue for p in t]
+        assert len(set(on_court + queued)) == len(on_court + queued)   # ไม่มีใครอยู่สองที่
+        assert len(eng.upcoming()) == min(4, len(eng.queue))
@@ -0,0 +1,62 @@
+import random
+
+from badminton.played_index import PlayedIndex
+
+
+def test_lo_hi_follow_removals():
+    idx = PlayedIndex(["a", "b", "c", "d"], {"a": 1, "b": 3, "c": 3, "d": 6})
+    assert (idx.lo, idx.hi) == (1, 6)
+
+    idx.remove("a")
+    assert idx.lo == 3
+    idx.remove("d")
+    assert idx.hi == 3
+    idx.remove("b")
+    assert (idx.lo, idx.hi) == (3, 3)
+    idx.remove("c")
+    assert (idx.lo, idx.hi) == (0, 0)
+    assert len(idx) == 0
+
+
+def test_remove_middle_keeps_bounds_and_buckets():
+    idx = PlayedIndex(["a", "b", "c"], {"a": 0, "b": 2, "c": 5})
+    idx.remove("b")
+    assert (idx.lo, idx.hi) == (0, 5)
+    assert 2 not in idx.buckets
+    assert idx.least_played(2) == ["a", "c"]
+
+
+def test_bump_after_removal():
+    idx = PlayedIndex(["a", "b", "c"])
+    idx.remove("b")
+    idx.bump("a")
+    assert (idx.lo, idx.hi) == (0, 1)
+    idx.bump("c")
+    assert (idx.lo, idx.hi) == (1, 1)
+    assert sorted(idx.most_played()) == ["a", "c"]
+    assert idx.pick_most_played(random.Random(0), 5) in (["a", "c"], ["c", "a"])
+
+
+def test_matches_brute_force_after_random_changes():
+    rng = random.Random(11)
+    idx = PlayedIndex()
+    counts = {}
+    for step in range(2000):
+        op = rng.random()
+        if op < 0.2 or not counts:
+            p = f"p{step}"
+            counts[p] = rng.randint(0, 8)
+            idx.add(p, counts[p])
+        elif op < 0.35:
+            p = rng.choice(sorted(counts))
+            del counts[p]
+            idx.remove(p)
+        else:
+            p = rng.choice(sorted(counts))
+            counts[p] += 1
+            idx.bump(p)
+        if counts:
+            assert (idx.lo, idx.hi) == (min(counts.values()), max(counts.values()))
+        else:
+            assert (idx.lo, idx.hi) == (0, 0)
+        assert idx.count == counts
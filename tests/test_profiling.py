@@ -0,0 +1,69 @@
+import json
+
+from badminton.profiling import CHAIN_GAP_SECONDS, RerunProfiler
+
+
+def _rec(session, ts, before, after, total_ms=10.0, **phases):
+    return {"ts": ts, "page": "app", "session": session, "fragment": False,
+            "version_before": before, "version_after": after,
+            "phases": phases or {"render": total_ms}, "total_ms": total_ms}
+
+
+def test_ring_buffer_drops_oldest():
+    prof = RerunProfiler(maxlen=3)
+    for i in range(5):
+        prof.push(_rec("s", i, 0, 0))
+    assert [r["ts"] for r in prof.records()] == [2, 3, 4]
+
+
+def test_timer_records_each_phase():
+    prof = RerunProfiler()
+    timer = prof.begin("app", "s", 3)
+    timer.mark("input")
+    timer.mark("render")
+    rec = timer.finish(4)
+    assert set(rec["phases"]) == {"init", "input", "render"}
+    assert rec["total_ms"] >= sum(rec["phases"].values()) - 1e-6
+    assert (rec["version_before"], rec["version_after"]) == (3, 4)
+    assert prof.records() == [rec]
+
+
+def test_interrupted_run_stops_at_last_mark():
+    prof = RerunProfiler()
+    timer = prof.begin("app", "s", 0)
+    timer.mark("schedule")
+    rec = timer.finish(1, interrupted=True)
+    assert rec["interrupted"] and set(rec["phases"]) == {"init"}
+
+
+def test_reruns_chain_into_one_action():
+    prof = RerunProfiler()
+    prof.push(_rec("s", 100.0, 0, 1))                       # คลิก → version เปลี่ยน
+    prof.push(_rec("s", 100.1, 1, 1))                       # rerun ตามมาติดๆ
+    prof.push(_rec("s", 100.2, 1, 1))
+    prof.push(_rec("t", 100.15, 5, 5))                      # session อื่นไม่ปน
+    prof.push(_rec("s", 100.3 + CHAIN_GAP_SECONDS, 1, 1))   # ห่างเกิน → action ใหม่
+    actions = prof.actions()
+    assert [(a["session"], a["reruns"], a["changed_state"]) for a in actions] == \
+        [("s", 3, True), ("t", 1, False), ("s", 1, False)]
+    summary = prof.summary()
+    assert summary["runs"] == 5 and summary["actions"] == 1
+    assert summary["reruns_per_action_mean"] == 3 and summary["reruns_per_action_max"] == 3
+    assert summary["phases"]["render"]["n"] == 5
+
+
+def test_version_change_between_runs_starts_an_action():
+    # version เปลี่ยนใน callback ก่อน run → version_before ของ run ใหม่ต่างจาก version_after ของ run ก่อน
+    prof = RerunProfiler()
+    prof.push(_rec("s", 1.0, 0, 0))
+    prof.push(_rec("s", 1.1, 1, 1))
+    assert [a["changed_state"] for a in prof.actions()] == [False, True]
+
+
+def test_export_writes_jsonl(tmp_path):
+    prof = RerunProfiler()
+    prof.push(_rec("s", 1.0, 0, 0))
+    prof.push(_rec("s", 2.0, 0, 1))
+    path = prof.export(directory=str(tmp_path))
+    with open(path, encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == prof.records()
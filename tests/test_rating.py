@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from badminton.eventlog import SessionLog
+from badminton.pairing import balanced_pair_teams
+from badminton.rating import DEFAULT_RATING, K_FACTOR, elo_delta, win_probability
+
+from .conftest import new_engine, play
+
+
+def test_equal_teams_are_even():
+    assert win_probability(("a", "b"), ("c", "d"), {}) == pytest.approx(0.5)
+    assert elo_delta(("a", "b"), ("c", "d"), {}) == pytest.approx(K_FACTOR / 2)
+
+
+def test_upset_pays_more_than_expected_win():
+    ratings = {"a": 1700, "b": 1700, "c": 1400, "d": 1400}
+    strong, weak = ("a", "b"), ("c", "d")
+    p = win_probability(strong, weak, ratings)
+    assert p > 0.5
+    assert p + win_probability(weak, strong, ratings) == pytest.approx(1.0)
+    assert elo_delta(weak, strong, ratings) > K_FACTOR / 2 > elo_delta(strong, weak, ratings)
+
+
+def test_engine_ratings_are_zero_sum(tmp_path, policy):
+    eng = new_engine(policy)
+    log = SessionLog.start(eng, directory=str(tmp_path))
+    rng = random.Random(3)
+    for _ in range(30):
+        play(log, eng, rng)
+    assert sum(eng.ratings.values()) == pytest.approx(DEFAULT_RATING * len(eng.ratings))
+    assert any(r != DEFAULT_RATING for r in eng.ratings.values())
+
+
+def test_balanced_mode_keeps_matches_close(tmp_path):
+    eng = new_engine("live", 12, pairing="balanced")
+    log = SessionLog.start(eng, directory=str(tmp_path))
+    rng = random.Random(5)
+    for _ in range(40):
+        play(log, eng, rng)
+    left, right = eng.current_match
+    assert 0.3 < win_probability(left, right, eng.ratings) < 0.7
+
+
+def test_balanced_snake_pairs_strong_with_weak():
+    ratings = {p: 1500 + 10 * i for i, p in enumerate("abcdefgh")}
+    teams = balanced_pair_teams(list(ratings), ratings, rng=random.Random(1))
+    assert sorted(p for t in teams for p in t) == sorted(ratings)
+    # a ต่ำสุดคู่กับ h สูงสุด, b กับ g ... ทุกทีมมีผลรวมเท่ากัน
+    assert {tuple(sorted(t)) for t in teams} == {("a", "h"), ("b", "g"), ("c", "f"), ("d", "e")}
+
+
+def test_balanced_matches_pair_neighbouring_teams():
+    rng = random.Random(2)
+    players = [f"P{i}" for i in range(12)]
+    ratings = {p: rng.uniform(1200, 1800) for p in players}
+    teams = balanced_pair_teams(players, ratings, rng=random.Random(3))
+    strength = {t: sum(ratings[p] for p in t) for t in teams}
+    ranked = sorted(strength.values())
+    gap = max(abs(strength[teams[i]] - strength[teams[i + 1]]) for i in range(0, len(teams), 2))
+    # แต่ละแมตช์ = สองทีมที่อยู่ติดกันในอันดับความแข็ง
+    assert gap <= max(b - a for a, b in zip(ranked, ranked[1:]))
+
+
+def test_balanced_odd_count_drops_one():
+    ratings = dict.fromkeys("abcde", 1500.0)
+    teams = balanced_pair_teams(list("abcde"), ratings, rng=random.Random(4))
+    assert len(teams) == 2 and len({p for t in teams for p in t}) == 4
@@ -0,0 +1,79 @@
+import random
+import time
+
+from badminton.eventlog import SessionLog
+from badminton.season import OPEN_SECONDS, SeasonStats, build, summarize_night
+
+from .conftest import new_engine, play
+
+
+def _night():
+    # Bench มาแต่ไม่ได้ลงเล่นสักเกม
+    start = {"ts": 1_700_000_000.0, "players": ["A", "B", "C", "D", "Bench"]}
+    match = {"winner": ["A", "B"], "loser": ["C", "D"], "ts": 1_700_000_600.0}
+    return summarize_night("n1", [("start", start), ("match", match)])
+
+
+def test_attendee_without_games_has_no_win_rate():
+    season = SeasonStats()
+    season.add(_night())
+    assert "Bench" in {r["player"] for r in season.attendance()}
+    for min_games in (0, 1):
+        rows = season.win_rates(min_games)
+        assert {r["player"] for r in rows} == {"A", "B", "C", "D"}
+    assert season.synergy(0)[0]["pair"] == ["A", "B"]
+
+
+def test_removing_a_night_restores_empty_totals():
+    season = SeasonStats()
+    night = _night()
+    season.add(night)
+    season.add(night, sign=-1)
+    assert season.to_json() == SeasonStats().to_json()
+
+
+def _totals(season):
+    # ลำดับ dict ต่างได้หลังหักแล้วบวกคืนเดิมใหม่ → เทียบเฉพาะค่า
+    return season.players, sorted(season.pairs.items()), season.months, season.nights
+
+
+def _logged_nights(directory, count=2, results=6):
+    logs = []
+    for k in range(count):
+        eng = new_engine(("live", "multi")[k % 2], 9, seed=k)
+        log = SessionLog.start(eng, directory=directory)
+        rng = random.Random(k)
+        for _ in range(results):
+            play(log, eng, rng)
+        logs.append((log, eng, rng))
+    return logs
+
+
+def test_cached_build_adds_results_of_an_open_night(tmp_path):
+    d, cache = str(tmp_path), str(tmp_path / "season.json")
+    logs = _logged_nights(d)
+    build(d, cache_path=cache)
+
+    log, eng, rng = logs[0]   # คืนที่ยังเล่นอยู่ → log มีผลต่อท้ายหลังนับไปแล้ว
+    for _ in range(4):
+        play(log, eng, rng)
+    log.commit(eng, {"type": "add_player", "player": "Late"})
+    play(log, eng, rng)
+
+    season, counts = build(d, cache_path=cache)
+    assert (counts["processed"], counts["skipped"]) == (1, 1)
+    fresh, _ = build(d)
+    assert _totals(season) == _totals(fresh)
+    assert sum(r["played"] for r in season.win_rates(0)) == 4 * (len(eng.history) + len(logs[1][1].history))
+
+
+def test_cached_build_recounts_a_reopened_closed_night(tmp_path):
+    d, cache = str(tmp_path), str(tmp_path / "season.json")
+    logs = _logged_nights(d)
+    build(d, cache_path=cache, now=time.time() + OPEN_SECONDS + 60)   # ทุกคืนปิดแล้ว
+
+    log, eng, rng = logs[1]
+    play(log, eng, rng)
+    season, counts = build(d, cache_path=cache)
+    assert counts["processed"] == 2   # หักยอดคืนที่ปิดไปแล้วไม่ได้ → นับใหม่ทั้งหมด
+    assert _totals(season) == _totals(build(d)[0])
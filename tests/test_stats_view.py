@@ -0,0 +1,49 @@
+import random
+
+from badminton.stats_view import StatsTable
+
+
+def _full_sort(stats, names):
+    return sorted(names, key=lambda p: (stats[p]["played"], -stats[p]["win"], names.index(p)))
+
+
+def test_incremental_order_matches_full_sort():
+    rng = random.Random(3)
+    names = [f"P{i}" for i in range(12)]
+    stats = {p: {"played": 0, "win": 0} for p in names}
+    table = StatsTable(stats)
+    for _ in range(200):
+        four = rng.sample(names, 4)
+        for i, p in enumerate(four):
+            stats[p]["played"] += 1
+            stats[p]["win"] += i < 2
+            table.update(p)
+        assert table.ordered() == _full_sort(stats, names)
+
+
+def test_add_and_remove_rows():
+    stats = {"a": {"played": 2, "win": 1}, "b": {"played": 1, "win": 1}}
+    table = StatsTable(stats)
+    stats["late"] = {"played": 0, "win": 0}
+    table.add("late")
+    assert table.ordered() == ["late", "b", "a"]
+    table.remove("b")
+    table.remove("b")   # ลบซ้ำไม่พัง
+    assert table.ordered() == ["late", "a"]
+
+
+def test_rows_are_cached_per_revision():
+    stats = {"a": {"played": 4, "win": 3}, "b": {"played": 4, "win": 1}}
+    ratings = {"a": 1512.4, "b": 1487.6}
+    table = StatsTable(stats, ratings)
+    rows = table.rows(rank=True)
+    assert rows[0] == {"ลำดับ": 1, "ผู้เล่น": "a", "แมตช์": 4, "ชนะ": 3, "อัตราชนะ (%)": 75.0, "เรตติ้ง": 1512}
+    assert table.rows(rank=True) is rows
+    assert "ลำดับ" not in table.rows()[0]
+
+    table.update("a")   # ค่าไม่เปลี่ยน → revision เดิม
+    assert table.rows(rank=True) is rows
+    stats["b"]["win"] = 4
+    table.update("b")
+    assert table.rows(rank=True) is not rows
+    assert table.rows(rank=True)[0]["ผู้เล่น"] == "b"
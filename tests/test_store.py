@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from badminton.store import SharedStore, VersionConflict
+
+from .conftest import new_engine
+
+
+def test_stale_version_is_rejected(tmp_path):
+    store = SharedStore(str(tmp_path))
+    club = store.create(new_engine("live", 8))
+    seen = club.version
+
+    version = store.commit(club.club_id, seen, {"type": "result", "side": "left", "court": 0})
+    assert version == seen + 1
+    history = list(club.engine.history)
+
+    # อีกเครื่องยังเห็น version เก่า → ไม่บันทึกซ้ำ
+    with pytest.raises(VersionConflict) as err:
+        store.commit(club.club_id, seen, {"type": "result", "side": "right", "court": 0})
+    assert (err.value.expected, err.value.actual) == (seen, version)
+    assert club.engine.history == history
+    assert store.version(club.club_id) == version
+
+
+def test_phones_share_one_club_state(tmp_path):
+    store = SharedStore(str(tmp_path))
+    club = store.create(new_engine("multi", 12))
+    assert store.open(club.club_id) is club
+    assert store.get(club.club_id) is club
+
+    builds = []
+
+    def build():
+        builds.append(club.version)
+        return len(club.engine.history)
+
+    assert club.cached("rows", build) == 0
+    assert club.cached("rows", build) == 0   # version เดิม → ไม่คำนวณซ้ำ
+    store.commit(club.club_id, club.version, {"type": "results", "sides": [[0, "left"]]})
+    assert club.cached("rows", build) == 1
+    assert builds == [0, 1]
+
+
+def test_commit_after_eviction_reloads_from_disk(tmp_path):
+    store = SharedStore(str(tmp_path))
+    club = store.create(new_engine("multi", 12))
+    version = store.commit(club.club_id, club.version, {"type": "results", "sides": [[0, "left"]]})
+    assert store.evict(club.club_id)
+    assert store.get(club.club_id) is None
+    assert store.version(club.club_id) == version
+
+    with pytest.raises(VersionConflict):
+        store.commit(club.club_id, version - 1, {"type": "results", "sides": [[1, "left"]]})
+    version = store.commit(club.club_id, version, {"type": "results", "sides": [[1, "left"]]})
+    assert len(store.open(club.club_id).engine.history) == 2
+
+
+def test_spill_writes_outside_the_store_lock(tmp_path):
+    store = SharedStore(str(tmp_path))
+    slow = store.create(new_engine("live", 8))
+    other = store.create(new_engine("live", 8))
+    store.commit(slow.club_id, slow.version, {"type": "result", "side": "left", "court": 0})
+    started, release = threading.Event(), threading.Event()
+    write = slow.log.write_snapshot
+
+    def blocked_write(engine):
+        started.set()
+        release.wait(5)
+        write(engine)
+
+    slow.log.write_snapshot = blocked_write
+    evictor = threading.Thread(target=store.evict, args=(slow.club_id,))
+    evictor.start()
+    assert started.wait(5)
+    # disk ของคืนหนึ่งช้า → คืนอื่นยังบันทึกผลได้
+    store.commit(other.club_id, other.version, {"type": "result", "side": "left", "court": 0})
+
+    reopened = []
+    opener = threading.Thread(target=lambda: reopened.append(store.open(slow.club_id)))
+    opener.start()
+    opener.join(0.2)
+    assert opener.is_alive()   # คืนที่กำลังเขียนลง disk ต้องรอให้เสร็จก่อนโหลดกลับ
+    release.set()
+    evictor.join(5)
+    opener.join(5)
+    assert reopened[0] is not slow
+    assert reopened[0].engine.history == slow.engine.history
+
+
+def test_unknown_club_raises(tmp_path):
+    store = SharedStore(str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        store.open("no-such-night")
+    assert store.version("no-such-night") == -1